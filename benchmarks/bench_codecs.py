@@ -0,0 +1,69 @@
+"""Пропускная способность декодирования листа «Интервью».
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_codecs [количество строк]
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+from services.codecs import INTERVIEW_CODEC
+
+def make_rows(count: int, legacy: bool):
+    started = datetime(2024, 1, 1, 9, 0)
+    rows = []
+    for i in range(count):
+        questions = [f"Вопрос {n} по теме {i % 17}" for n in range(5)]
+        answers = [f"Ответ {n}, с запятой и подробностями" for n in range(5)]
+        emotions = [{"emotion": "neutral", "confidence": 0.8, "timestamp": n} for n in range(3)]
+        if legacy:
+            row = [
+                str(i), str(i % 1000), str(i % 50), "completed",
+                str(started + timedelta(minutes=i)), str(started + timedelta(minutes=i + 30)),
+                "", "", ",".join(questions), ",".join(answers), str(emotions)
+            ]
+        else:
+            row = INTERVIEW_CODEC.encode({
+                "id": str(i), "candidate_id": str(i % 1000), "vacancy_id": str(i % 50),
+                "status": "completed", "start_time": started + timedelta(minutes=i),
+                "end_time": started + timedelta(minutes=i + 30),
+                "questions": questions, "answers": answers, "emotions_analysis": emotions
+            })
+        rows.append(row)
+    return rows
+
+def legacy_decode(row):
+    """Декодирование в том виде, в каком оно было в сервисах до кодеков"""
+    return {
+        "id": row[0],
+        "candidate_id": row[1],
+        "vacancy_id": row[2],
+        "status": row[3],
+        "start_time": datetime.fromisoformat(row[4]),
+        "end_time": datetime.fromisoformat(row[5]) if row[5] else None,
+        "recording_url": row[6] or None,
+        "transcript": row[7] or None,
+        "questions": row[8].split(","),
+        "answers": row[9].split(","),
+        "emotions_analysis": eval(row[10])
+    }
+
+def measure(name: str, func, rows) -> None:
+    started = time.perf_counter()
+    func(rows)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<40} {elapsed * 1000:9.1f} ms {len(rows) / elapsed:12.0f} строк/с")
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    legacy_rows = make_rows(count, legacy=True)
+    json_rows = make_rows(count, legacy=False)
+
+    print(f"Строк: {count}")
+    measure("v1: split + eval (старый код)", lambda rows: [legacy_decode(row) for row in rows], legacy_rows)
+    measure("v1: RowCodec.decode по строкам", lambda rows: [INTERVIEW_CODEC.decode(row) for row in rows], legacy_rows)
+    measure("v1: RowCodec.decode_rows", INTERVIEW_CODEC.decode_rows, legacy_rows)
+    measure("v2: RowCodec.decode по строкам", lambda rows: [INTERVIEW_CODEC.decode(row) for row in rows], json_rows)
+    measure("v2: RowCodec.decode_rows", INTERVIEW_CODEC.decode_rows, json_rows)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""Базовые замеры хранилища на эмуляторе Sheets API (без сети и таблицы).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_storage [строк интервью] [задержка запроса, мс]
+
+Для каждого шага выводится время и число запросов к API. Квоты и ошибки
+эмулятора настраиваются переменными SHEETS_EMULATOR_* (см. README).
+"""
+import os
+import sys
+import time
+import asyncio
+from datetime import datetime, timedelta
+
+os.environ["SHEETS_API"] = "emulator"
+os.environ["STORAGE_BACKEND"] = "sheets"
+# Замеряется хранилище, а не квота: ограничитель запросов отключен
+os.environ.setdefault("SHEETS_RATE_PER_MINUTE", "0")
+os.environ.setdefault("SHEETS_EMULATOR_LATENCY_MS", sys.argv[2] if len(sys.argv) > 2 else "50")
+
+from services.codecs import INTERVIEW_CODEC
+from services.google_clients import get_sheets_client
+from services.repository import get_repository
+from services.tables import INTERVIEWS
+
+def make_rows(count: int):
+    started = datetime(2024, 1, 1, 9, 0)
+    return [
+        INTERVIEW_CODEC.encode({
+            "id": str(i), "candidate_id": str(i % 1000), "vacancy_id": str(i % 50),
+            "status": "completed", "start_time": started + timedelta(minutes=i),
+            "end_time": started + timedelta(minutes=i + 30),
+            "transcript": "Ответ кандидата. " * 40,
+            "questions": [f"Вопрос {n}" for n in range(5)],
+            "answers": [f"Ответ {n}, с подробностями" for n in range(5)],
+            "emotions_analysis": [{"emotion": "neutral", "confidence": 0.8}]
+        })
+        for i in range(1, count + 1)
+    ]
+
+async def measure(name: str, coroutine) -> None:
+    emulator = get_sheets_client()
+    requests_before = sum(emulator.stats()["requests"].values())
+    started = time.perf_counter()
+    result = await coroutine
+    elapsed = time.perf_counter() - started
+    requests = sum(emulator.stats()["requests"].values()) - requests_before
+    if isinstance(result, tuple):
+        result = result[0]
+    size = len(result) if isinstance(result, list) else "-"
+    print(f"{name:<36} {elapsed * 1000:9.1f} ms {requests:6d} запросов  результат: {size}")
+
+async def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    emulator = get_sheets_client()
+    emulator.load({INTERVIEWS.sheet: [INTERVIEWS.headers] + make_rows(count)})
+    repository = get_repository(INTERVIEWS)
+
+    print(f"Строк: {count}, задержка запроса: {emulator.latency * 1000:.0f} мс")
+    await measure("get по ID (холодный индекс)", repository.get(str(count // 2)))
+    await measure("get по ID (индекс построен)", repository.get(str(count // 3)))
+    await measure("find vacancy_id (холодный)", repository.find(vacancy_id="7"))
+    await measure("find vacancy_id (индекс)", repository.find(vacancy_id="8"))
+    await measure("page limit=100", repository.page(100))
+    await measure("get_all (полный лист)", repository.get_all())
+    await measure("get_all (из кэша)", repository.get_all())
+
+    async def create(row):
+        await repository.insert([await repository.next_id()] + row[1:])
+
+    await measure("20 insert параллельно", asyncio.gather(*(create(row) for row in make_rows(20))))
+    print(get_sheets_client().stats()["requests"])
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""Время до первого быстрого ответа после старта на эмуляторе Sheets API.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_warmup [строк интервью] [задержка запроса, мс]
+
+Сравниваются три варианта старта: без прогрева, прогрев одним batchGet
+и прогрев из снимка с прошлого запуска. Для каждого выводится время
+старта, время первых запросов к разным листам и число запросов к API.
+"""
+import os
+import sys
+import time
+import asyncio
+import tempfile
+
+os.environ["SHEETS_API"] = "emulator"
+os.environ["STORAGE_BACKEND"] = "sheets"
+os.environ.setdefault("SHEETS_RATE_PER_MINUTE", "0")
+os.environ.setdefault("SHEETS_EMULATOR_LATENCY_MS", sys.argv[2] if len(sys.argv) > 2 else "200")
+
+import services.repository as repository_module
+import services.sheets_service as sheets_service_module
+from benchmarks.bench_storage import make_rows
+from services.google_clients import get_sheets_client
+from services.repository import get_repository
+from services.sheets_warmup import warm_up
+from services.tables import CANDIDATES, INTERVIEWS, VACANCIES
+
+def restart() -> None:
+    """Имитация перезапуска процесса: общие сервисы создаются заново"""
+    sheets_service_module._sheets_service = None
+    repository_module._repositories.clear()
+
+async def first_requests(name: str, warm: bool, snapshot_path: str = "") -> None:
+    restart()
+    emulator = get_sheets_client()
+    requests_before = sum(emulator.stats()["requests"].values())
+    started = time.perf_counter()
+    if warm:
+        await warm_up(snapshot_path)
+    startup = time.perf_counter() - started
+
+    timings = []
+    for table, record_id in ((INTERVIEWS, "10"), (CANDIDATES, "1"), (VACANCIES, "1")):
+        request_started = time.perf_counter()
+        await get_repository(table).get(record_id)
+        timings.append(1000 * (time.perf_counter() - request_started))
+    requests = sum(emulator.stats()["requests"].values()) - requests_before
+    print(
+        f"{name:<24} старт {startup * 1000:8.1f} ms  первые get: "
+        + ", ".join(f"{timing:7.1f}" for timing in timings)
+        + f" ms  запросов: {requests}"
+    )
+
+async def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    emulator = get_sheets_client()
+    emulator.load({
+        INTERVIEWS.sheet: [INTERVIEWS.headers] + make_rows(count),
+        CANDIDATES.sheet: [CANDIDATES.headers, ["1", "Иван", "ivan@example.com", "+7", "m", "2024-01-01T09:00:00"]],
+        VACANCIES.sheet: [VACANCIES.headers, ["1", "Python", "middle", "[]", "[]", "[]", "[]", "2024-01-01T09:00:00"]]
+    })
+    print(f"Строк: {count}, задержка запроса: {emulator.latency * 1000:.0f} мс")
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = os.path.join(directory, "snapshot.json")
+        await first_requests("без прогрева", warm=False)
+        await first_requests("batchGet при старте", warm=True, snapshot_path=snapshot_path)
+        await first_requests("из снимка", warm=True, snapshot_path=snapshot_path)
+        # Фоновое обновление после загрузки снимка
+        await asyncio.sleep(emulator.latency * 2 + 0.5)
+
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
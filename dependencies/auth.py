@@ -3,9 +3,11 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from models.auth import TokenData
 from services.security_service import SecurityService
+from services.auth_service import AuthService
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 security_service = SecurityService()
+auth_service = AuthService()
 
 async def get_current_user(request: Request) -> TokenData:
     credentials_exception = HTTPException(
@@ -28,4 +30,18 @@ async def get_current_user(request: Request) -> TokenData:
     if email is None:
         raise credentials_exception
         
+    # Удаленный пользователь теряет доступ не позже чем через USER_CACHE_TTL
+    try:
+        exists = await auth_service.user_exists(email)
+    except Exception as e:
+        # Хранилище недоступно (квота Sheets, сеть): это не ошибка токена и не сбой сервера
+        print(f"Error checking user {email}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="User directory is temporarily unavailable",
+            headers={"Retry-After": "5"},
+        )
+    if not exists:
+        raise credentials_exception
+        
     return TokenData(email=email) 
\ No newline at end of file
@@ -0,0 +1,22 @@
+from typing import AsyncIterator
+from fastapi import HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from services.export import CSV, PARQUET, MEDIA_TYPES, parquet_available
+
+class ExportParams:
+    """Формат выгрузки: csv или parquet"""
+
+    def __init__(self, format: str = Query(CSV, regex=r"^(csv|parquet)$")):
+        if format == PARQUET and not parquet_available():
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail="Parquet export requires pyarrow"
+            )
+        self.format = format
+
+def export_response(content: AsyncIterator[bytes], export: ExportParams, name: str) -> StreamingResponse:
+    return StreamingResponse(
+        content,
+        media_type=MEDIA_TYPES[export.format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export.format}"'}
+    )
\ No newline at end of file
@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import Dict, Optional
+from services.secondary_index import Condition, Range
+
+def _date_range(start: Optional[datetime], end: Optional[datetime]) -> Optional[Range]:
+    if start is None and end is None:
+        return None
+    return Range(
+        start.isoformat() if start is not None else None,
+        end.isoformat() if end is not None else None
+    )
+
+def _conditions(**conditions: Optional[Condition]) -> Dict[str, Condition]:
+    return {column: condition for column, condition in conditions.items() if condition is not None}
+
+class CandidateFilters:
+    """Фильтры списка кандидатов; даты - границы включительно"""
+
+    def __init__(
+        self,
+        email: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ):
+        self.conditions = _conditions(email=email, created_at=_date_range(created_from, created_to))
+
+class VacancyFilters:
+    """Фильтры списка вакансий; даты - границы включительно"""
+
+    def __init__(
+        self,
+        level: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None
+    ):
+        self.conditions = _conditions(level=level, created_at=_date_range(created_from, created_to))
+
+class InterviewFilters:
+    """Фильтры списка интервью; даты - границы времени начала включительно"""
+
+    def __init__(
+        self,
+        candidate_id: Optional[str] = None,
+        vacancy_id: Optional[str] = None,
+        status: Optional[str] = None,
+        started_from: Optional[datetime] = None,
+        started_to: Optional[datetime] = None
+    ):
+        self.conditions = _conditions(
+            candidate_id=candidate_id,
+            vacancy_id=vacancy_id,
+            status=status,
+            start_time=_date_range(started_from, started_to)
+        )
\ No newline at end of file
@@ -0,0 +1,28 @@
+from typing import AsyncIterator, Dict, Optional
+from fastapi import Query, Response
+from fastapi.responses import StreamingResponse
+from services.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, to_ndjson
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class PageParams:
+    """Параметры списка: limit/cursor для постраничной выдачи, stream для NDJSON"""
+
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None, regex=r"^\d+$"),
+        stream: bool = False
+    ):
+        # Без limit и cursor список возвращается целиком, как раньше
+        self.paginated = limit is not None or cursor is not None
+        self.limit = limit or DEFAULT_PAGE_SIZE
+        self.cursor = cursor
+        self.stream = stream
+
+def set_next_cursor(response: Response, cursor: Optional[str]) -> None:
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+
+def ndjson_response(records: AsyncIterator[Dict]) -> StreamingResponse:
+    return StreamingResponse(to_ndjson(records), media_type="application/x-ndjson")
\ No newline at end of file
@@ -3,12 +3,18 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional
 import os
+import json
+import asyncio
 from dotenv import load_dotenv
-from routes import auth, vacancies, candidates, interviews, reports, notifications, livekit
+from routes import auth, vacancies, candidates, interviews, reports, notifications, livekit, metrics, maintenance
 
-from services.interview_service import InterviewService
-from services.sheets_service import GoogleSheetsService
-from services.voice_service import ElevenLabsService
+from services.interview_service import get_interview_service
+from services.sheets_service import get_sheets_service, flush_sheets_service
+from services.compaction import run_compaction_schedule, run_compaction_watch
+from services.sheets_warmup import warm_up, run_refresh_schedule
+from services.session_store import flush_session_store, run_session_eviction_schedule
+from services.turn_pipeline import get_turn_pipeline
+from services.audio_stream import get_speech_ingest
 from services.livekit_service import LiveKitService
 
 load_dotenv()
@@ -32,6 +38,48 @@ app.include_router(interviews.router, prefix="/interviews", tags=["interviews"])
 app.include_router(reports.router, prefix="/reports", tags=["reports"])
 app.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
 app.include_router(livekit.router, prefix="/livekit", tags=["livekit"])
+app.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
+app.include_router(maintenance.router, prefix="/maintenance", tags=["maintenance"])
+
+@app.on_event("startup")
+async def startup():
+    if os.getenv("STORAGE_BACKEND", "sheets").lower() == "sheets":
+        snapshot_path = os.getenv("SHEETS_SNAPSHOT_PATH", "")
+        # Все листы одним batchGet (или из снимка) до первого запроса
+        if os.getenv("SHEETS_WARMUP", "False").lower() == "true":
+            await warm_up(snapshot_path)
+        refresh_interval = float(os.getenv("SHEETS_REFRESH_INTERVAL", "0"))
+        if refresh_interval > 0:
+            asyncio.create_task(run_refresh_schedule(refresh_interval, snapshot_path))
+        # Сброс индексов листов, уплотненных другими воркерами
+        compaction_poll_interval = float(os.getenv("SHEETS_COMPACTION_POLL_INTERVAL", "5"))
+        if compaction_poll_interval > 0:
+            asyncio.create_task(run_compaction_watch(compaction_poll_interval))
+        
+    # Периодическое удаление очищенных строк из листов (0 - выключено)
+    compaction_interval = float(os.getenv("SHEETS_COMPACTION_INTERVAL", "0"))
+    if compaction_interval > 0:
+        asyncio.create_task(run_compaction_schedule(compaction_interval))
+
+    # Выгрузка простаивающих сессий интервью (0 - только при создании новых)
+    session_eviction_interval = float(os.getenv("SESSION_EVICTION_INTERVAL", "60"))
+    if session_eviction_interval > 0:
+        asyncio.create_task(run_session_eviction_schedule(session_eviction_interval))
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Сохраняем состояние идущих интервью, затем отправляем в таблицу отложенные записи
+    await flush_session_store()
+    await flush_sheets_service()
+
+def is_end_of_answer(text: Optional[str]) -> bool:
+    """Управляющее сообщение: кандидат закончил ответ, не дожидаясь паузы"""
+    if not text or not text.startswith("{"):
+        return False
+    try:
+        return json.loads(text).get("type") == "end_of_answer"
+    except (ValueError, AttributeError):
+        return False
 
 class InterviewRequest(BaseModel):
     candidate_name: str
@@ -42,7 +90,7 @@ class InterviewRequest(BaseModel):
 @app.post("/start-interview")
 async def start_interview(request: InterviewRequest):
     try:
-        interview_service = InterviewService()
+        interview_service = get_interview_service()
         session_id = await interview_service.create_session(
             request.candidate_name,
             request.candidate_email,
@@ -55,28 +103,49 @@ async def start_interview(request: InterviewRequest):
 
 @app.websocket("/ws/{session_id}")
 async def interview_websocket(websocket: WebSocket, session_id: str):
+    """Голосовое интервью.
+
+    Ответ кандидата приходит текстом или непрерывным потоком бинарных кадров
+    PCM 16 бит моно (AUDIO_SAMPLE_RATE). Аудио режется на фрагменты по паузам
+    и транскрибируется, пока кандидат говорит; ответ считается законченным
+    после паузы VAD_END_SILENCE_MS, по сообщению {"type": "end_of_answer"}
+    или если кадры перестали приходить на то же время.
+    """
     await websocket.accept()
     
-    interview_service = InterviewService()
-    voice_service = ElevenLabsService()
-    sheets_service = GoogleSheetsService()
+    interview_service = get_interview_service()
+    turn_pipeline = get_turn_pipeline()
+    speech_ingest = get_speech_ingest()
+    sheets_service = get_sheets_service()
+    answer = speech_ingest.new_answer()
     
     try:
         while True:
             # Получаем ответ от кандидата
-            response = await websocket.receive_text()
-            
-            # Анализируем ответ и генерируем следующий вопрос
-            next_question = await interview_service.process_response(session_id, response)
-            
-            # Генерируем голосовой ответ
-            audio = await voice_service.generate_speech(next_question)
+            timeout = speech_ingest.end_silence_ms / 1000 if answer.heard_speech else None
+            try:
+                message = await asyncio.wait_for(websocket.receive(), timeout)
+            except asyncio.TimeoutError:
+                # Кадры перестали приходить: клиент сам не шлет тишину
+                message = None
+            if message is not None and message["type"] == "websocket.disconnect":
+                break
+                
+            if message is None or is_end_of_answer(message.get("text")):
+                response = await answer.finish()
+            elif message.get("bytes") is not None:
+                answer.feed(message["bytes"])
+                if not answer.complete:
+                    continue
+                response = await answer.finish()
+            else:
+                response = message.get("text") or ""
+            answer = speech_ingest.new_answer()
+            if not response:
+                continue
             
-            # Отправляем ответ клиенту
-            await websocket.send_json({
-                "question": next_question,
-                "audio": audio
-            })
+            # Следующий вопрос озвучивается по предложениям, пока генерируется остальное
+            await turn_pipeline.run(session_id, response, websocket.send_json, websocket.send_bytes)
             
             # Если интервью завершено, сохраняем результаты
             if interview_service.is_interview_complete(session_id):
@@ -88,6 +157,10 @@ async def interview_websocket(websocket: WebSocket, session_id: str):
     except Exception as e:
         await websocket.close()
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        answer.cancel()
+        # Соединение закрыто: сохраняем итоговое состояние интервью
+        await interview_service.end_session(session_id)
 
 @app.get("/")
 async def root():
@@ -61,6 +61,8 @@ class Interview(InterviewBase):
 
 class ReportBase(BaseModel):
     interview_id: str
+    candidate_id: Optional[str] = None
+    vacancy_id: Optional[str] = None
     hard_skills_assessment: dict
     soft_skills_assessment: dict
     emotions_analysis: dict
@@ -73,6 +75,7 @@ class ReportCreate(ReportBase):
 class Report(ReportBase):
     id: str = Field(default_factory=lambda: str(uuid4()))
     created_at: datetime = Field(default_factory=datetime.now)
+    status: str = "new"
 
     class Config:
         from_attributes = True
@@ -91,4 +94,14 @@ class HRManager(HRManagerBase):
     hashed_password: str
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkCreateResult(BaseModel):
+    created: int
+    failed: int
+    items: List[BulkItemResult]
\ No newline at end of file
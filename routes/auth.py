@@ -3,13 +3,11 @@ from fastapi import APIRouter, Depends, HTTPException, status, Response
 from fastapi.security import OAuth2PasswordRequestForm
 from models.auth import Token, TokenData, LoginRequest, RegisterRequest
 from services.auth_service import AuthService
-from services.sheets_service import GoogleSheetsService
 from services.security_service import SecurityService
 from dependencies.auth import get_current_user
 
 router = APIRouter()
 auth_service = AuthService()
-sheets_service = GoogleSheetsService()
 security_service = SecurityService()
 
 @router.post("/login", response_model=Token)
@@ -26,7 +24,7 @@ async def login(
         )
         
     access_token = security_service.create_access_token(
-        data={"sub": user.email}
+        data={"sub": user["email"]}
     )
     
     # Устанавливаем HttpOnly куку
@@ -71,49 +69,4 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     access_token = await auth_service.create_access_token(
         data={"sub": user["email"]}, expires_delta=access_token_expires
     )
-    return {"access_token": access_token, "token_type": "bearer"}
-
-@router.post("/register")
-async def register_user(register_data: RegisterRequest):
-    # Проверяем, существует ли пользователь
-    result = sheets_service.service.spreadsheets().values().get(
-        spreadsheetId=sheets_service.spreadsheet_id,
-        range='HR-менеджеры!A:E'
-    ).execute()
-    
-    values = result.get('values', [])
-    if not values:
-        headers = ["ID", "Имя", "Email", "Пароль", "Дата создания"]
-        sheets_service.service.spreadsheets().values().update(
-            spreadsheetId=sheets_service.spreadsheet_id,
-            range='HR-менеджеры!A1:E1',
-            valueInputOption='RAW',
-            body={'values': [headers]}
-        ).execute()
-        values = [headers]
-    
-    for row in values[1:]:
-        if row[2] == register_data.email:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
-    
-    # Создаем нового пользователя
-    hashed_password = auth_service.get_password_hash(register_data.password)
-    new_user = [
-        str(len(values)),  # ID
-        register_data.name,
-        register_data.email,
-        hashed_password,
-        str(datetime.now())
-    ]
-    
-    sheets_service.service.spreadsheets().values().append(
-        spreadsheetId=sheets_service.spreadsheet_id,
-        range='HR-менеджеры!A:E',
-        valueInputOption='RAW',
-        body={'values': [new_user]}
-    ).execute()
-    
-    return {"message": "User registered successfully"} 
\ No newline at end of file
+    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
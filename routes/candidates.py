@@ -1,9 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from models.base import Candidate, CandidateCreate
+from typing import Any, Dict, List
+from fastapi import APIRouter, Body, Depends, HTTPException, Response, status
+from models.base import BulkCreateResult, Candidate, CandidateCreate
 from models.auth import TokenData
 from services.candidate_service import CandidateService
+from services.bulk import MAX_BULK_ITEMS
 from dependencies.auth import get_current_user
+from dependencies.filters import CandidateFilters
+from dependencies.pagination import PageParams, ndjson_response, set_next_cursor
 
 router = APIRouter()
 candidate_service = CandidateService()
@@ -15,6 +18,18 @@ async def create_candidate(
 ):
     return await candidate_service.create_candidate(candidate)
 
+@router.post("/bulk", response_model=BulkCreateResult)
+async def create_candidates_bulk(
+    items: List[Dict[str, Any]] = Body(...),
+    current_user: TokenData = Depends(get_current_user)
+):
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Too many items: at most {MAX_BULK_ITEMS} per request"
+        )
+    return await candidate_service.create_candidates(items)
+
 @router.get("/{candidate_id}", response_model=Candidate)
 async def get_candidate(
     candidate_id: str,
@@ -30,9 +45,18 @@ async def get_candidate(
 
 @router.get("/", response_model=List[Candidate])
 async def get_candidates(
+    response: Response,
+    page: PageParams = Depends(),
+    filters: CandidateFilters = Depends(),
     current_user: TokenData = Depends(get_current_user)
 ):
-    return await candidate_service.get_candidates()
+    if page.stream:
+        return ndjson_response(candidate_service.stream_candidates(**filters.conditions))
+    if not page.paginated:
+        return await candidate_service.get_candidates(**filters.conditions)
+    candidates, next_cursor = await candidate_service.get_candidates_page(page.limit, page.cursor, **filters.conditions)
+    set_next_cursor(response, next_cursor)
+    return candidates
 
 @router.put("/{candidate_id}", response_model=Candidate)
 async def update_candidate(
@@ -1,12 +1,15 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from models.base import Interview, InterviewCreate
 from models.auth import TokenData
-from services.interview_service import InterviewService
+from services.interview_service import get_interview_service
 from dependencies.auth import get_current_user
+from dependencies.filters import InterviewFilters
+from dependencies.pagination import PageParams, ndjson_response, set_next_cursor
+from dependencies.export import ExportParams, export_response
 
 router = APIRouter()
-interview_service = InterviewService()
+interview_service = get_interview_service()
 
 @router.post("/", response_model=Interview)
 async def create_interview(
@@ -15,6 +18,14 @@ async def create_interview(
 ):
     return await interview_service.create_interview(interview)
 
+@router.get("/export")
+async def export_interviews(
+    export: ExportParams = Depends(),
+    filters: InterviewFilters = Depends(),
+    current_user: TokenData = Depends(get_current_user)
+):
+    return export_response(interview_service.export_interviews(export.format, **filters.conditions), export, "interviews")
+
 @router.get("/{interview_id}", response_model=Interview)
 async def get_interview(
     interview_id: str,
@@ -30,9 +41,18 @@ async def get_interview(
 
 @router.get("/", response_model=List[Interview])
 async def get_interviews(
+    response: Response,
+    page: PageParams = Depends(),
+    filters: InterviewFilters = Depends(),
     current_user: TokenData = Depends(get_current_user)
 ):
-    return await interview_service.get_interviews()
+    if page.stream:
+        return ndjson_response(interview_service.stream_interviews(**filters.conditions))
+    if not page.paginated:
+        return await interview_service.get_interviews(**filters.conditions)
+    interviews, next_cursor = await interview_service.get_interviews_page(page.limit, page.cursor, **filters.conditions)
+    set_next_cursor(response, next_cursor)
+    return interviews
 
 @router.put("/{interview_id}", response_model=Interview)
 async def update_interview(
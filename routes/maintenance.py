@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from models.auth import TokenData
+from services.compaction import compact_tables
+from dependencies.auth import get_current_user
+
+router = APIRouter()
+
+@router.post("/compact")
+async def compact(
+    current_user: TokenData = Depends(get_current_user)
+):
+    """Удаление очищенных строк из всех листов с отчетом по каждому"""
+    reports = await compact_tables()
+    if reports is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Compaction is already running in another worker"
+        )
+    return {"tables": reports}
\ No newline at end of file
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends
+from models.auth import TokenData
+from services.repository import get_storage_metrics
+from services.token_cache import get_token_cache
+from services.session_store import get_session_store
+from services.turn_pipeline import get_turn_pipeline
+from services.audio_stream import get_speech_ingest
+from services.tts_cache import get_tts_cache
+from services.question_plan import get_question_planner
+from dependencies.auth import get_current_user
+
+router = APIRouter()
+
+@router.get("/storage")
+async def storage_metrics(
+    current_user: TokenData = Depends(get_current_user)
+):
+    """Метрики хранилища: попадания в кэш листов и т.п."""
+    return get_storage_metrics()
+
+@router.get("/auth")
+async def auth_metrics(
+    current_user: TokenData = Depends(get_current_user)
+):
+    """Кэш проверенных токенов"""
+    return {"token_cache": get_token_cache().stats()}
+
+@router.get("/sessions")
+async def session_metrics(
+    current_user: TokenData = Depends(get_current_user)
+):
+    """Активные интервью, их фоновое сохранение, ожидание текста ответа и время до первого аудио"""
+    return {
+        **get_session_store().stats(),
+        "audio": get_speech_ingest().stats(),
+        "turns": get_turn_pipeline().stats()
+    }
+
+@router.get("/tts")
+async def tts_metrics(
+    current_user: TokenData = Depends(get_current_user)
+):
+    """Кэш синтезированной речи и заранее озвученные планы вопросов вакансий"""
+    return {**get_tts_cache().stats(), "question_plans": get_question_planner().stats()}
\ No newline at end of file
@@ -1,9 +1,11 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from models.notification import Notification, NotificationCreate
 from models.auth import TokenData
 from services.notification_service import NotificationService
 from dependencies.auth import get_current_user
+from dependencies.pagination import PageParams, ndjson_response, set_next_cursor
+from services.pagination import MAX_PAGE_SIZE
 
 router = APIRouter()
 notification_service = NotificationService()
@@ -15,22 +17,51 @@ async def create_notification(
 ):
     return await notification_service.create_notification(notification)
 
+async def get_current_manager_id(
+    current_user: TokenData = Depends(get_current_user)
+) -> str:
+    hr_manager_id = await notification_service.get_manager_id(current_user.email)
+    if hr_manager_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="HR manager not found"
+        )
+    return hr_manager_id
+
 @router.get("/", response_model=List[Notification])
 async def get_notifications(
-    current_user: TokenData = Depends(get_current_user)
+    response: Response,
+    page: PageParams = Depends(),
+    unread: bool = False,
+    latest: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    hr_manager_id: str = Depends(get_current_manager_id)
+):
+    if page.stream:
+        return ndjson_response(notification_service.stream_notifications(hr_manager_id, unread))
+    if latest is not None:
+        return await notification_service.get_latest_notifications(hr_manager_id, latest, unread)
+    if not page.paginated:
+        return await notification_service.get_notifications(hr_manager_id, unread)
+    notifications, next_cursor = await notification_service.get_notifications_page(hr_manager_id, page.limit, page.cursor, unread)
+    set_next_cursor(response, next_cursor)
+    return notifications
+
+@router.get("/unread-count")
+async def get_unread_count(
+    hr_manager_id: str = Depends(get_current_manager_id)
 ):
-    return await notification_service.get_notifications(current_user.id)
+    return {"unread": await notification_service.count_unread(hr_manager_id)}
 
 @router.put("/{notification_id}/status")
 async def update_notification_status(
     notification_id: str,
-    status: str,
+    new_status: str = Query(..., alias="status"),
     current_user: TokenData = Depends(get_current_user)
 ):
-    notification = await notification_service.update_notification_status(notification_id, status)
+    notification = await notification_service.update_notification_status(notification_id, new_status)
     if not notification:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Notification not found"
         )
-    return notification 
\ No newline at end of file
+    return notification
\ No newline at end of file
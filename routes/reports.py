@@ -1,9 +1,11 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from models.base import Report, ReportCreate
 from models.auth import TokenData
 from services.report_service import ReportService
 from dependencies.auth import get_current_user
+from dependencies.pagination import PageParams, ndjson_response, set_next_cursor
+from dependencies.export import ExportParams, export_response
 
 router = APIRouter()
 report_service = ReportService()
@@ -15,6 +17,13 @@ async def create_report(
 ):
     return await report_service.create_report(report)
 
+@router.get("/export")
+async def export_reports(
+    export: ExportParams = Depends(),
+    current_user: TokenData = Depends(get_current_user)
+):
+    return export_response(report_service.export_reports(export.format), export, "reports")
+
 @router.get("/{report_id}", response_model=Report)
 async def get_report(
     report_id: str,
@@ -30,9 +39,17 @@ async def get_report(
 
 @router.get("/", response_model=List[Report])
 async def get_reports(
+    response: Response,
+    page: PageParams = Depends(),
     current_user: TokenData = Depends(get_current_user)
 ):
-    return await report_service.get_reports()
+    if page.stream:
+        return ndjson_response(report_service.stream_reports())
+    if not page.paginated:
+        return await report_service.get_reports()
+    reports, next_cursor = await report_service.get_reports_page(page.limit, page.cursor)
+    set_next_cursor(response, next_cursor)
+    return reports
 
 @router.put("/{report_id}/status")
 async def update_report_status(
@@ -1,9 +1,12 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from models.base import Vacancy, VacancyCreate
+from typing import Any, Dict, List
+from fastapi import APIRouter, Body, Depends, HTTPException, Response, status
+from models.base import BulkCreateResult, Vacancy, VacancyCreate
 from models.auth import TokenData
 from services.vacancy_service import VacancyService
+from services.bulk import MAX_BULK_ITEMS
 from dependencies.auth import get_current_user
+from dependencies.filters import VacancyFilters
+from dependencies.pagination import PageParams, ndjson_response, set_next_cursor
 
 router = APIRouter()
 vacancy_service = VacancyService()
@@ -15,6 +18,18 @@ async def create_vacancy(
 ):
     return await vacancy_service.create_vacancy(vacancy)
 
+@router.post("/bulk", response_model=BulkCreateResult)
+async def create_vacancies_bulk(
+    items: List[Dict[str, Any]] = Body(...),
+    current_user: TokenData = Depends(get_current_user)
+):
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Too many items: at most {MAX_BULK_ITEMS} per request"
+        )
+    return await vacancy_service.create_vacancies(items)
+
 @router.get("/{vacancy_id}", response_model=Vacancy)
 async def get_vacancy(
     vacancy_id: str,
@@ -30,9 +45,18 @@ async def get_vacancy(
 
 @router.get("/", response_model=List[Vacancy])
 async def get_vacancies(
+    response: Response,
+    page: PageParams = Depends(),
+    filters: VacancyFilters = Depends(),
     current_user: TokenData = Depends(get_current_user)
 ):
-    return await vacancy_service.get_vacancies()
+    if page.stream:
+        return ndjson_response(vacancy_service.stream_vacancies(**filters.conditions))
+    if not page.paginated:
+        return await vacancy_service.get_vacancies(**filters.conditions)
+    vacancies, next_cursor = await vacancy_service.get_vacancies_page(page.limit, page.cursor, **filters.conditions)
+    set_next_cursor(response, next_cursor)
+    return vacancies
 
 @router.put("/{vacancy_id}", response_model=Vacancy)
 async def update_vacancy(
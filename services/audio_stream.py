@@ -0,0 +1,234 @@
+import os
+import sys
+import math
+import time
+import asyncio
+from array import array
+from operator import mul
+from typing import Dict, List, Optional
+from services.whisper_service import WhisperService
+
+# Формат бинарных кадров от клиента: PCM 16 бит, моно, little-endian
+SAMPLE_WIDTH = 2
+FRAME_MS = 20
+# Порог громкости речи: не ниже MIN_SPEECH_RMS и в SPEECH_TO_NOISE раз выше фонового шума
+MIN_SPEECH_RMS = 300.0
+SPEECH_TO_NOISE = 3.0
+# Сколько звука перед началом речи добавлять к фрагменту, чтобы не срезать первый слог
+PREROLL_MS = 300
+# Фрагменты, где речи меньше, считаются щелчками и шумом
+MIN_SPEECH_MS = 200
+
+def frame_rms(frame: bytes) -> float:
+    samples = array("h", frame)
+    if sys.byteorder == "big":
+        samples.byteswap()
+    return math.sqrt(sum(map(mul, samples, samples)) / len(samples))
+
+
+class PcmRingBuffer:
+    """Кольцевой буфер аудио с абсолютными позициями в байтах от начала потока"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = bytearray(capacity)
+        self.total = 0
+
+    @property
+    def oldest(self) -> int:
+        """Позиция самого старого байта, который еще в буфере"""
+        return max(0, self.total - self.capacity)
+
+    def write(self, data: bytes) -> None:
+        if len(data) > self.capacity:
+            # В буфере остаются последние capacity байт, но позиции считаются по всему куску
+            self.total += len(data) - self.capacity
+            data = data[-self.capacity:]
+        offset = self.total % self.capacity
+        first = min(len(data), self.capacity - offset)
+        self._data[offset:offset + first] = data[:first]
+        self._data[:len(data) - first] = data[first:]
+        self.total += len(data)
+
+    def slice(self, start: int, end: int) -> bytes:
+        if not self.oldest <= start <= end <= self.total:
+            raise ValueError("Audio range is no longer in the buffer")
+        offset = start % self.capacity
+        size = end - start
+        if offset + size <= self.capacity:
+            return bytes(self._data[offset:offset + size])
+        return bytes(self._data[offset:] + self._data[:size - (self.capacity - offset)])
+
+
+class VoiceActivitySegmenter:
+    """Нарезка потока PCM на фрагменты речи по паузам.
+
+    Громкость считается по кадрам FRAME_MS; фрагмент закрывается паузой
+    длиннее segment_silence_ms или по достижении max_segment_ms, чтобы
+    транскрибация шла, пока кандидат еще говорит.
+    """
+
+    def __init__(self, sample_rate: int, segment_silence_ms: int, max_segment_ms: int):
+        self.frame_bytes = sample_rate * FRAME_MS // 1000 * SAMPLE_WIDTH
+        self.preroll_bytes = sample_rate * PREROLL_MS // 1000 * SAMPLE_WIDTH
+        self.max_segment_bytes = sample_rate * max_segment_ms // 1000 * SAMPLE_WIDTH
+        self.segment_silence_frames = max(segment_silence_ms // FRAME_MS, 1)
+        self.min_speech_frames = MIN_SPEECH_MS // FRAME_MS
+        self.ring = PcmRingBuffer(self.max_segment_bytes + self.preroll_bytes + self.frame_bytes)
+        self._pending = bytearray()
+        self._noise = MIN_SPEECH_RMS / SPEECH_TO_NOISE
+        self._segment_start: Optional[int] = None
+        self._last_cut = 0
+        self._speech_frames = 0
+        self._quiet_frames = 0
+        self.heard_speech = False
+
+    @property
+    def silence_ms(self) -> int:
+        """Длительность тишины после последнего кадра речи"""
+        return self._quiet_frames * FRAME_MS
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Принимает очередной кусок аудио; возвращает закрытые фрагменты речи"""
+        self._pending += data
+        segments = []
+        while len(self._pending) >= self.frame_bytes:
+            frame = bytes(self._pending[:self.frame_bytes])
+            del self._pending[:self.frame_bytes]
+            segment = self._process(frame)
+            if segment is not None:
+                segments.append(segment)
+        return segments
+
+    def flush(self) -> Optional[bytes]:
+        """Незакрытый фрагмент в конце ответа"""
+        self._pending.clear()
+        return self._cut(self.ring.total)
+
+    def _process(self, frame: bytes) -> Optional[bytes]:
+        self.ring.write(frame)
+        rms = frame_rms(frame)
+        if rms > max(MIN_SPEECH_RMS, self._noise * SPEECH_TO_NOISE):
+            if self._segment_start is None:
+                self._segment_start = max(
+                    self.ring.total - self.frame_bytes - self.preroll_bytes, self.ring.oldest, self._last_cut
+                )
+            self._speech_frames += 1
+            self._quiet_frames = 0
+            self.heard_speech = True
+        else:
+            # Уровень шума подстраивается только по кадрам без речи
+            self._noise = 0.95 * self._noise + 0.05 * rms
+            self._quiet_frames += 1
+
+        if self._segment_start is None:
+            return None
+        if self._quiet_frames >= self.segment_silence_frames:
+            return self._cut(self.ring.total)
+        if self.ring.total - self._segment_start >= self.max_segment_bytes:
+            return self._cut(self.ring.total)
+        return None
+
+    def _cut(self, end: int) -> Optional[bytes]:
+        if self._segment_start is None:
+            return None
+        segment = self.ring.slice(self._segment_start, end) if self._speech_frames >= self.min_speech_frames else None
+        self._segment_start = None
+        self._speech_frames = 0
+        self._last_cut = end
+        return segment
+
+
+class AnswerStream:
+    """Ответ кандидата, поступающий аудио по ходу речи.
+
+    Закрытые фрагменты сразу уходят в транскрибацию; к концу ответа
+    распознанной остается только последняя фраза.
+    """
+
+    def __init__(self, ingest: "SpeechIngest"):
+        self.ingest = ingest
+        self.segmenter = VoiceActivitySegmenter(ingest.sample_rate, ingest.segment_silence_ms, ingest.max_segment_ms)
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def heard_speech(self) -> bool:
+        return self.segmenter.heard_speech
+
+    @property
+    def complete(self) -> bool:
+        """Кандидат замолчал дольше end_silence_ms"""
+        return self.heard_speech and self.segmenter.silence_ms >= self.ingest.end_silence_ms
+
+    def feed(self, data: bytes) -> None:
+        for segment in self.segmenter.feed(data):
+            self._transcribe(segment)
+
+    def _transcribe(self, segment: bytes) -> None:
+        self.ingest.segments += 1
+        self._tasks.append(asyncio.create_task(
+            self.ingest.whisper_service.transcribe_pcm(segment, self.ingest.sample_rate)
+        ))
+
+    async def finish(self) -> str:
+        """Текст ответа: фрагменты в порядке речи"""
+        segment = self.segmenter.flush()
+        if segment is not None:
+            self._transcribe(segment)
+        started = time.monotonic()
+        texts = await asyncio.gather(*self._tasks)
+        self._tasks = []
+        self.ingest.record_answer(1000 * (time.monotonic() - started))
+        return " ".join(text.strip() for text in texts if text and text.strip())
+
+    def cancel(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+
+
+class SpeechIngest:
+    """Параметры приема аудио и метрики задержки распознавания"""
+
+    def __init__(self, whisper_service: WhisperService, sample_rate: int, segment_silence_ms: int,
+                 end_silence_ms: int, max_segment_ms: int):
+        self.whisper_service = whisper_service
+        self.sample_rate = sample_rate
+        self.segment_silence_ms = segment_silence_ms
+        self.end_silence_ms = max(end_silence_ms, segment_silence_ms)
+        self.max_segment_ms = max_segment_ms
+        self.answers = 0
+        self.segments = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def new_answer(self) -> AnswerStream:
+        return AnswerStream(self)
+
+    def record_answer(self, wait_ms: float) -> None:
+        self.answers += 1
+        self.total_wait += wait_ms
+        self.max_wait = max(self.max_wait, wait_ms)
+
+    def stats(self) -> Dict:
+        """Время ожидания текста после окончания речи"""
+        return {
+            "answers": self.answers,
+            "segments": self.segments,
+            "avg_transcript_wait_ms": self.total_wait / self.answers if self.answers else 0.0,
+            "max_transcript_wait_ms": self.max_wait
+        }
+
+
+_speech_ingest: Optional[SpeechIngest] = None
+
+def get_speech_ingest() -> SpeechIngest:
+    global _speech_ingest
+    if _speech_ingest is None:
+        _speech_ingest = SpeechIngest(
+            WhisperService(),
+            sample_rate=int(os.getenv("AUDIO_SAMPLE_RATE", "16000")),
+            segment_silence_ms=int(os.getenv("VAD_SEGMENT_SILENCE_MS", "400")),
+            end_silence_ms=int(os.getenv("VAD_END_SILENCE_MS", "1200")),
+            max_segment_ms=int(os.getenv("VAD_MAX_SEGMENT_MS", "15000"))
+        )
+    return _speech_ingest
\ No newline at end of file
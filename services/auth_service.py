@@ -1,25 +1,55 @@
 import os
+import time
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from models.auth import TokenData
-from services.sheets_service import GoogleSheetsService
+from models.auth import TokenData, RegisterRequest
+from services.repository import get_repository
+from services.tables import HR_MANAGERS
+from services.codecs import HR_MANAGER_CODEC
+from services.token_cache import get_token_cache
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt тратит на проверку пароля порядка 200 мс процессора. В event loop это
+# останавливало бы все корутины, включая идущие интервью, поэтому хэширование
+# выполняется в отдельном ограниченном пуле (bcrypt отпускает GIL)
+_password_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("PASSWORD_HASH_WORKERS", "2")),
+    thread_name_prefix="bcrypt"
+)
+# Хэш для проверки при неизвестном email: время ответа не выдает, есть ли пользователь
+_dummy_hash: Optional[str] = None
+
 class AuthService:
     def __init__(self):
         self.secret_key = os.getenv("JWT_SECRET")
-        self.algorithm = os.getenv("JWT_ALGORITHM")
+        # Тот же алгоритм по умолчанию, что у SecurityService: токены выдает один сервис, проверяет другой
+        self.algorithm = os.getenv("JWT_ALGORITHM", "HS256")
         self.access_token_expire_minutes = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
-        self.sheets_service = GoogleSheetsService()
+        self.repository = get_repository(HR_MANAGERS)
+        self.token_cache = get_token_cache()
+        # email -> момент, до которого пользователь считается существующим без чтения листа
+        self.user_cache_ttl = float(os.getenv("USER_CACHE_TTL", "60"))
+        self._known_users: "OrderedDict[str, float]" = OrderedDict()
+        # Отрицательные ответы живут недолго: запросы с токеном удаленного пользователя
+        # не должны каждый раз читать лист, а новый пользователь - долго ждать доступа
+        self.user_miss_cache_ttl = float(os.getenv("USER_MISS_CACHE_TTL", "5"))
+        self._unknown_users: "OrderedDict[str, float]" = OrderedDict()
+        # Токены с выдуманными email не должны раздувать кэши пользователей без предела
+        self.user_cache_size = int(os.getenv("USER_CACHE_SIZE", "10000"))
         
-    def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, pwd_context.verify, plain_password, hashed_password)
         
-    def get_password_hash(self, password: str) -> str:
-        return pwd_context.hash(password)
+    async def get_password_hash(self, password: str) -> str:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, pwd_context.hash, password)
         
     async def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
         to_encode = data.copy()
@@ -32,51 +62,79 @@ class AuthService:
         return encoded_jwt
         
     async def authenticate_user(self, email: str, password: str) -> Optional[dict]:
-        # Получаем пользователя из Google Sheets
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='HR-менеджеры!A:E'
-        ).execute()
+        # Получаем пользователя по email через индекс, без чтения всего листа
+        rows = await self.repository.find(email=email)
+        for row in rows:
+            if await self.verify_password(password, row[3]):  # Проверяем пароль
+                return HR_MANAGER_CODEC.decode(row)
+        if not rows:
+            global _dummy_hash
+            if _dummy_hash is None:
+                _dummy_hash = await self.get_password_hash(os.urandom(16).hex())
+            await self.verify_password(password, _dummy_hash)
+        return None
         
-        values = result.get('values', [])
-        if not values:
+    async def create_user(self, register_data: RegisterRequest) -> Optional[dict]:
+        # Проверяем, существует ли пользователь
+        if await self.repository.find(email=register_data.email):
             return None
             
-        headers = values[0]
-        for row in values[1:]:
-            if row[2] == email:  # Проверяем email
-                if self.verify_password(password, row[3]):  # Проверяем пароль
-                    return {
-                        "id": row[0],
-                        "name": row[1],
-                        "email": row[2],
-                        "hashed_password": row[3],
-                        "created_at": row[4]
-                    }
-        return None
+        # Создаем нового пользователя
+        new_user = {
+            "id": await self.repository.next_id(),
+            "name": register_data.name,
+            "email": register_data.email,
+            "hashed_password": await self.get_password_hash(register_data.password),
+            "created_at": datetime.now().isoformat()
+        }
+        await self.repository.insert(HR_MANAGER_CODEC.encode(new_user))
+        self._unknown_users.pop(register_data.email, None)
+        return new_user
+        
+    async def user_exists(self, email: str) -> bool:
+        """Проверка существования пользователя.
+
+        Положительный ответ кэшируется на user_cache_ttl, отрицательный - на
+        user_miss_cache_ttl. Ошибка чтения хранилища пробрасывается вызывающему.
+        """
+        now = time.monotonic()
+        if self._known_users.get(email, 0.0) > now:
+            return True
+        if self._unknown_users.get(email, 0.0) > now:
+            return False
+        if not await self.repository.find(email=email):
+            self._known_users.pop(email, None)
+            self._remember(self._unknown_users, email, self.user_miss_cache_ttl)
+            return False
+        self._unknown_users.pop(email, None)
+        self._remember(self._known_users, email, self.user_cache_ttl)
+        return True
+
+    def _remember(self, users: "OrderedDict[str, float]", email: str, ttl: float) -> None:
+        """Запись в кэш пользователей; при переполнении вытесняется та, что истекает раньше всех"""
+        if self.user_cache_size <= 0:
+            return
+        # TTL у записей одного кэша одинаковый, поэтому порядок вставки - порядок истечения
+        users.pop(email, None)
+        users[email] = time.monotonic() + ttl
+        while len(users) > self.user_cache_size:
+            users.popitem(last=False)
         
     async def get_current_user(self, token: str) -> Optional[TokenData]:
         credentials_exception = ValueError("Could not validate credentials")
-        try:
-            payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            email: str = payload.get("sub")
-            if email is None:
+        payload = self.token_cache.get(token, self.secret_key, self.algorithm)
+        if payload is None:
+            try:
+                payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
+            except JWTError:
                 raise credentials_exception
-            token_data = TokenData(email=email)
-        except JWTError:
+            self.token_cache.put(token, self.secret_key, self.algorithm, payload)
+        email: str = payload.get("sub")
+        if email is None:
             raise credentials_exception
+        token_data = TokenData(email=email)
             
-        # Получаем пользователя из Google Sheets
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='HR-менеджеры!A:E'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values:
+        # Проверяем, что пользователь существует
+        if not await self.user_exists(token_data.email):
             return None
-            
-        for row in values[1:]:
-            if row[2] == token_data.email:
-                return TokenData(email=row[2])
-        return None 
\ No newline at end of file
+        return token_data
\ No newline at end of file
@@ -0,0 +1,18 @@
+from typing import Any, Dict, List, Tuple, Type, TypeVar
+from pydantic import BaseModel, ValidationError
+from models.base import BulkItemResult
+
+# Предел записей в одном запросе массового создания
+MAX_BULK_ITEMS = 10000
+
+ModelType = TypeVar("ModelType", bound=BaseModel)
+
+def validate_items(model: Type[ModelType], items: List[Dict[str, Any]]) -> Tuple[List[Tuple[int, ModelType]], List[BulkItemResult]]:
+    """Проверяет каждую запись отдельно: ошибка в одной не отменяет остальные"""
+    valid, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, model(**item)))
+        except (ValidationError, TypeError) as e:
+            errors.append(BulkItemResult(index=index, error=str(e)))
+    return valid, errors
\ No newline at end of file
@@ -1,168 +1,88 @@
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
-from models.base import Candidate, CandidateCreate
-from services.sheets_service import GoogleSheetsService
+from models.base import BulkCreateResult, BulkItemResult, Candidate, CandidateCreate
+from services.repository import get_repository
+from services.tables import CANDIDATES
+from services.codecs import CANDIDATE_CODEC
+from services.pagination import iter_records
+from services.secondary_index import Condition
+from services.sheets_scheduler import BULK, sheets_lane
+from services.bulk import validate_items
 
 class CandidateService:
     def __init__(self):
-        self.sheets_service = GoogleSheetsService()
-        
+        self.repository = get_repository(CANDIDATES)
+
     async def create_candidate(self, candidate: CandidateCreate) -> Candidate:
-        # Получаем текущих кандидатов
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Кандидаты!A:E'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values:
-            # Создаем заголовки, если таблица пуста
-            headers = ["ID", "Имя", "Email", "Телефон", "Пол", "Дата создания"]
-            self.sheets_service.service.spreadsheets().values().update(
-                spreadsheetId=self.sheets_service.spreadsheet_id,
-                range='Кандидаты!A1:F1',
-                valueInputOption='RAW',
-                body={'values': [headers]}
-            ).execute()
-            values = [headers]
-        
         # Создаем нового кандидата
         new_candidate = Candidate(
-            id=str(len(values)),
+            id=await self.repository.next_id(),
             name=candidate.name,
             email=candidate.email,
             phone=candidate.phone,
             gender=candidate.gender,
             created_at=datetime.now()
         )
-        
-        # Подготавливаем данные для записи
-        row_data = [
-            new_candidate.id,
-            new_candidate.name,
-            new_candidate.email,
-            new_candidate.phone,
-            new_candidate.gender,
-            str(new_candidate.created_at)
-        ]
-        
+
         # Добавляем кандидата в таблицу
-        self.sheets_service.service.spreadsheets().values().append(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Кандидаты!A:F',
-            valueInputOption='RAW',
-            body={'values': [row_data]}
-        ).execute()
-        
+        await self.repository.insert(CANDIDATE_CODEC.encode(new_candidate.dict()))
+
         return new_candidate
-        
+
+    async def create_candidates(self, items: List[Dict[str, Any]]) -> BulkCreateResult:
+        """Массовое создание: проверка, выдача ID и запись одним запросом"""
+        valid, errors = validate_items(CandidateCreate, items)
+        created = []
+        if valid:
+            now = datetime.now()
+            with sheets_lane(BULK):
+                ids = await self.repository.next_ids(len(valid))
+                candidates = [
+                    Candidate(id=candidate_id, created_at=now, **candidate.dict())
+                    for candidate_id, (_, candidate) in zip(ids, valid)
+                ]
+                await self.repository.insert_many([CANDIDATE_CODEC.encode(candidate.dict()) for candidate in candidates])
+            created = [BulkItemResult(index=index, id=candidate_id) for candidate_id, (index, _) in zip(ids, valid)]
+        return BulkCreateResult(
+            created=len(created),
+            failed=len(errors),
+            items=sorted(created + errors, key=lambda item: item.index)
+        )
+
     async def get_candidate(self, candidate_id: str) -> Optional[Candidate]:
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Кандидаты!A:F'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values or len(values) < 2:  # Проверяем наличие заголовков и данных
+        row = await self.repository.get(candidate_id)
+        if not row:
             return None
-            
-        for row in values[1:]:  # Пропускаем заголовки
-            if row[0] == candidate_id:
-                return Candidate(
-                    id=row[0],
-                    name=row[1],
-                    email=row[2],
-                    phone=row[3],
-                    gender=row[4],
-                    created_at=datetime.fromisoformat(row[5])
-                )
-        return None
-        
-    async def get_candidates(self) -> List[Candidate]:
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Кандидаты!A:F'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values or len(values) < 2:  # Проверяем наличие заголовков и данных
-            return []
-            
-        candidates = []
-        for row in values[1:]:  # Пропускаем заголовки
-            candidate = Candidate(
-                id=row[0],
-                name=row[1],
-                email=row[2],
-                phone=row[3],
-                gender=row[4],
-                created_at=datetime.fromisoformat(row[5])
-            )
-            candidates.append(candidate)
-        return candidates
-        
+        return Candidate(**CANDIDATE_CODEC.decode(row))
+
+    async def get_candidates(self, **filters: Condition) -> List[Candidate]:
+        return [Candidate(**data) for data in CANDIDATE_CODEC.decode_rows(await self.repository.find(**filters))]
+
+    async def get_candidates_page(self, limit: int, cursor: Optional[str] = None, **filters: Condition) -> Tuple[List[Candidate], Optional[str]]:
+        rows, next_cursor = await self.repository.page(limit, cursor, **filters)
+        return [Candidate(**data) for data in CANDIDATE_CODEC.decode_rows(rows)], next_cursor
+
+    def stream_candidates(self, **filters: Condition) -> AsyncIterator[Dict]:
+        return iter_records(self.repository, CANDIDATE_CODEC, **filters)
+
     async def update_candidate(self, candidate_id: str, candidate: CandidateCreate) -> Optional[Candidate]:
-        # Получаем текущих кандидатов
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Кандидаты!A:F'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values or len(values) < 2:
+        current = await self.get_candidate(candidate_id)
+        if not current:
             return None
-            
-        # Ищем кандидата для обновления
-        for i, row in enumerate(values[1:], start=2):  # start=2 потому что первая строка - заголовки
-            if row[0] == candidate_id:
-                updated_candidate = Candidate(
-                    id=candidate_id,
-                    name=candidate.name,
-                    email=candidate.email,
-                    phone=candidate.phone,
-                    gender=candidate.gender,
-                    created_at=datetime.fromisoformat(row[5])
-                )
-                
-                # Подготавливаем данные для обновления
-                row_data = [
-                    updated_candidate.id,
-                    updated_candidate.name,
-                    updated_candidate.email,
-                    updated_candidate.phone,
-                    updated_candidate.gender,
-                    str(updated_candidate.created_at)
-                ]
-                
-                # Обновляем кандидата в таблице
-                self.sheets_service.service.spreadsheets().values().update(
-                    spreadsheetId=self.sheets_service.spreadsheet_id,
-                    range=f'Кандидаты!A{i}:F{i}',
-                    valueInputOption='RAW',
-                    body={'values': [row_data]}
-                ).execute()
-                
-                return updated_candidate
-        return None
-        
+
+        updated_candidate = Candidate(
+            id=candidate_id,
+            name=candidate.name,
+            email=candidate.email,
+            phone=candidate.phone,
+            gender=candidate.gender,
+            created_at=current.created_at
+        )
+
+        # Обновляем кандидата в таблице
+        if not await self.repository.update(candidate_id, CANDIDATE_CODEC.encode(updated_candidate.dict())):
+            return None
+        return updated_candidate
+
     async def delete_candidate(self, candidate_id: str) -> bool:
-        # Получаем текущих кандидатов
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Кандидаты!A:F'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values or len(values) < 2:
-            return False
-            
-        # Ищем кандидата для удаления
-        for i, row in enumerate(values[1:], start=2):
-            if row[0] == candidate_id:
-                # Удаляем строку с кандидатом
-                self.sheets_service.service.spreadsheets().values().clear(
-                    spreadsheetId=self.sheets_service.spreadsheet_id,
-                    range=f'Кандидаты!A{i}:F{i}'
-                ).execute()
-                return True
-        return False 
\ No newline at end of file
+        return await self.repository.delete(candidate_id)
\ No newline at end of file
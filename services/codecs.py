@@ -0,0 +1,180 @@
+import ast
+import gc
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+from services.tables import TableSchema, CANDIDATES, VACANCIES, INTERVIEWS, REPORTS, NOTIFICATIONS, HR_MANAGERS
+
+# Версии формата ячеек:
+#   1 - исходный: списки через запятую, словари через str() и eval, даты через str()
+#   2 - текущий: списки и словари в JSON, даты в ISO 8601
+# Запись всегда идет в текущей версии, чтение понимает обе.
+CODEC_VERSION = 2
+
+STR = "str"
+OPTIONAL_STR = "optional_str"
+DATETIME = "datetime"
+OPTIONAL_DATETIME = "optional_datetime"
+LIST = "list"            # список строк
+JSON_LIST = "json_list"  # список объектов
+JSON_DICT = "json_dict"  # объект
+
+_JSON_KINDS = (LIST, JSON_LIST, JSON_DICT)
+_EMPTY = {LIST: list, JSON_LIST: list, JSON_DICT: dict}
+_TYPES = {LIST: list, JSON_LIST: list, JSON_DICT: dict}
+
+_encode_json = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+_decode_json = json.JSONDecoder().decode
+
+
+def _encode_cell(kind: str, value: Any) -> str:
+    if value is None:
+        return ""
+    if kind in (DATETIME, OPTIONAL_DATETIME):
+        return value.isoformat() if isinstance(value, datetime) else str(value)
+    if kind in _JSON_KINDS:
+        return _encode_json(value)
+    return str(value)
+
+
+def _decode_structured(kind: str, cell: str) -> Any:
+    """Декодирует ячейку со списком или словарем в любой из версий формата"""
+    if not cell:
+        return _EMPTY[kind]()
+    if cell[0] in "[{":
+        try:
+            value = _decode_json(cell)
+            if isinstance(value, _TYPES[kind]):
+                return value
+        except ValueError:
+            pass
+    if kind == LIST:
+        # Версия 1: элементы через запятую
+        return cell.split(",")
+    # Версия 1: str() от словаря или списка; literal_eval не выполняет код, в отличие от eval
+    return ast.literal_eval(cell)
+
+
+def _cell_decoder(kind: str) -> Callable[[str], Any]:
+    if kind == OPTIONAL_STR:
+        return lambda cell: cell or None
+    if kind == DATETIME:
+        return datetime.fromisoformat
+    if kind == OPTIONAL_DATETIME:
+        return lambda cell: datetime.fromisoformat(cell) if cell else None
+    if kind in _JSON_KINDS:
+        return lambda cell: _decode_structured(kind, cell)
+    return lambda cell: cell
+
+
+def _decode_column(kind: str, cells: List[str]) -> List[Any]:
+    """Декодирует колонку целиком; JSON-колонка разбирается одним вызовом парсера"""
+    if kind == STR:
+        return list(cells)
+    if kind == DATETIME:
+        return list(map(datetime.fromisoformat, cells))
+    if kind in _JSON_KINDS:
+        filled = [cell for cell in cells if cell]
+        if all(cell[0] in "[{" for cell in filled):
+            try:
+                parsed = _decode_json("[" + ",".join(filled) + "]")
+            except ValueError:
+                parsed = None
+            expected = _TYPES[kind]
+            if parsed is not None and len(parsed) == len(filled) and all(isinstance(value, expected) for value in parsed):
+                values = iter(parsed)
+                return [next(values) if cell else _EMPTY[kind]() for cell in cells]
+    # Смешанные версии или необычные значения - по одной ячейке
+    decoder = _cell_decoder(kind)
+    return [decoder(cell) for cell in cells]
+
+
+class RowCodec:
+    """Преобразование строк листа в поля модели и обратно"""
+
+    version = CODEC_VERSION
+
+    def __init__(self, table: TableSchema, kinds: Optional[Dict[str, str]] = None):
+        self.table = table
+        self.kinds = [(kinds or {}).get(column, STR) for column in table.columns]
+        self._decoders = [_cell_decoder(kind) for kind in self.kinds]
+
+    def encode(self, data: Dict[str, Any]) -> List[str]:
+        return [
+            _encode_cell(kind, data.get(column))
+            for column, kind in zip(self.table.columns, self.kinds)
+        ]
+
+    def decode(self, row: List[str]) -> Dict[str, Any]:
+        row = self.table.normalize(row)
+        return {
+            column: decoder(cell)
+            for column, decoder, cell in zip(self.table.columns, self._decoders, row)
+        }
+
+    def decode_columns(self, rows: List[List[str]]) -> List[List[Any]]:
+        """Пакетное декодирование в колонки: по списку значений на колонку таблицы"""
+        if not rows:
+            return [[] for _ in self.table.columns]
+        width = len(self.table.columns)
+        # Декодирование создает сотни тысяч объектов без циклов: сборщик мусора
+        # на это время отключается, иначе он съедает до трети времени
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            columns = zip(*(row if len(row) == width else self.table.normalize(row) for row in rows))
+            return [_decode_column(kind, cells) for kind, cells in zip(self.kinds, columns)]
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def decode_rows(self, rows: List[List[str]]) -> List[Dict[str, Any]]:
+        """Пакетное декодирование листа: по колонкам, а не по строкам"""
+        if not rows:
+            return []
+        names = self.table.columns
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return [dict(zip(names, values)) for values in zip(*self.decode_columns(rows))]
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+
+CANDIDATE_CODEC = RowCodec(CANDIDATES, {"created_at": DATETIME})
+
+VACANCY_CODEC = RowCodec(VACANCIES, {
+    "hard_skills": LIST,
+    "soft_skills": LIST,
+    "tasks": LIST,
+    "tools": LIST,
+    "created_at": DATETIME
+})
+
+INTERVIEW_CODEC = RowCodec(INTERVIEWS, {
+    "start_time": DATETIME,
+    "end_time": OPTIONAL_DATETIME,
+    "recording_url": OPTIONAL_STR,
+    "transcript": OPTIONAL_STR,
+    "questions": LIST,
+    "answers": LIST,
+    "emotions_analysis": JSON_LIST
+})
+
+REPORT_CODEC = RowCodec(REPORTS, {
+    "candidate_id": OPTIONAL_STR,
+    "vacancy_id": OPTIONAL_STR,
+    "hard_skills_assessment": JSON_DICT,
+    "soft_skills_assessment": JSON_DICT,
+    "emotions_analysis": JSON_DICT,
+    "verdict": JSON_DICT,
+    "created_at": DATETIME
+})
+
+NOTIFICATION_CODEC = RowCodec(NOTIFICATIONS, {
+    "link": OPTIONAL_STR,
+    "created_at": DATETIME
+})
+
+HR_MANAGER_CODEC = RowCodec(HR_MANAGERS)
\ No newline at end of file
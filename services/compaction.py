@@ -0,0 +1,52 @@
+import asyncio
+from typing import Dict, List, Optional
+from services.compaction_lease import CompactionLease, get_compaction_lease
+from services.repository import get_repository
+from services.sheets_scheduler import BULK, sheets_lane
+from services.tables import TABLES
+
+async def compact_tables() -> Optional[List[Dict]]:
+    """Уплотнение всех листов по очереди; возвращает отчеты по каждому.
+
+    None - уплотнение уже идет в другом процессе.
+    """
+    lease = get_compaction_lease()
+    if not await lease.acquire():
+        return None
+    try:
+        reports = []
+        with sheets_lane(BULK):
+            for table in TABLES:
+                # Номер уплотнения листа увеличивает сам сервис при удалении строк
+                reports.append(await get_repository(table).compact())
+        return reports
+    finally:
+        await lease.release()
+
+async def invalidate_shifted_tables() -> List[str]:
+    """Сброс индексов листов, уплотненных другими процессами"""
+    shifted = set(await get_compaction_lease().shifted_sheets())
+    for table in TABLES:
+        if table.sheet in shifted:
+            get_repository(table).rows_shifted()
+    return sorted(shifted)
+
+async def run_compaction_schedule(interval: float) -> None:
+    """Фоновое уплотнение раз в interval секунд; в каждом интервале его выполняет один воркер"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            for report in await compact_tables() or []:
+                if report["reclaimed_rows"]:
+                    print(f"Compacted {report['table']}: {report}")
+        except Exception as e:
+            print(f"Error compacting sheets: {str(e)}")
+
+async def run_compaction_watch(interval: float) -> None:
+    """Опрос номеров уплотнений раз в interval секунд"""
+    while True:
+        try:
+            await invalidate_shifted_tables()
+        except Exception as e:
+            print(f"Error checking sheet compactions: {str(e)}")
+        await asyncio.sleep(interval)
\ No newline at end of file
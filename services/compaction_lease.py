@@ -0,0 +1,211 @@
+import os
+import time
+import uuid
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+# Имя аренды: уплотнение всех листов выполняет один процесс за раз
+LEASE_NAME = "sheets"
+# Запись по номеру строки упавшего процесса перестает задерживать уплотнение через столько секунд
+ROW_WRITE_TTL = 60
+# Как часто ждущая сторона проверяет, освободился ли лист
+WAIT_INTERVAL = 0.05
+
+class CompactionLease:
+    """Право на уплотнение листов и номера выполненных уплотнений, общие для воркеров на хосте.
+
+    Хранятся в файле SQLite, как счетчики ID: уплотняет только процесс,
+    получивший аренду, и после каждого листа увеличивает его номер
+    уплотнения. Остальные процессы опрашивают номера и сбрасывают индексы
+    сдвинутых листов. Аренда упавшего процесса истекает через ttl секунд.
+
+    Записи по номерам строк и удаление строк листа исключают друг друга:
+    запись регистрируется в том же файле, а уплотнение помечает лист,
+    дожидается начатых записей и только потом удаляет строки. Новые записи
+    ждут, пока пометка не снята.
+    """
+
+    def __init__(self, path: str, ttl: float):
+        self.path = path
+        self.ttl = ttl
+        self.owner = f"{os.getpid()}:{uuid.uuid4().hex}"
+        # Ожидание блокировки файла (до timeout) не должно останавливать event loop
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="compaction")
+        self._connection: Optional[sqlite3.Connection] = None
+        # Лист -> номер уплотнения, после которого индексы процесса актуальны
+        self._seen: Optional[Dict[str, int]] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS "compaction_leases" '
+                '("name" TEXT PRIMARY KEY, "owner" TEXT NOT NULL, "expires_at" REAL NOT NULL)'
+            )
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS "compaction_epochs" ("sheet" TEXT PRIMARY KEY, "epoch" INTEGER NOT NULL)'
+            )
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS "compaction_marks" '
+                '("sheet" TEXT PRIMARY KEY, "owner" TEXT NOT NULL, "expires_at" REAL NOT NULL)'
+            )
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS "row_writes" '
+                '("token" TEXT PRIMARY KEY, "sheet" TEXT NOT NULL, "expires_at" REAL NOT NULL)'
+            )
+        return self._connection
+
+    async def _run(self, function: Callable, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    def _acquire(self) -> bool:
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                'SELECT "owner", "expires_at" FROM "compaction_leases" WHERE "name" = ?', (LEASE_NAME,)
+            ).fetchone()
+            if row is not None and row[0] != self.owner and row[1] > time.time():
+                connection.execute("ROLLBACK")
+                return False
+            connection.execute(
+                'INSERT OR REPLACE INTO "compaction_leases" VALUES (?, ?, ?)',
+                (LEASE_NAME, self.owner, time.time() + self.ttl)
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return True
+
+    def _release(self) -> None:
+        self._connect().execute(
+            'DELETE FROM "compaction_leases" WHERE "name" = ? AND "owner" = ?', (LEASE_NAME, self.owner)
+        )
+
+    def _bump(self, sheet: str) -> int:
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute('INSERT OR IGNORE INTO "compaction_epochs" VALUES (?, 0)', (sheet,))
+            connection.execute('UPDATE "compaction_epochs" SET "epoch" = "epoch" + 1 WHERE "sheet" = ?', (sheet,))
+            epoch = connection.execute('SELECT "epoch" FROM "compaction_epochs" WHERE "sheet" = ?', (sheet,)).fetchone()[0]
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return epoch
+
+    def _epochs(self) -> Dict[str, int]:
+        return dict(self._connect().execute('SELECT "sheet", "epoch" FROM "compaction_epochs"').fetchall())
+
+    def _begin_row_write(self, sheet: str, token: str) -> Optional[int]:
+        """Регистрирует запись и возвращает номер уплотнения листа; None - лист уплотняется"""
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            mark = connection.execute(
+                'SELECT 1 FROM "compaction_marks" WHERE "sheet" = ? AND "expires_at" > ?', (sheet, time.time())
+            ).fetchone()
+            if mark is not None:
+                connection.execute("ROLLBACK")
+                return None
+            connection.execute(
+                'INSERT INTO "row_writes" VALUES (?, ?, ?)', (token, sheet, time.time() + ROW_WRITE_TTL)
+            )
+            row = connection.execute('SELECT "epoch" FROM "compaction_epochs" WHERE "sheet" = ?', (sheet,)).fetchone()
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return row[0] if row else 0
+
+    def _end_row_write(self, token: str) -> None:
+        self._connect().execute('DELETE FROM "row_writes" WHERE "token" = ?', (token,))
+
+    def _mark(self, sheet: str) -> None:
+        self._connect().execute(
+            'INSERT OR REPLACE INTO "compaction_marks" VALUES (?, ?, ?)', (sheet, self.owner, time.time() + self.ttl)
+        )
+
+    def _unmark(self, sheet: str) -> None:
+        self._connect().execute(
+            'DELETE FROM "compaction_marks" WHERE "sheet" = ? AND "owner" = ?', (sheet, self.owner)
+        )
+
+    def _row_writes_in_progress(self, sheet: str) -> int:
+        return self._connect().execute(
+            'SELECT COUNT(*) FROM "row_writes" WHERE "sheet" = ? AND "expires_at" > ?', (sheet, time.time())
+        ).fetchone()[0]
+
+    async def acquire(self) -> bool:
+        """True, если аренда получена; False - листы уплотняет другой процесс"""
+        return await self._run(self._acquire)
+
+    async def release(self) -> None:
+        await self._run(self._release)
+
+    async def mark_compacted(self, sheet: str) -> None:
+        """Строки листа сдвинуты; индексы этого процесса уже перестроены"""
+        epoch = await self._run(self._bump, sheet)
+        if self._seen is not None:
+            self._seen[sheet] = epoch
+
+    async def shifted_sheets(self) -> List[str]:
+        """Листы, уплотненные другими процессами с прошлой проверки.
+
+        Первая проверка только запоминает текущие номера: индексов,
+        построенных до запуска процесса, не бывает.
+        """
+        epochs = await self._run(self._epochs)
+        if self._seen is None:
+            self._seen = epochs
+            return []
+        shifted = [sheet for sheet, epoch in epochs.items() if self._seen.get(sheet) != epoch]
+        self._seen.update(epochs)
+        return shifted
+
+    @asynccontextmanager
+    async def row_write(self, sheet: str) -> AsyncIterator[int]:
+        """Запись по номерам строк листа; пока блок выполняется, лист не уплотняется.
+
+        Возвращает номер уплотнения листа: номера строк, найденные при
+        другом номере, устарели.
+        """
+        token = uuid.uuid4().hex
+        while True:
+            epoch = await self._run(self._begin_row_write, sheet, token)
+            if epoch is not None:
+                break
+            await asyncio.sleep(WAIT_INTERVAL)
+        try:
+            yield epoch
+        finally:
+            await self._run(self._end_row_write, token)
+
+    @asynccontextmanager
+    async def compacting(self, sheet: str) -> AsyncIterator[None]:
+        """Удаление строк листа: блок начинается, когда начатые записи по номерам строк завершены"""
+        await self._run(self._mark, sheet)
+        try:
+            while await self._run(self._row_writes_in_progress, sheet):
+                await asyncio.sleep(WAIT_INTERVAL)
+            yield
+        finally:
+            await self._run(self._unmark, sheet)
+
+
+_compaction_lease: Optional[CompactionLease] = None
+
+def get_compaction_lease() -> CompactionLease:
+    global _compaction_lease
+    if _compaction_lease is None:
+        _compaction_lease = CompactionLease(
+            os.getenv("SHEETS_COMPACTION_LOCK_PATH", "ai_hr_compaction.db"),
+            ttl=float(os.getenv("SHEETS_COMPACTION_LEASE_TTL", "600"))
+        )
+    return _compaction_lease
\ No newline at end of file
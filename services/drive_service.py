@@ -1,20 +1,18 @@
 import os
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseUpload
 from io import BytesIO
 from typing import Optional
+from services.google_clients import get_drive_client
 
 class GoogleDriveService:
     def __init__(self):
-        credentials_path = os.getenv("GOOGLE_SHEETS_CREDENTIALS")
-        self.credentials = service_account.Credentials.from_service_account_file(
-            credentials_path,
-            scopes=['https://www.googleapis.com/auth/drive.file']
-        )
-        self.service = build('drive', 'v3', credentials=self.credentials)
         self.folder_id = os.getenv("GOOGLE_DRIVE_FOLDER_ID")
         
+    @property
+    def service(self):
+        """Клиент Drive API создается один раз на процесс при первом обращении"""
+        return get_drive_client()
+        
     async def upload_audio(self, audio_data: bytes, interview_id: str) -> Optional[str]:
         """Загрузка аудиозаписи интервью в Google Drive"""
         try:
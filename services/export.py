@@ -0,0 +1,114 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, List
+from services.codecs import RowCodec, DATETIME, OPTIONAL_DATETIME, LIST, JSON_LIST, JSON_DICT
+from services.pagination import iter_chunks
+from services.secondary_index import Condition
+
+# Parquet - необязательная зависимость (pip install pyarrow)
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+CSV = "csv"
+PARQUET = "parquet"
+EXPORT_FORMATS = (CSV, PARQUET)
+
+MEDIA_TYPES = {
+    CSV: "text/csv; charset=utf-8",
+    PARQUET: "application/vnd.apache.parquet"
+}
+
+# Строк на чтение листа и на группу строк Parquet
+EXPORT_CHUNK_SIZE = 1000
+
+def parquet_available() -> bool:
+    return pyarrow is not None
+
+async def export_csv(repository, codec: RowCodec, **filters: Condition) -> AsyncIterator[bytes]:
+    """CSV с заголовком из имен колонок; ячейки приводятся к текущей версии формата"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # BOM, чтобы Excel открыл кириллицу в UTF-8 без мастера импорта
+    buffer.write("\ufeff")
+    writer.writerow(codec.table.columns)
+    async for rows in iter_chunks(repository, EXPORT_CHUNK_SIZE, **filters):
+        # Декодирование и обратное кодирование переводят ячейки версии 1 в JSON/ISO
+        writer.writerows(codec.encode(record) for record in codec.decode_rows(rows))
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink(io.RawIOBase):
+    """Файл для ParquetWriter, отдающий записанные байты по частям"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _arrow_type(kind: str):
+    if kind in (DATETIME, OPTIONAL_DATETIME):
+        return pyarrow.timestamp("us")
+    if kind == LIST:
+        return pyarrow.list_(pyarrow.string())
+    # Вложенные объекты хранятся JSON-строками: их структура не фиксирована
+    return pyarrow.string()
+
+def _arrow_column(kind: str, values: List[Any]) -> List[Any]:
+    if kind in (JSON_LIST, JSON_DICT):
+        return [json.dumps(value, ensure_ascii=False) for value in values]
+    if kind in (DATETIME, OPTIONAL_DATETIME):
+        return [value if isinstance(value, datetime) or value is None else None for value in values]
+    return values
+
+async def export_parquet(repository, codec: RowCodec, **filters: Condition) -> AsyncIterator[bytes]:
+    """Parquet по группе строк на каждую порцию листа; в памяти - одна порция"""
+    if pyarrow is None:
+        raise RuntimeError("Parquet export requires pyarrow")
+    schema = pyarrow.schema([
+        (column, _arrow_type(kind)) for column, kind in zip(codec.table.columns, codec.kinds)
+    ])
+    sink = _ChunkSink()
+    writer = pyarrow.parquet.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        async for rows in iter_chunks(repository, EXPORT_CHUNK_SIZE, **filters):
+            columns = codec.decode_columns(rows)
+            writer.write_table(pyarrow.Table.from_arrays(
+                [
+                    pyarrow.array(_arrow_column(kind, values), type=field.type)
+                    for kind, values, field in zip(codec.kinds, columns, schema)
+                ],
+                schema=schema
+            ))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        # Метаданные файла пишутся при закрытии
+        writer.close()
+    yield sink.drain()
\ No newline at end of file
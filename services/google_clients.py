@@ -0,0 +1,105 @@
+import os
+import json
+import time
+import threading
+import httplib2
+from typing import Dict, List, Optional
+from google.oauth2 import service_account
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build
+
+SHEETS_SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+DRIVE_SCOPES = ['https://www.googleapis.com/auth/drive.file']
+
+_lock = threading.Lock()
+_service_account_info: Optional[Dict] = None
+_credentials: Dict[str, service_account.Credentials] = {}
+_clients: Dict[str, object] = {}
+_build_times: Dict[str, float] = {}
+
+def _load_service_account_info() -> Dict:
+    global _service_account_info
+    if _service_account_info is None:
+        credentials_path = os.getenv("GOOGLE_SHEETS_CREDENTIALS")
+        with open(credentials_path) as f:
+            _service_account_info = json.load(f)
+    return _service_account_info
+
+def get_credentials(scopes: List[str]) -> service_account.Credentials:
+    """Учетные данные сервисного аккаунта; файл читается один раз на процесс"""
+    key = " ".join(sorted(scopes))
+    with _lock:
+        if key not in _credentials:
+            _credentials[key] = service_account.Credentials.from_service_account_info(
+                _load_service_account_info(),
+                scopes=scopes
+            )
+        return _credentials[key]
+
+def create_http(credentials: service_account.Credentials) -> AuthorizedHttp:
+    """HTTP-транспорт с keep-alive: httplib2 переиспользует соединение с хостом между запросами.
+
+    httplib2 не потокобезопасен, поэтому каждому рабочему потоку нужен свой
+    экземпляр; набор таких экземпляров и образует пул соединений.
+    """
+    timeout = float(os.getenv("GOOGLE_HTTP_TIMEOUT", "30"))
+    return AuthorizedHttp(credentials, http=httplib2.Http(timeout=timeout))
+
+def _get_client(name: str, version: str, scopes: List[str]):
+    key = f"{name}:{version}"
+    with _lock:
+        client = _clients.get(key)
+    if client is not None:
+        return client
+
+    credentials = get_credentials(scopes)
+    started = time.monotonic()
+    # Документ discovery берется из пакета (static_discovery), без сетевого запроса
+    client = build(
+        name,
+        version,
+        credentials=credentials,
+        static_discovery=True,
+        cache_discovery=False
+    )
+    with _lock:
+        client = _clients.setdefault(key, client)
+        _build_times.setdefault(key, time.monotonic() - started)
+    return client
+
+def sheets_emulator_enabled() -> bool:
+    """SHEETS_API=emulator - вместо Google Sheets API используется эмулятор в памяти"""
+    return os.getenv("SHEETS_API", "google").lower() == "emulator"
+
+def _get_emulator():
+    from services.sheets_emulator import SheetsEmulator
+    with _lock:
+        if "sheets:emulator" not in _clients:
+            _clients["sheets:emulator"] = SheetsEmulator(
+                latency=float(os.getenv("SHEETS_EMULATOR_LATENCY_MS", "0")) / 1000,
+                jitter=float(os.getenv("SHEETS_EMULATOR_JITTER_MS", "0")) / 1000,
+                quota_per_minute=int(os.getenv("SHEETS_EMULATOR_QUOTA_PER_MINUTE", "0")),
+                error_rate=float(os.getenv("SHEETS_EMULATOR_ERROR_RATE", "0"))
+            )
+        return _clients["sheets:emulator"]
+
+def get_sheets_client():
+    """Общий для процесса клиент Google Sheets API"""
+    if sheets_emulator_enabled():
+        return _get_emulator()
+    return _get_client('sheets', 'v4', SHEETS_SCOPES)
+
+def get_drive_client():
+    """Общий для процесса клиент Google Drive API"""
+    return _get_client('drive', 'v3', DRIVE_SCOPES)
+
+def get_client_stats() -> Dict:
+    with _lock:
+        stats = {
+            "clients": sorted(_clients),
+            "build_ms": {key: 1000 * seconds for key, seconds in _build_times.items()}
+        }
+        emulator = _clients.get("sheets:emulator")
+    if emulator is not None:
+        stats["sheets_emulator"] = emulator.stats()
+    return stats
\ No newline at end of file
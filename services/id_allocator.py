@@ -0,0 +1,171 @@
+import os
+import time
+import asyncio
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from services.tables import TableSchema
+
+# Функция, возвращающая наибольший числовой ID, уже записанный в лист
+SeedFunction = Callable[[], Awaitable[int]]
+
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+
+class IdAllocator(ABC):
+    """Выдача ID новых записей без чтения листа перед записью"""
+
+    @abstractmethod
+    async def allocate(self, table: TableSchema, count: int = 1, seed: Optional[SeedFunction] = None) -> List[str]:
+        """count новых ID таблицы; seed нужен счетчику, впервые продолжающему ID листа"""
+
+    def stats(self) -> Dict:
+        return {"allocator": type(self).__name__}
+
+
+class UlidAllocator(IdAllocator):
+    """ULID: 48 бит времени в миллисекундах и 80 случайных бит, 26 символов base32.
+
+    ID сортируются по времени создания и не требуют общего состояния между
+    процессами. Внутри процесса ID монотонны и в пределах одной миллисекунды.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_time = 0
+        self._last_random = 0
+        self.allocated = 0
+
+    async def allocate(self, table: TableSchema, count: int = 1, seed: Optional[SeedFunction] = None) -> List[str]:
+        with self._lock:
+            self.allocated += count
+            return [self._next() for _ in range(count)]
+
+    def _next(self) -> str:
+        timestamp = time.time_ns() // 1_000_000
+        if timestamp <= self._last_time:
+            # Та же миллисекунда (или часы ушли назад): увеличиваем случайную часть
+            timestamp = self._last_time
+            randomness = (self._last_random + 1) & ((1 << 80) - 1)
+        else:
+            randomness = int.from_bytes(os.urandom(10), "big")
+        self._last_time, self._last_random = timestamp, randomness
+
+        value = (timestamp << 80) | randomness
+        chars = []
+        for _ in range(26):
+            chars.append(_CROCKFORD[value & 31])
+            value >>= 5
+        return "".join(reversed(chars))
+
+    def stats(self) -> Dict:
+        return {"allocator": "ulid", "allocated": self.allocated}
+
+
+class CounterBlockAllocator(IdAllocator):
+    """Последовательные числовые ID, выдаваемые блоками из общего счетчика.
+
+    Счетчики хранятся в файле SQLite, общем для всех воркеров на хосте:
+    процесс арендует блок из block_size номеров одной транзакцией и дальше
+    выдает их из памяти. Неиспользованный остаток блока при остановке
+    пропадает - ID уникальны, но могут идти с пропусками.
+
+    Аренда может ждать блокировку файла до 30 секунд, поэтому обращения
+    к SQLite идут через executor из одного потока, а не в event loop.
+    """
+
+    def __init__(self, path: str, block_size: int):
+        self.path = path
+        self.block_size = block_size
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="id-counter")
+        # Создается при первом использовании: при импорте модуля event loop еще не запущен
+        self._allocation_lock: Optional[asyncio.Lock] = None
+        self._connection: Optional[sqlite3.Connection] = None
+        # таблица -> (следующий ID, граница блока)
+        self._blocks: Dict[str, Tuple[int, int]] = {}
+        self.allocated = 0
+        self.leases = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS "id_counters" ("name" TEXT PRIMARY KEY, "next" INTEGER NOT NULL)'
+            )
+        return self._connection
+
+    def _allocations(self) -> asyncio.Lock:
+        """Выдача из блока и аренда нового не должны пересекаться"""
+        if self._allocation_lock is None:
+            self._allocation_lock = asyncio.Lock()
+        return self._allocation_lock
+
+    async def _run(self, function: Callable, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    def _counter_exists(self, name: str) -> bool:
+        row = self._connect().execute('SELECT 1 FROM "id_counters" WHERE "name" = ?', (name,)).fetchone()
+        return row is not None
+
+    def _lease(self, name: str, size: int, start: int) -> Tuple[int, int]:
+        """Атомарно сдвигает общий счетчик на size и возвращает арендованный диапазон"""
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute('INSERT OR IGNORE INTO "id_counters" VALUES (?, ?)', (name, start))
+            first = connection.execute('SELECT "next" FROM "id_counters" WHERE "name" = ?', (name,)).fetchone()[0]
+            connection.execute('UPDATE "id_counters" SET "next" = ? WHERE "name" = ?', (first + size, name))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        self.leases += 1
+        return first, first + size
+
+    async def allocate(self, table: TableSchema, count: int = 1, seed: Optional[SeedFunction] = None) -> List[str]:
+        start = 1
+        if table.name not in self._blocks and seed is not None and not await self._run(self._counter_exists, table.name):
+            # Первый запуск счетчика: продолжаем нумерацию уже записанных строк
+            start = await seed() + 1
+
+        ids = []
+        async with self._allocations():
+            while len(ids) < count:
+                next_id, end = self._blocks.get(table.name, (0, 0))
+                if next_id >= end:
+                    next_id, end = await self._run(self._lease, table.name, max(self.block_size, count - len(ids)), start)
+                taken = min(end - next_id, count - len(ids))
+                ids.extend(str(value) for value in range(next_id, next_id + taken))
+                self._blocks[table.name] = (next_id + taken, end)
+            self.allocated += count
+        return ids
+
+    def stats(self) -> Dict:
+        return {
+            "allocator": "counter",
+            "allocated": self.allocated,
+            "leases": self.leases,
+            "block_size": self.block_size
+        }
+
+
+_allocator: Optional[IdAllocator] = None
+
+def get_id_allocator() -> IdAllocator:
+    """Общий для процесса распределитель ID согласно ID_ALLOCATOR"""
+    global _allocator
+    if _allocator is None:
+        kind = os.getenv("ID_ALLOCATOR", "ulid").lower()
+        if kind == "ulid":
+            _allocator = UlidAllocator()
+        elif kind == "counter":
+            _allocator = CounterBlockAllocator(
+                os.getenv("ID_COUNTER_PATH", "ai_hr_ids.db"),
+                int(os.getenv("ID_BLOCK_SIZE", "100"))
+            )
+        else:
+            raise ValueError(f"Unknown ID allocator: {kind}")
+    return _allocator
\ No newline at end of file
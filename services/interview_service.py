@@ -1,51 +1,53 @@
 import os
 import openai
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
 import uuid
 import json
 from datetime import datetime
 from models.base import Interview, InterviewCreate, Report, ReportCreate
-from services.sheets_service import GoogleSheetsService
+from services.repository import get_repository
+from services.tables import INTERVIEWS
+from services.codecs import INTERVIEW_CODEC
+from services.pagination import iter_records
+from services.export import CSV, export_csv, export_parquet
+from services.secondary_index import Condition
+from services.sheets_scheduler import INTERACTIVE, sheets_lane
+from services.session_store import InterviewSession, get_session_store
+from services.vacancy_service import VacancyService
 from services.whisper_service import WhisperService
 from services.drive_service import GoogleDriveService
 from services.livekit_service import LiveKitService
 
+DEFAULT_QUESTION = "Расскажите о вашем опыте работы"
+
+QUESTION_PROMPT = (
+    "Вы — Эмили, HR-специалист, проводящий голосовое собеседование. "
+    "Задайте кандидату один следующий вопрос с учетом его предыдущих ответов. "
+    "Вопрос короткий, одно-два предложения, без вступлений и оценок."
+)
+
+# Сколько последних пар «вопрос - ответ» передается модели
+QUESTION_HISTORY = 10
+
 class InterviewService:
     def __init__(self):
         self.openai = openai
         self.openai.api_key = os.getenv("OPENAI_API_KEY")
-        self.sessions: Dict[str, Dict] = {}
-        self.sheets_service = GoogleSheetsService()
+        # Асинхронный клиент для потоковой генерации вопросов
+        self.llm = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.question_model = os.getenv("OPENAI_QUESTION_MODEL", "gpt-4")
+        # Состояние идущих интервью, общее для всех экземпляров сервиса
+        self.sessions = get_session_store()
+        self.repository = get_repository(INTERVIEWS)
         self.whisper_service = WhisperService()
         self.drive_service = GoogleDriveService()
         self.livekit_service = LiveKitService()
+        self.vacancy_service = VacancyService()
         
     async def create_interview(self, interview: InterviewCreate) -> Interview:
-        # Получаем текущие интервью
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Интервью!A:J'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values:
-            # Создаем заголовки, если таблица пуста
-            headers = [
-                "ID", "ID кандидата", "ID вакансии", "Статус", 
-                "Время начала", "Время окончания", "URL записи", 
-                "Транскрипт", "Вопросы", "Ответы", "Анализ эмоций"
-            ]
-            self.sheets_service.service.spreadsheets().values().update(
-                spreadsheetId=self.sheets_service.spreadsheet_id,
-                range='Интервью!A1:K1',
-                valueInputOption='RAW',
-                body={'values': [headers]}
-            ).execute()
-            values = [headers]
-        
         # Создаем новое интервью
         new_interview = Interview(
-            id=str(len(values)),
+            id=await self.repository.next_id(),
             candidate_id=interview.candidate_id,
             vacancy_id=interview.vacancy_id,
             status=interview.status,
@@ -58,161 +60,65 @@ class InterviewService:
             emotions_analysis=interview.emotions_analysis
         )
         
-        # Подготавливаем данные для записи
-        row_data = [
-            new_interview.id,
-            new_interview.candidate_id,
-            new_interview.vacancy_id,
-            new_interview.status,
-            str(new_interview.start_time),
-            str(new_interview.end_time) if new_interview.end_time else "",
-            new_interview.recording_url or "",
-            new_interview.transcript or "",
-            ",".join(new_interview.questions),
-            ",".join(new_interview.answers),
-            str(new_interview.emotions_analysis)
-        ]
-        
         # Добавляем интервью в таблицу
-        self.sheets_service.service.spreadsheets().values().append(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Интервью!A:K',
-            valueInputOption='RAW',
-            body={'values': [row_data]}
-        ).execute()
+        await self.repository.insert(INTERVIEW_CODEC.encode(new_interview.dict()))
         
         return new_interview
         
     async def get_interview(self, interview_id: str) -> Optional[Interview]:
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Интервью!A:K'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values or len(values) < 2:  # Проверяем наличие заголовков и данных
+        # У идущего интервью актуальное состояние в памяти, а не в таблице
+        session = self.sessions.peek(interview_id)
+        if session is not None:
+            return session.interview.copy(deep=True)
+        return await self._load_interview(interview_id)
+
+    async def _load_interview(self, interview_id: str) -> Optional[Interview]:
+        row = await self.repository.get(interview_id)
+        if not row:
             return None
-            
-        for row in values[1:]:  # Пропускаем заголовки
-            if row[0] == interview_id:
-                return Interview(
-                    id=row[0],
-                    candidate_id=row[1],
-                    vacancy_id=row[2],
-                    status=row[3],
-                    start_time=datetime.fromisoformat(row[4]),
-                    end_time=datetime.fromisoformat(row[5]) if row[5] else None,
-                    recording_url=row[6] if row[6] else None,
-                    transcript=row[7] if row[7] else None,
-                    questions=row[8].split(",") if row[8] else [],
-                    answers=row[9].split(",") if row[9] else [],
-                    emotions_analysis=eval(row[10]) if row[10] else []
-                )
-        return None
+        return Interview(**INTERVIEW_CODEC.decode(row))
         
-    async def get_interviews(self) -> List[Interview]:
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Интервью!A:K'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values or len(values) < 2:  # Проверяем наличие заголовков и данных
-            return []
-            
-        interviews = []
-        for row in values[1:]:  # Пропускаем заголовки
-            interview = Interview(
-                id=row[0],
-                candidate_id=row[1],
-                vacancy_id=row[2],
-                status=row[3],
-                start_time=datetime.fromisoformat(row[4]),
-                end_time=datetime.fromisoformat(row[5]) if row[5] else None,
-                recording_url=row[6] if row[6] else None,
-                transcript=row[7] if row[7] else None,
-                questions=row[8].split(",") if row[8] else [],
-                answers=row[9].split(",") if row[9] else [],
-                emotions_analysis=eval(row[10]) if row[10] else []
-            )
-            interviews.append(interview)
-        return interviews
+    async def get_interviews(self, **filters: Condition) -> List[Interview]:
+        return [Interview(**data) for data in INTERVIEW_CODEC.decode_rows(await self.repository.find(**filters))]
+
+    async def get_interviews_page(self, limit: int, cursor: Optional[str] = None, **filters: Condition) -> Tuple[List[Interview], Optional[str]]:
+        rows, next_cursor = await self.repository.page(limit, cursor, **filters)
+        return [Interview(**data) for data in INTERVIEW_CODEC.decode_rows(rows)], next_cursor
+
+    def stream_interviews(self, **filters: Condition) -> AsyncIterator[Dict]:
+        return iter_records(self.repository, INTERVIEW_CODEC, **filters)
+
+    def export_interviews(self, format: str, **filters: Condition) -> AsyncIterator[bytes]:
+        """Выгрузка листа порциями без создания моделей"""
+        export = export_csv if format == CSV else export_parquet
+        return export(self.repository, INTERVIEW_CODEC, **filters)
         
     async def update_interview(self, interview_id: str, interview: InterviewCreate) -> Optional[Interview]:
-        # Получаем текущие интервью
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Интервью!A:K'
-        ).execute()
+        updated_interview = Interview(
+            id=interview_id,
+            candidate_id=interview.candidate_id,
+            vacancy_id=interview.vacancy_id,
+            status=interview.status,
+            start_time=interview.start_time,
+            end_time=interview.end_time,
+            recording_url=interview.recording_url,
+            transcript=interview.transcript,
+            questions=interview.questions,
+            answers=interview.answers,
+            emotions_analysis=interview.emotions_analysis
+        )
         
-        values = result.get('values', [])
-        if not values or len(values) < 2:
+        # Запись в обход сессии: состояние в памяти больше не актуально
+        await self.sessions.discard(interview_id)
+        
+        # Обновляем интервью в таблице
+        if not await self.repository.update(interview_id, INTERVIEW_CODEC.encode(updated_interview.dict())):
             return None
-            
-        # Ищем интервью для обновления
-        for i, row in enumerate(values[1:], start=2):  # start=2 потому что первая строка - заголовки
-            if row[0] == interview_id:
-                updated_interview = Interview(
-                    id=interview_id,
-                    candidate_id=interview.candidate_id,
-                    vacancy_id=interview.vacancy_id,
-                    status=interview.status,
-                    start_time=interview.start_time,
-                    end_time=interview.end_time,
-                    recording_url=interview.recording_url,
-                    transcript=interview.transcript,
-                    questions=interview.questions,
-                    answers=interview.answers,
-                    emotions_analysis=interview.emotions_analysis
-                )
-                
-                # Подготавливаем данные для обновления
-                row_data = [
-                    updated_interview.id,
-                    updated_interview.candidate_id,
-                    updated_interview.vacancy_id,
-                    updated_interview.status,
-                    str(updated_interview.start_time),
-                    str(updated_interview.end_time) if updated_interview.end_time else "",
-                    updated_interview.recording_url or "",
-                    updated_interview.transcript or "",
-                    ",".join(updated_interview.questions),
-                    ",".join(updated_interview.answers),
-                    str(updated_interview.emotions_analysis)
-                ]
-                
-                # Обновляем интервью в таблице
-                self.sheets_service.service.spreadsheets().values().update(
-                    spreadsheetId=self.sheets_service.spreadsheet_id,
-                    range=f'Интервью!A{i}:K{i}',
-                    valueInputOption='RAW',
-                    body={'values': [row_data]}
-                ).execute()
-                
-                return updated_interview
-        return None
+        return updated_interview
         
     async def delete_interview(self, interview_id: str) -> bool:
-        # Получаем текущие интервью
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Интервью!A:K'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values or len(values) < 2:
-            return False
-            
-        # Ищем интервью для удаления
-        for i, row in enumerate(values[1:], start=2):
-            if row[0] == interview_id:
-                # Удаляем строку с интервью
-                self.sheets_service.service.spreadsheets().values().clear(
-                    spreadsheetId=self.sheets_service.spreadsheet_id,
-                    range=f'Интервью!A{i}:K{i}'
-                ).execute()
-                return True
-        return False
+        await self.sessions.discard(interview_id)
+        return await self.repository.delete(interview_id)
         
     async def create_session(self, candidate_name: str, candidate_email: str, job_title: str, job_level: str) -> str:
         # Создаем новую сессию в LiveKit
@@ -228,33 +134,121 @@ class InterviewService:
             recording_url=f"https://drive.google.com/recordings/{room_name}"
         )
         
-        created_interview = await self.create_interview(interview)
+        # Кандидат ждет начала интервью: запросы к таблице идут вне очереди
+        with sheets_lane(INTERACTIVE):
+            created_interview = await self.create_interview(interview)
+        self.sessions.add(created_interview)
         return created_interview.id
         
-    async def process_response(self, session_id: str, response: str) -> str:
-        # Получаем интервью
-        interview = await self.get_interview(session_id)
-        if not interview:
+    async def get_session(self, session_id: str) -> InterviewSession:
+        """Сессия идущего интервью; таблица читается только при первом обращении"""
+        # Запросы к таблице в ходе интервью идут вне очереди
+        with sheets_lane(INTERACTIVE):
+            session = await self.sessions.get(session_id, self._load_interview)
+        if session is None:
             raise ValueError("Interview not found")
+        return session
+        
+    async def record_answer(self, session: InterviewSession, response: Union[str, bytes]) -> str:
+        """Запоминает ответ кандидата (текст или аудио) и запускает его анализ в фоне"""
+        if isinstance(response, str):
+            transcript = response
+        else:
+            # Транскрибируем ответ
+            transcript = await self.whisper_service.transcribe_audio(response)
+            if transcript is None:
+                raise ValueError("Could not transcribe response")
+                
+        # Обновляем интервью в памяти; строка сохраняется в фоне на контрольных точках
+        interview = session.interview
+        interview.answers.append(transcript)
+        # Анализ ответа i хранится в emotions_analysis[i]: место занимается сразу,
+        # анализы завершаются в любом порядке, а при ошибке остается пустой словарь
+        index = len(interview.answers) - 1
+        interview.emotions_analysis.extend({} for _ in range(index + 1 - len(interview.emotions_analysis)))
+        self.sessions.record_turn(session)
+        
+        # Анализ не нужен для следующего вопроса и не задерживает ход
+        self.sessions.run_in_background(session, self._analyze_answer(session, index, transcript))
+        return transcript
+        
+    async def _analyze_answer(self, session: InterviewSession, index: int, transcript: str) -> None:
+        interview = session.interview
+        vacancy = await self.vacancy_service.get_vacancy(interview.vacancy_id) if interview.vacancy_id else None
+        vacancy_data = vacancy.dict() if vacancy else {"title": "", "level": "", "hard_skills": [], "soft_skills": []}
+        analysis = await self.whisper_service.analyze_response(transcript, vacancy_data)
+        if analysis is not None:
+            interview.emotions_analysis[index] = analysis
+            self.sessions.record_turn(session)
             
-        # Транскрибируем ответ
-        transcript = await self.whisper_service.transcribe_audio(response)
+    async def process_response(self, session_id: str, response: Union[str, bytes]) -> str:
+        session = await self.get_session(session_id)
+        # Ходы одной сессии выполняются по очереди
+        async with session.lock:
+            await self.record_answer(session, response)
+            # Генерируем следующий вопрос
+            return await self._generate_next_question(session)
         
-        # Анализируем ответ
-        analysis = await self.whisper_service.analyze_response(transcript, interview)
+    async def end_session(self, session_id: str) -> None:
+        """Сохранение итогового состояния интервью и освобождение памяти"""
+        await self.sessions.close(session_id)
         
-        # Обновляем интервью
-        interview.answers.append(transcript)
-        interview.emotions_analysis.append(analysis)
+    def _question_messages(self, interview: Interview) -> List[Dict[str, str]]:
+        messages = [{"role": "system", "content": QUESTION_PROMPT}]
+        # Последние пары «вопрос - ответ»: длинная история замедляет первый токен
+        pairs = list(zip(interview.questions, interview.answers))[-QUESTION_HISTORY:]
+        for question, answer in pairs:
+            messages.append({"role": "assistant", "content": question})
+            messages.append({"role": "user", "content": answer})
+        if len(interview.answers) > len(interview.questions):
+            # Ответ на вопрос, которого нет в истории (например, самый первый)
+            messages.append({"role": "user", "content": interview.answers[-1]})
+        return messages
+        
+    async def _scripted_question(self, interview: Interview) -> Optional[str]:
+        """Очередной вопрос из плана вакансии: его аудио подготовлено заранее"""
+        if not interview.vacancy_id or not self.vacancy_service.question_planner.enabled:
+            return None
+        vacancy = await self.vacancy_service.get_vacancy(interview.vacancy_id)
+        plan = await self.vacancy_service.question_planner.get_plan(vacancy) if vacancy else None
+        if plan and len(interview.questions) < len(plan):
+            return plan[len(interview.questions)]
+        return None
         
-        await self.update_interview(session_id, interview)
+    async def stream_next_question(self, session: InterviewSession) -> AsyncIterator[str]:
+        """Следующий вопрос потоком токенов; целиком он запоминается в сессии"""
+        parts = []
+        # Сначала вопросы плана вакансии, затем уточняющие вопросы модели
+        scripted = await self._scripted_question(session.interview)
+        if scripted is not None:
+            parts.append(scripted)
+            yield scripted
+        else:
+            async for token in self._stream_llm_question(session):
+                parts.append(token)
+                yield token
+        if not parts:
+            parts.append(DEFAULT_QUESTION)
+            yield DEFAULT_QUESTION
+        session.interview.questions.append("".join(parts).strip())
+        self.sessions.record_turn(session)
         
-        # Генерируем следующий вопрос
-        return await self._generate_next_question(interview)
+    async def _stream_llm_question(self, session: InterviewSession) -> AsyncIterator[str]:
+        try:
+            stream = await self.llm.chat.completions.create(
+                model=self.question_model,
+                messages=self._question_messages(session.interview),
+                stream=True
+            )
+            async for chunk in stream:
+                token = chunk.choices[0].delta.content if chunk.choices else None
+                if token:
+                    yield token
+        except Exception as e:
+            print(f"Error generating question: {str(e)}")
         
-    async def _generate_next_question(self, interview: Interview) -> str:
-        # TODO: Реализовать генерацию следующего вопроса на основе предыдущих ответов
-        return "Расскажите о вашем опыте работы"
+    async def _generate_next_question(self, session: InterviewSession) -> str:
+        return "".join([token async for token in self.stream_next_question(session)]).strip()
         
     def is_interview_complete(self, session_id: str) -> bool:
         # TODO: Реализовать проверку завершения интервью
@@ -268,4 +262,14 @@ class InterviewService:
             soft_skills_assessment={},
             emotions_analysis={},
             verdict={}
-        ) 
\ No newline at end of file
+        )
+
+
+_interview_service: Optional[InterviewService] = None
+
+def get_interview_service() -> InterviewService:
+    """Общий для процесса экземпляр: клиенты OpenAI, Drive и LiveKit создаются один раз"""
+    global _interview_service
+    if _interview_service is None:
+        _interview_service = InterviewService()
+    return _interview_service
\ No newline at end of file
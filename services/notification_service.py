@@ -1,147 +1,100 @@
 import os
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
-from models.base import Notification, NotificationCreate
-from services.sheets_service import GoogleSheetsService
+from models.notification import Notification, NotificationCreate
+from services.repository import get_repository
+from services.tables import NOTIFICATIONS, HR_MANAGERS
+from services.codecs import NOTIFICATION_CODEC
+from services.pagination import iter_records
 from services.email_service import EmailService
 
+# Статус непрочитанного уведомления
+UNREAD_STATUS = "new"
+
 class NotificationService:
     def __init__(self):
-        self.sheets_service = GoogleSheetsService()
+        self.repository = get_repository(NOTIFICATIONS)
+        self.hr_repository = get_repository(HR_MANAGERS)
         self.email_service = EmailService()
+        # email -> ID HR-менеджера; ID менеджера не меняется
+        self._manager_ids: Dict[str, str] = {}
         
     async def create_notification(self, notification: NotificationCreate) -> Notification:
-        # Получаем текущие уведомления
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Уведомления!A:G'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values:
-            # Создаем заголовки, если таблица пуста
-            headers = [
-                "ID", "ID HR-менеджера", "Тип", "Текст", 
-                "Ссылка", "Дата создания", "Статус"
-            ]
-            self.sheets_service.service.spreadsheets().values().update(
-                spreadsheetId=self.sheets_service.spreadsheet_id,
-                range='Уведомления!A1:G1',
-                valueInputOption='RAW',
-                body={'values': [headers]}
-            ).execute()
-            values = [headers]
-        
         # Создаем новое уведомление
         new_notification = Notification(
-            id=str(len(values)),
+            id=await self.repository.next_id(),
             hr_manager_id=notification.hr_manager_id,
             type=notification.type,
             text=notification.text,
             link=notification.link,
             created_at=datetime.now(),
-            status="new"
+            status=UNREAD_STATUS
         )
         
-        # Подготавливаем данные для записи
-        row_data = [
-            new_notification.id,
-            new_notification.hr_manager_id,
-            new_notification.type,
-            new_notification.text,
-            new_notification.link or "",
-            str(new_notification.created_at),
-            new_notification.status
-        ]
-        
         # Добавляем уведомление в таблицу
-        self.sheets_service.service.spreadsheets().values().append(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Уведомления!A:G',
-            valueInputOption='RAW',
-            body={'values': [row_data]}
-        ).execute()
+        await self.repository.insert(NOTIFICATION_CODEC.encode(new_notification.dict()))
         
         # Отправляем уведомление по email
         await self._send_notification_email(new_notification)
         
         return new_notification
         
-    async def get_notifications(self, hr_manager_id: str) -> List[Notification]:
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Уведомления!A:G'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values or len(values) < 2:
-            return []
-            
-        notifications = []
-        for row in values[1:]:
-            if row[1] == hr_manager_id:  # Фильтруем по ID HR-менеджера
-                notification = Notification(
-                    id=row[0],
-                    hr_manager_id=row[1],
-                    type=row[2],
-                    text=row[3],
-                    link=row[4] if row[4] else None,
-                    created_at=datetime.fromisoformat(row[5]),
-                    status=row[6]
-                )
-                notifications.append(notification)
-        return notifications
+    async def get_manager_id(self, email: str) -> Optional[str]:
+        """ID HR-менеджера по email"""
+        manager_id = self._manager_ids.get(email)
+        if manager_id is None:
+            rows = await self.hr_repository.find(email=email)
+            if not rows:
+                return None
+            manager_id = self._manager_ids[email] = rows[0][0]
+        return manager_id
+
+    def _filters(self, hr_manager_id: str, unread_only: bool) -> Dict[str, str]:
+        # Индекс по менеджеру и по паре (менеджер, статус) - без просмотра всего листа
+        filters = {"hr_manager_id": hr_manager_id}
+        if unread_only:
+            filters["status"] = UNREAD_STATUS
+        return filters
+        
+    async def get_notifications(self, hr_manager_id: str, unread_only: bool = False) -> List[Notification]:
+        rows = await self.repository.find(**self._filters(hr_manager_id, unread_only))
+        return [Notification(**data) for data in NOTIFICATION_CODEC.decode_rows(rows)]
+
+    async def get_latest_notifications(self, hr_manager_id: str, limit: int, unread_only: bool = False) -> List[Notification]:
+        """Последние limit уведомлений, от новых к старым"""
+        rows = await self.repository.latest(limit, **self._filters(hr_manager_id, unread_only))
+        return [Notification(**data) for data in NOTIFICATION_CODEC.decode_rows(rows)]
+
+    async def get_notifications_page(self, hr_manager_id: str, limit: int, cursor: Optional[str] = None, unread_only: bool = False) -> Tuple[List[Notification], Optional[str]]:
+        rows, next_cursor = await self.repository.page(limit, cursor, **self._filters(hr_manager_id, unread_only))
+        return [Notification(**data) for data in NOTIFICATION_CODEC.decode_rows(rows)], next_cursor
+
+    def stream_notifications(self, hr_manager_id: str, unread_only: bool = False) -> AsyncIterator[Dict]:
+        return iter_records(self.repository, NOTIFICATION_CODEC, **self._filters(hr_manager_id, unread_only))
+
+    async def count_unread(self, hr_manager_id: str) -> int:
+        return await self.repository.count(**self._filters(hr_manager_id, unread_only=True))
         
     async def update_notification_status(self, notification_id: str, status: str) -> Optional[Notification]:
-        # Получаем текущие уведомления
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Уведомления!A:G'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values or len(values) < 2:
+        row = await self.repository.get(notification_id)
+        if not row:
             return None
             
-        # Ищем уведомление для обновления
-        for i, row in enumerate(values[1:], start=2):
-            if row[0] == notification_id:
-                # Обновляем статус
-                self.sheets_service.service.spreadsheets().values().update(
-                    spreadsheetId=self.sheets_service.spreadsheet_id,
-                    range=f'Уведомления!G{i}',
-                    valueInputOption='RAW',
-                    body={'values': [[status]]}
-                ).execute()
-                
-                return Notification(
-                    id=row[0],
-                    hr_manager_id=row[1],
-                    type=row[2],
-                    text=row[3],
-                    link=row[4] if row[4] else None,
-                    created_at=datetime.fromisoformat(row[5]),
-                    status=status
-                )
-        return None
+        # Обновляем статус
+        if not await self.repository.update_field(notification_id, "status", status):
+            return None
+            
+        notification = Notification(**NOTIFICATION_CODEC.decode(row))
+        notification.status = status
+        return notification
         
     async def _send_notification_email(self, notification: Notification) -> bool:
         # Получаем email HR-менеджера
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='HR-менеджеры!A:C'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values or len(values) < 2:
+        hr_manager = await self.hr_repository.get(notification.hr_manager_id)
+        if not hr_manager:
             return False
             
-        hr_email = None
-        for row in values[1:]:
-            if row[0] == notification.hr_manager_id:
-                hr_email = row[2]  # Предполагаем, что email находится в третьем столбце
-                break
-                
+        hr_email = hr_manager[2]
         if not hr_email:
             return False
             
@@ -164,4 +117,4 @@ class NotificationService:
             body=body
         )
         
-        return True 
\ No newline at end of file
+        return True
\ No newline at end of file
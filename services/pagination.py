@@ -0,0 +1,43 @@
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List
+from services.codecs import RowCodec
+from services.secondary_index import Condition
+from services.sheets_scheduler import BULK, sheets_lane
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Сколько строк читается и декодируется за раз при потоковой выдаче
+STREAM_CHUNK_SIZE = 200
+
+async def iter_chunks(repository, chunk_size: int = STREAM_CHUNK_SIZE, **filters: Condition) -> AsyncIterator[List[List[str]]]:
+    """Обходит лист страницами по chunk_size строк без декодирования.
+
+    Чтение идет по полосе bulk, чтобы выгрузка не отнимала квоту у интервью.
+    """
+    cursor = None
+    while True:
+        # Полоса задается только на время запроса: между yield генератор
+        # выполняется в контексте потребителя
+        with sheets_lane(BULK):
+            rows, cursor = await repository.page(chunk_size, cursor, **filters)
+        if rows:
+            yield rows
+        if cursor is None:
+            return
+
+async def iter_records(repository, codec: RowCodec, chunk_size: int = STREAM_CHUNK_SIZE, **filters: Condition) -> AsyncIterator[Dict[str, Any]]:
+    """Обходит лист страницами: в памяти одновременно не больше chunk_size строк"""
+    async for rows in iter_chunks(repository, chunk_size, **filters):
+        for record in codec.decode_rows(rows):
+            yield record
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+async def to_ndjson(records: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[str]:
+    """Одна JSON-строка на запись"""
+    async for record in records:
+        yield json.dumps(record, ensure_ascii=False, default=_json_default) + "\n"
\ No newline at end of file
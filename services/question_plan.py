@@ -0,0 +1,264 @@
+import os
+import re
+import json
+import time
+import asyncio
+import hashlib
+from collections import OrderedDict
+from itertools import chain, zip_longest
+from typing import Dict, List, Optional, Set
+from models.base import Vacancy
+from services.sentence_splitter import split_sentences
+from services.voice_service import ElevenLabsService
+
+PLAN_VERSION = 1
+
+# ID вакансии входит в имя файла манифеста и приходит в том числе из URL
+VACANCY_ID_PATTERN = re.compile(r"[A-Za-z0-9_-]+")
+# Сколько планов держать в памяти
+MAX_CACHED_PLANS = 1024
+
+# Шаблоны вопросов по полям вакансии
+HARD_SKILL_QUESTION = "Расскажите о вашем опыте работы с {}: какие задачи вы с этим решали?"
+TASK_QUESTION = "Как бы вы подошли к такой задаче: {}?"
+TOOL_QUESTION = "Как вы используете {} в повседневной работе?"
+SOFT_SKILL_QUESTION = "Приведите пример ситуации, когда вам пригодился навык «{}»."
+
+def build_question_plan(vacancy: Vacancy, size: int) -> List[str]:
+    """Вопросы по навыкам, задачам и инструментам вакансии, по очереди из каждой группы"""
+    groups = [
+        [HARD_SKILL_QUESTION.format(skill) for skill in vacancy.hard_skills],
+        [TASK_QUESTION.format(task.rstrip(".?! ")) for task in vacancy.tasks],
+        [TOOL_QUESTION.format(tool) for tool in vacancy.tools],
+        [SOFT_SKILL_QUESTION.format(skill) for skill in vacancy.soft_skills]
+    ]
+    questions = [question for question in chain.from_iterable(zip_longest(*groups)) if question]
+    return questions[:size]
+
+
+class QuestionPlanner:
+    """Заранее озвученный план вопросов вакансии.
+
+    При создании вакансии и изменении ее навыков план строится в фоне, каждое
+    предложение синтезируется через ElevenLabsService и закрепляется в кэше
+    речи, а манифест плана пишется в каталог directory. Интервью по вакансии
+    задает вопросы плана, и их аудио берется из кэша без обращения к TTS.
+    Нарезка на предложения совпадает с нарезкой в TurnPipeline, поэтому
+    ключи кэша у озвученных заранее и на интервью фраз одинаковые.
+    Прочитанные манифесты хранятся в памяти по отпечатку вакансии.
+    """
+
+    def __init__(self, voice_service: ElevenLabsService, directory: str, size: int, concurrency: int):
+        self.voice_service = voice_service
+        self.directory = directory
+        self.size = size
+        # Синтез плана не должен занимать все соединения, нужные идущим интервью
+        self._synthesis = asyncio.Semaphore(max(concurrency, 1))
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # Отпечаток вакансии -> вопросы готового плана
+        self._plans: "OrderedDict[str, List[str]]" = OrderedDict()
+        self.generated = 0
+        self.skipped = 0
+        self.phrases = 0
+        self.failures = 0
+        self.last_generation_ms = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory) and self.size > 0
+
+    def fingerprint(self, vacancy: Vacancy) -> str:
+        """План меняется вместе с полями вакансии, голосом и форматом синтеза"""
+        return hashlib.sha256(json.dumps([
+            PLAN_VERSION, self.size, vacancy.hard_skills, vacancy.soft_skills, vacancy.tasks, vacancy.tools,
+            self.voice_service.voice_id, self.voice_service.model, self.voice_service.output_format
+        ], ensure_ascii=False).encode()).hexdigest()
+
+    @staticmethod
+    def valid_id(vacancy_id: str) -> bool:
+        return bool(vacancy_id) and VACANCY_ID_PATTERN.fullmatch(vacancy_id) is not None
+
+    def _path(self, vacancy_id: str) -> str:
+        # Имя файла не должно выводить за пределы каталога планов
+        if not self.valid_id(vacancy_id):
+            raise ValueError(f"Invalid vacancy ID: {vacancy_id!r}")
+        return os.path.join(self.directory, f"{vacancy_id}.json")
+
+    def _read_manifest(self, vacancy_id: str) -> Optional[Dict]:
+        try:
+            with open(self._path(vacancy_id), encoding="utf-8") as manifest_file:
+                manifest = json.load(manifest_file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Error reading question plan {vacancy_id}: {str(e)}")
+            return None
+        return manifest if manifest.get("version") == PLAN_VERSION else None
+
+    def _write_manifest(self, vacancy_id: str, manifest: Dict) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(vacancy_id)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as manifest_file:
+            json.dump(manifest, manifest_file, ensure_ascii=False)
+        os.replace(temporary, path)
+
+    def _remove_manifest(self, vacancy_id: str) -> Optional[Dict]:
+        manifest = self._read_manifest(vacancy_id)
+        try:
+            os.remove(self._path(vacancy_id))
+        except OSError:
+            pass
+        return manifest
+
+    def _referenced_keys(self) -> Set[str]:
+        """Ключи фраз, на которые ссылается хотя бы один план"""
+        keys = set()
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                manifest = self._read_manifest(name[:-len(".json")])
+                if manifest is not None:
+                    keys.update(manifest["keys"])
+        return keys
+
+    async def _in_executor(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+    def _remember(self, fingerprint: str, questions: List[str]) -> None:
+        self._plans[fingerprint] = questions
+        self._plans.move_to_end(fingerprint)
+        while len(self._plans) > MAX_CACHED_PLANS:
+            self._plans.popitem(last=False)
+
+    async def get_plan(self, vacancy: Vacancy) -> Optional[List[str]]:
+        """Вопросы готового плана текущей версии вакансии.
+
+        Пока поля вакансии не меняются, план берется из памяти. При промахе
+        манифест читается с диска (его мог подготовить другой воркер) и
+        используется, только если построен по тем же полям.
+        """
+        if not self.enabled or not self.valid_id(vacancy.id):
+            return None
+        fingerprint = self.fingerprint(vacancy)
+        questions = self._plans.get(fingerprint)
+        if questions is not None:
+            self._plans.move_to_end(fingerprint)
+            return questions
+        manifest = await self._in_executor(self._read_manifest, vacancy.id)
+        if manifest is None or manifest["fingerprint"] != fingerprint:
+            return None
+        self._remember(fingerprint, manifest["questions"])
+        return manifest["questions"]
+
+    def schedule(self, vacancy: Vacancy) -> None:
+        """Фоновая подготовка плана; идущая подготовка для той же вакансии отменяется"""
+        if not self.enabled or not self.valid_id(vacancy.id):
+            return
+        previous = self._tasks.pop(vacancy.id, None)
+        if previous is not None:
+            previous.cancel()
+        task = self._tasks[vacancy.id] = asyncio.create_task(self._prepare(vacancy))
+        task.add_done_callback(lambda _: self._forget(vacancy.id, task))
+
+    def _forget(self, vacancy_id: str, task: asyncio.Task) -> None:
+        if self._tasks.get(vacancy_id) is task:
+            del self._tasks[vacancy_id]
+
+    async def _prepare(self, vacancy: Vacancy) -> None:
+        try:
+            await self._generate(vacancy)
+        except Exception as e:
+            self.failures += 1
+            print(f"Error preparing question plan {vacancy.id}: {str(e)}")
+
+    async def _generate(self, vacancy: Vacancy) -> None:
+        fingerprint = self.fingerprint(vacancy)
+        current = await self._in_executor(self._read_manifest, vacancy.id)
+        if current is not None and current["fingerprint"] == fingerprint:
+            # Изменились поля, не влияющие на вопросы
+            self.skipped += 1
+            return
+
+        started = time.monotonic()
+        questions = build_question_plan(vacancy, self.size)
+        sentences = list(dict.fromkeys(chain.from_iterable(split_sentences(question) for question in questions)))
+        audio = await asyncio.gather(*(self._synthesize(sentence) for sentence in sentences))
+        pinned = {
+            self.voice_service.cache_key(sentence): chunk
+            for sentence, chunk in zip(sentences, audio) if chunk
+        }
+        self.failures += len(sentences) - len(pinned)
+        # Закрепление и манифест пишутся целиком, даже если подготовку уже отменили
+        await asyncio.shield(self._commit(vacancy.id, {
+            "version": PLAN_VERSION,
+            "fingerprint": fingerprint,
+            "questions": questions,
+            "keys": list(pinned),
+            "created_at": time.time()
+        }, pinned))
+        self.generated += 1
+        self.phrases += len(pinned)
+        self.last_generation_ms = 1000 * (time.monotonic() - started)
+
+    async def _synthesize(self, sentence: str) -> Optional[bytes]:
+        """Аудио фразы для закрепления: уже закрепленное другим планом или новый синтез.
+
+        Обычный кэш не используется: фраза все равно будет закреплена, а
+        обращения плана не должны попадать в статистику попаданий.
+        """
+        audio = await self.voice_service.cache.read_pinned(self.voice_service.cache_key(sentence))
+        if audio is not None:
+            return audio
+        async with self._synthesis:
+            return await self.voice_service.synthesize(sentence)
+
+    async def _commit(self, vacancy_id: str, manifest: Dict, pinned: Dict[str, bytes]) -> None:
+        cache = self.voice_service.cache
+        for key, audio in pinned.items():
+            await cache.pin(key, audio)
+        previous = await self._in_executor(self._read_manifest, vacancy_id)
+        await self._in_executor(self._write_manifest, vacancy_id, manifest)
+        self._remember(manifest["fingerprint"], manifest["questions"])
+        if previous is not None:
+            await self._release(previous)
+
+    async def _release(self, manifest: Dict) -> None:
+        """Открепление фраз старого плана, которые больше ни в одном плане не используются"""
+        referenced = await self._in_executor(self._referenced_keys)
+        for key in set(manifest["keys"]) - referenced:
+            await self.voice_service.cache.unpin(key)
+
+    async def discard(self, vacancy_id: str) -> None:
+        """План удаленной вакансии"""
+        if not self.enabled or not self.valid_id(vacancy_id):
+            return
+        task = self._tasks.pop(vacancy_id, None)
+        if task is not None:
+            task.cancel()
+        manifest = await self._in_executor(self._remove_manifest, vacancy_id)
+        if manifest is not None:
+            await self._release(manifest)
+
+    def stats(self) -> Dict:
+        return {
+            "pending": len(self._tasks),
+            "generated": self.generated,
+            "skipped": self.skipped,
+            "phrases": self.phrases,
+            "failures": self.failures,
+            "last_generation_ms": self.last_generation_ms
+        }
+
+
+_question_planner: Optional[QuestionPlanner] = None
+
+def get_question_planner() -> QuestionPlanner:
+    global _question_planner
+    if _question_planner is None:
+        _question_planner = QuestionPlanner(
+            ElevenLabsService(),
+            os.getenv("QUESTION_PLAN_DIR", "question_plans"),
+            size=int(os.getenv("QUESTION_PLAN_SIZE", "8")),
+            concurrency=int(os.getenv("QUESTION_PLAN_TTS_CONCURRENCY", "2"))
+        )
+    return _question_planner
\ No newline at end of file
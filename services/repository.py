@@ -0,0 +1,686 @@
+import os
+import time
+import asyncio
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from services.sheets_cache import parse_range
+from services.sheets_service import GoogleSheetsService, get_sheets_service
+from services.sheets_changelog import APPEND, UPDATE, CLEAR, Change, ChangesUnavailable
+from services.google_clients import get_client_stats
+from services.id_allocator import IdAllocator, get_id_allocator
+from services.secondary_index import Condition, Range, SecondaryIndex, matches
+from services.tables import TableSchema
+
+def _max_numeric(ids: List[str]) -> int:
+    return max((int(record_id) for record_id in ids if record_id.isdigit()), default=0)
+
+class BaseRepository(ABC):
+    """Хранилище строк одного листа с CRUD-операциями по ID"""
+
+    def __init__(self, table: TableSchema, id_allocator: IdAllocator):
+        self.table = table
+        self.id_allocator = id_allocator
+
+    async def next_id(self) -> str:
+        """ID для новой записи; хранилище при этом не читается"""
+        return (await self.next_ids(1))[0]
+
+    async def next_ids(self, count: int) -> List[str]:
+        return await self.id_allocator.allocate(self.table, count, seed=self.max_numeric_id)
+
+    @abstractmethod
+    async def max_numeric_id(self) -> int:
+        """Наибольший числовой ID; нужен один раз для запуска счетчика ID"""
+
+    @abstractmethod
+    async def insert(self, row: List[str]) -> None:
+        """Добавление строки в конец листа"""
+
+    async def insert_many(self, rows: List[List[str]]) -> None:
+        """Добавление нескольких строк одной записью"""
+        for row in rows:
+            await self.insert(row)
+
+    @abstractmethod
+    async def get(self, record_id: str) -> Optional[List[str]]:
+        """Строка по ID; None, если записи нет"""
+
+    @abstractmethod
+    async def get_all(self) -> List[List[str]]:
+        """Все строки без заголовка и очищенных строк"""
+
+    @abstractmethod
+    async def find(self, **filters: Condition) -> List[List[str]]:
+        """Поиск строк по значениям колонок: точное совпадение или Range"""
+
+    @abstractmethod
+    async def page(self, limit: int, cursor: Optional[str] = None, **filters: Condition) -> Tuple[List[List[str]], Optional[str]]:
+        """Не более limit строк, начиная с cursor, и курсор следующей страницы (None - конец)"""
+
+    @abstractmethod
+    async def count(self, **filters: Condition) -> int:
+        """Число строк, удовлетворяющих условиям"""
+
+    @abstractmethod
+    async def latest(self, limit: int, **filters: Condition) -> List[List[str]]:
+        """Не более limit последних добавленных строк, от новых к старым"""
+
+    @abstractmethod
+    async def update(self, record_id: str, row: List[str]) -> bool:
+        """Перезапись строки; False, если записи нет"""
+
+    @abstractmethod
+    async def update_field(self, record_id: str, column: str, value: str) -> bool:
+        """Перезапись одной ячейки строки; False, если записи нет"""
+
+    @abstractmethod
+    async def delete(self, record_id: str) -> bool:
+        """Удаление строки; False, если записи нет"""
+
+    @abstractmethod
+    async def compact(self) -> Dict:
+        """Физически удаляет очищенные строки и возвращает отчет"""
+
+    async def warm_up(self) -> None:
+        """Подготовка индексов заранее, чтобы первый запрос не строил их сам"""
+
+    def rows_shifted(self) -> None:
+        """Другой процесс уплотнил хранилище: закэшированные номера строк больше не верны"""
+
+
+class GoogleSheetsRepository(BaseRepository):
+    """Хранилище поверх листа Google Sheets"""
+
+    def __init__(self, table: TableSchema, id_allocator: IdAllocator, sheets_service: GoogleSheetsService):
+        super().__init__(table, id_allocator)
+        self.sheets_service = sheets_service
+        # Индекс ID -> номер строки листа; строится лениво по колонке ID
+        self._row_numbers: Optional[Dict[str, int]] = None
+        self._row_count = 0
+        # Вторичный индекс по колонкам table.indexes; перестраивается по истечении TTL кэша,
+        # чтобы увидеть записи других процессов
+        self._index_positions = [self.table.columns.index(column) for column in self.table.indexes]
+        self._secondary: Optional[SecondaryIndex] = None
+        self._secondary_expires = 0.0
+        # Версия журнала изменений сервиса, до которой записи процесса применены к индексам
+        self._version = 0
+        self._headers_checked = False
+        # Создается при первом использовании: при импорте модуля event loop еще не запущен
+        self._rows_lock: Optional[asyncio.Lock] = None
+
+    def _row_writes(self) -> asyncio.Lock:
+        """Запись по номеру строки и уплотнение листа не должны пересекаться"""
+        if self._rows_lock is None:
+            self._rows_lock = asyncio.Lock()
+        return self._rows_lock
+
+    async def _read_rows(self) -> List[List[str]]:
+        self._sync()
+        version = self.sheets_service.changelog.version
+        values = await self.sheets_service.read_tab(self.table.sheet, self.table.last_column)
+        # Строки из буфера отложенной записи еще не имеют номеров в листе
+        if self._row_numbers is None and not self.sheets_service.write_buffer.pending_rows(self.table.sheet):
+            self._build_index([row[0] if row else "" for row in values])
+            self._build_secondary([self._project(row) for row in values])
+            self._version = version
+        return values
+
+    def _project(self, row: List[str]) -> List[str]:
+        """ID и значения индексируемых колонок строки"""
+        return [row[i] if i < len(row) else "" for i in [0] + self._index_positions]
+
+    def _build_secondary(self, projected: List[List[str]]) -> None:
+        self._secondary = SecondaryIndex(self.table.indexes, self.table.composite_indexes)
+        for row_number, row in enumerate(projected[1:], start=2):
+            if row and row[0]:
+                self._secondary.add(row_number, row[1:])
+        self._secondary_expires = time.monotonic() + self.sheets_service.cache.ttl
+
+    async def _ensure_secondary(self) -> SecondaryIndex:
+        self._sync()
+        if self._secondary is None or self._secondary_expires < time.monotonic():
+            version = self.sheets_service.changelog.version
+            # Читаются только колонка ID и индексируемые колонки, а не лист целиком
+            projected = await self.sheets_service.read_columns(self.table.sheet, [0] + self._index_positions)
+            if not self.sheets_service.write_buffer.pending_rows(self.table.sheet):
+                self._build_index([row[0] for row in projected])
+            self._build_secondary(projected)
+            self._version = version
+        return self._secondary
+
+    def _reset_indexes(self) -> None:
+        self._row_numbers = None
+        self._secondary = None
+
+    def _is_indexed(self, filters: Dict[str, Condition]) -> bool:
+        return bool(filters) and all(column in self.table.indexes for column in filters)
+
+    def _matcher(self, filters: Dict[str, Condition]) -> Callable[[List[str]], bool]:
+        positions = {self.table.columns.index(column): condition for column, condition in filters.items()}
+        return lambda row: all(matches(row[i], condition) for i, condition in positions.items())
+
+    def _pending_matches(self, match: Callable[[List[str]], bool]) -> List[List[str]]:
+        pending_rows = (self.table.normalize(row) for row in self.sheets_service.write_buffer.pending_rows(self.table.sheet))
+        return [row for row in pending_rows if match(row)]
+
+    async def _read_indexed(self, row_numbers: List[int], match: Callable[[List[str]], bool]) -> List[List[str]]:
+        rows = await self.sheets_service.read_rows_at(self.table.sheet, row_numbers, self.table.last_column)
+        result = []
+        for row_number in row_numbers:
+            row = rows.get(row_number)
+            # Строка могла измениться в обход индекса - проверяем условия еще раз
+            if row and row[0]:
+                row = self.table.normalize(row)
+                if match(row):
+                    result.append(row)
+        return result
+
+    def _build_index(self, ids: List[str]) -> None:
+        self._row_numbers = {
+            record_id: i for i, record_id in enumerate(ids[1:], start=2) if record_id
+        }
+        self._row_count = len(ids)
+
+    async def _rebuild_index(self) -> None:
+        version = self.sheets_service.changelog.version
+        self._build_index(await self.sheets_service.read_ids(self.table.sheet))
+        self._version = version
+
+    def _sync(self) -> None:
+        """Применяет к индексам записи процесса из журнала изменений после self._version.
+
+        Версия запоминается до чтения, по которому построен индекс, поэтому
+        записи, завершившиеся во время чтения, применяются повторно - это
+        безопасно: изменения применяются по порядку и идемпотентны.
+        """
+        if self._row_numbers is None and self._secondary is None:
+            return
+        try:
+            changes, self._version = self.sheets_service.changes_since(self._version, self.table.sheet)
+        except ChangesUnavailable:
+            # Журнал уже не содержит нужных записей - индексы строятся заново из таблицы
+            self._reset_indexes()
+            return
+        for change in changes:
+            self._apply(change)
+            if self._row_numbers is None and self._secondary is None:
+                return
+
+    def _apply(self, change: Change) -> None:
+        _, start_col, start_row, _, end_row = parse_range(change.range)
+        start_col = start_col or 0
+        if change.kind == CLEAR and start_row is not None and end_row is not None:
+            # Устаревший номер в индексе ID безопасен: перед записью ID в строке сверяется
+            if self._secondary is not None:
+                for row_number in range(max(start_row, 2), end_row + 1):
+                    self._secondary.remove(row_number)
+        elif change.kind in (APPEND, UPDATE) and start_row is not None:
+            for row_number, row in enumerate(change.rows, start=start_row):
+                if row_number >= 2:
+                    self._apply_row(row_number, start_col, row)
+        else:
+            # Удаление строк сдвигает номера, а добавление без updatedRange их не сообщает
+            self._reset_indexes()
+
+    def _apply_row(self, row_number: int, start_col: int, cells: List[str]) -> None:
+        """Значения, записанные в строку row_number начиная с колонки start_col"""
+        if start_col == 0:
+            record_id = str(cells[0]) if cells else ""
+            if self._row_numbers is not None and record_id:
+                self._row_numbers[record_id] = row_number
+                self._row_count = max(self._row_count, row_number)
+            if self._secondary is not None and not record_id:
+                # Строку очистили записью пустых значений (отложенная запись)
+                self._secondary.remove(row_number)
+                return
+        if self._secondary is None:
+            return
+        if start_col == 0 and len(cells) > max(self._index_positions, default=0):
+            self._secondary.add(row_number, self._project([str(cell) for cell in cells])[1:])
+            return
+        for column, position in zip(self.table.indexes, self._index_positions):
+            if start_col <= position < start_col + len(cells):
+                self._secondary.set_value(row_number, column, str(cells[position - start_col]))
+
+    async def _locate(self, record_id: str) -> Optional[int]:
+        self._sync()
+        if self._row_numbers is None or record_id not in self._row_numbers:
+            # Строка могла появиться после построения индекса (например, в другом процессе)
+            await self._rebuild_index()
+        return self._row_numbers.get(record_id)
+
+    def rows_shifted(self) -> None:
+        """Строки листа сдвинулись (уплотнение в другом процессе, ручное удаление):
+        индексы и закэшированный лист больше не соответствуют таблице"""
+        self._reset_indexes()
+        self.sheets_service.cache.invalidate(self.table.sheet)
+
+    async def _locate_for_write(self, record_id: str) -> Optional[int]:
+        """Номер строки, в которой record_id записан сейчас; проверяется ячейкой A{i} перед записью.
+
+        Вызывается внутри sheets_service.row_write: до конца записи другие
+        процессы не сдвинут строки листа, и проверенный номер остается верным.
+        """
+        for _ in range(2):
+            row_number = await self._locate(record_id)
+            if row_number is None:
+                return None
+            if await self.sheets_service.read_id_at(self.table.sheet, row_number) == record_id:
+                return row_number
+            self.rows_shifted()
+        return None
+
+    async def max_numeric_id(self) -> int:
+        return _max_numeric((await self.sheets_service.read_ids(self.table.sheet))[1:])
+
+    async def _ensure_headers(self) -> None:
+        """Создает заголовки в пустом листе; проверяется один раз за время жизни процесса"""
+        if self._headers_checked:
+            return
+        if not await self.sheets_service.read_row(self.table.sheet, 1, self.table.last_column):
+            await self.sheets_service.update_values(
+                f"{self.table.sheet}!A1:{self.table.last_column}1",
+                [self.table.headers]
+            )
+        self._headers_checked = True
+
+    async def insert(self, row: List[str]) -> None:
+        await self.insert_many([row])
+
+    async def insert_many(self, rows: List[List[str]]) -> None:
+        if not rows:
+            return
+        await self._ensure_headers()
+        # Один запрос values.append на все строки
+        await self.sheets_service.append_values(self.table.full_range, [self.table.normalize(row) for row in rows])
+
+    async def get(self, record_id: str) -> Optional[List[str]]:
+        pending_row = self.sheets_service.write_buffer.find_pending_row(self.table.sheet, record_id)
+        if pending_row is not None:
+            return self.table.normalize(pending_row)
+
+        for _ in range(2):
+            row_number = await self._locate(record_id)
+            if row_number is None:
+                return None
+            row = await self.sheets_service.read_row(self.table.sheet, row_number, self.table.last_column)
+            if row and row[0] == record_id:
+                return self.table.normalize(row)
+            # Индекс устарел (строки сдвинули) - перестраиваем и пробуем еще раз
+            self.rows_shifted()
+        return None
+
+    async def get_all(self) -> List[List[str]]:
+        values = await self._read_rows()
+        # Пропускаем заголовки и очищенные строки
+        return [self.table.normalize(row) for row in values[1:] if row and row[0]]
+
+    async def find(self, **filters: Condition) -> List[List[str]]:
+        match = self._matcher(filters)
+        if self._is_indexed(filters):
+            secondary = await self._ensure_secondary()
+            rows = await self._read_indexed(secondary.lookup(filters), match)
+            return rows + self._pending_matches(match)
+        return [row for row in await self.get_all() if match(row)]
+
+    async def page(self, limit: int, cursor: Optional[str] = None, **filters: Condition) -> Tuple[List[List[str]], Optional[str]]:
+        """Страница читается диапазонами по limit строк; курсор - номер строки листа.
+
+        Строки из буфера отложенной записи еще не имеют номеров и попадают
+        в последнюю страницу.
+        """
+        match = self._matcher(filters)
+        row_number = int(cursor) if cursor else 2
+        if self._is_indexed(filters):
+            secondary = await self._ensure_secondary()
+            row_numbers = [n for n in secondary.lookup(filters) if n >= row_number]
+            rows = await self._read_indexed(row_numbers[:limit], match)
+            if len(row_numbers) > limit:
+                return rows, str(row_numbers[limit])
+            return rows + self._pending_matches(match), None
+
+        rows: List[List[str]] = []
+        while True:
+            values = await self.sheets_service.read_rows(
+                self.table.sheet, row_number, row_number + limit - 1, self.table.last_column
+            )
+            for offset, row in enumerate(values):
+                if len(rows) == limit:
+                    return rows, str(row_number + offset)
+                # Очищенные строки пропускаем
+                if row and row[0]:
+                    row = self.table.normalize(row)
+                    if match(row):
+                        rows.append(row)
+            # Пустые строки в конце диапазона API не возвращает: короткий ответ -
+            # конец листа или очищенные строки, после которых данные продолжаются
+            if len(values) < limit and row_number + limit - 1 >= len(await self.sheets_service.read_ids(self.table.sheet)):
+                return rows + self._pending_matches(match), None
+            row_number += limit
+            if len(rows) == limit:
+                return rows, str(row_number)
+
+    async def count(self, **filters: Condition) -> int:
+        if not self._is_indexed(filters):
+            return len(await self.find(**filters))
+        secondary = await self._ensure_secondary()
+        return secondary.count(filters) + len(self._pending_matches(self._matcher(filters)))
+
+    async def latest(self, limit: int, **filters: Condition) -> List[List[str]]:
+        if not self._is_indexed(filters):
+            return (await self.find(**filters))[::-1][:limit]
+        match = self._matcher(filters)
+        # Еще не записанные строки - самые новые
+        rows = self._pending_matches(match)[::-1][:limit]
+        if len(rows) < limit:
+            secondary = await self._ensure_secondary()
+            rows += await self._read_indexed(secondary.latest(filters, limit - len(rows)), match)
+        return rows
+
+    async def update(self, record_id: str, row: List[str]) -> bool:
+        if self.sheets_service.write_buffer.patch_pending_row(self.table.sheet, record_id, self.table.normalize(row)):
+            return True
+
+        async with self._row_writes(), self.sheets_service.row_write(self.table.sheet) as epoch:
+            row_number = await self._locate_for_write(record_id)
+            if row_number is None:
+                return False
+
+            row = self.table.normalize(row)
+            await self.sheets_service.update_values(self.table.row_range(row_number), [row], (record_id, epoch))
+            # При отложенной записи изменения нет в журнале до сброса буфера - индекс правится сразу
+            self._sync()
+            if self._secondary is not None:
+                self._secondary.add(row_number, self._project(row)[1:])
+            return True
+
+    async def update_field(self, record_id: str, column: str, value: str) -> bool:
+        column_number = self.table.columns.index(column)
+        if self.sheets_service.write_buffer.patch_pending_row(self.table.sheet, record_id, [value], column_number):
+            return True
+
+        async with self._row_writes(), self.sheets_service.row_write(self.table.sheet) as epoch:
+            row_number = await self._locate_for_write(record_id)
+            if row_number is None:
+                return False
+
+            await self.sheets_service.update_values(self.table.cell_range(column, row_number), [[value]], (record_id, epoch))
+            self._sync()
+            if self._secondary is not None and column in self.table.indexes:
+                self._secondary.set_value(row_number, column, value)
+            return True
+
+    async def delete(self, record_id: str) -> bool:
+        if self.sheets_service.write_buffer.discard_pending_row(self.table.sheet, record_id):
+            return True
+
+        async with self._row_writes(), self.sheets_service.row_write(self.table.sheet) as epoch:
+            row_number = await self._locate_for_write(record_id)
+            if row_number is None:
+                return False
+
+            await self.sheets_service.clear_values(self.table.row_range(row_number), (record_id, epoch))
+            self._sync()
+            if self._row_numbers is not None:
+                self._row_numbers.pop(record_id, None)
+            if self._secondary is not None:
+                self._secondary.remove(row_number)
+            return True
+
+    async def warm_up(self) -> None:
+        # После прогрева кэша лист читается из памяти, индексы строятся без запросов
+        self._reset_indexes()
+        await self._read_rows()
+        await self._ensure_secondary()
+
+    async def _scan(self) -> Tuple[List[List[str]], float]:
+        """Полное чтение листа в обход кэша и его длительность в секундах"""
+        started = time.monotonic()
+        values = await self.sheets_service.get_values(self.table.full_range)
+        return values, time.monotonic() - started
+
+    async def compact(self) -> Dict:
+        """Удаляет очищенные строки через deleteDimension и перестраивает индексы.
+
+        Номера строк после уплотнения меняются: индексы этого процесса
+        перестраиваются сразу. Другие процессы сбрасывают свои индексы по
+        номеру уплотнения (services/compaction.py), а до этого запись по
+        номеру строки сверяет ID в ячейке A и находит строку заново.
+        Удаление строк и записи по номерам строк в других процессах не
+        пересекаются (services/compaction_lease.py).
+        """
+        async with self._row_writes():
+            await self.sheets_service.flush()
+            values, scan_before = await self._scan()
+            rows_before = max(len(values) - 1, 0)
+            tombstones = [n for n, row in enumerate(values[1:], start=2) if not row or not row[0]]
+            scan_after = scan_before
+            if tombstones:
+                await self.sheets_service.delete_rows(self.table.sheet, tombstones)
+                version = self.sheets_service.changelog.version
+                values, scan_after = await self._scan()
+                self._reset_indexes()
+                if not self.sheets_service.write_buffer.pending_rows(self.table.sheet):
+                    self._build_index([row[0] if row else "" for row in values])
+                    self._build_secondary([self._project(row) for row in values])
+                    self._version = version
+        return {
+            "table": self.table.name,
+            "rows_before": rows_before,
+            "reclaimed_rows": len(tombstones),
+            "rows_after": max(len(values) - 1, 0),
+            "scan_ms_before": 1000 * scan_before,
+            "scan_ms_after": 1000 * scan_after,
+            "scan_speedup": scan_before / scan_after if scan_after else 1.0
+        }
+
+
+class SQLiteRepository(BaseRepository):
+    """Локальное хранилище в SQLite с первичным ключом и вторичными индексами.
+
+    sqlite3 блокирует поток на время запроса (и до timeout при занятой базе),
+    поэтому все обращения к соединению идут через executor из одного потока:
+    event loop не ждет диск, а запросы к соединению выполняются по очереди.
+    """
+
+    def __init__(self, table: TableSchema, id_allocator: IdAllocator, connection: sqlite3.Connection,
+                 lock: threading.Lock, executor: ThreadPoolExecutor):
+        super().__init__(table, id_allocator)
+        self.connection = connection
+        self.lock = lock
+        self.executor = executor
+        self._create_table()
+
+    def _create_table(self):
+        columns = ", ".join(
+            f'"{column}" TEXT PRIMARY KEY' if column == "id" else f'"{column}" TEXT'
+            for column in self.table.columns
+        )
+        with self.lock:
+            self.connection.execute(f'CREATE TABLE IF NOT EXISTS "{self.table.name}" ({columns})')
+            for columns in [(column,) for column in self.table.indexes] + self.table.composite_indexes:
+                column_list = ", ".join(f'"{column}"' for column in columns)
+                self.connection.execute(
+                    f'CREATE INDEX IF NOT EXISTS "idx_{self.table.name}_{"_".join(columns)}" '
+                    f'ON "{self.table.name}" ({column_list})'
+                )
+
+    async def _run(self, function: Callable, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    def _query_sync(self, sql: str, params: tuple) -> List[List[str]]:
+        with self.lock:
+            return [list(row) for row in self.connection.execute(sql, params).fetchall()]
+
+    def _execute_sync(self, sql: str, params: tuple) -> int:
+        with self.lock:
+            return self.connection.execute(sql, params).rowcount
+
+    def _execute_many_sync(self, sql: str, rows: List[tuple]) -> None:
+        with self.lock:
+            # Одна транзакция: в режиме autocommit каждая строка фиксировалась бы отдельно
+            self.connection.execute("BEGIN")
+            try:
+                self.connection.executemany(sql, rows)
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+
+    async def _query(self, sql: str, params: tuple = ()) -> List[List[str]]:
+        return await self._run(self._query_sync, sql, params)
+
+    async def _execute(self, sql: str, params: tuple = ()) -> int:
+        return await self._run(self._execute_sync, sql, params)
+
+    def _select(self, with_rowid: bool = False) -> str:
+        columns = [f'"{column}"' for column in self.table.columns]
+        if with_rowid:
+            columns.insert(0, "rowid")
+        return f'SELECT {", ".join(columns)} FROM "{self.table.name}"'
+
+    def _conditions(self, filters: Dict[str, Condition]) -> Tuple[List[str], tuple]:
+        conditions, params = [], []
+        for column, condition in filters.items():
+            self.table.columns.index(column)  # Защита от произвольных имен колонок
+            if isinstance(condition, Range):
+                if condition.start is not None:
+                    conditions.append(f'"{column}" >= ?')
+                    params.append(condition.start)
+                if condition.end is not None:
+                    conditions.append(f'"{column}" <= ?')
+                    params.append(condition.end)
+            else:
+                conditions.append(f'"{column}" = ?')
+                params.append(condition)
+        return conditions, tuple(params)
+
+    async def max_numeric_id(self) -> int:
+        return _max_numeric([row[0] for row in await self._query(f'SELECT "id" FROM "{self.table.name}"')])
+
+    async def insert(self, row: List[str]) -> None:
+        placeholders = ", ".join("?" for _ in self.table.columns)
+        await self._execute(
+            f'INSERT INTO "{self.table.name}" VALUES ({placeholders})',
+            tuple(self.table.normalize(row))
+        )
+
+    async def insert_many(self, rows: List[List[str]]) -> None:
+        placeholders = ", ".join("?" for _ in self.table.columns)
+        await self._run(
+            self._execute_many_sync,
+            f'INSERT INTO "{self.table.name}" VALUES ({placeholders})',
+            [tuple(self.table.normalize(row)) for row in rows]
+        )
+
+    async def get(self, record_id: str) -> Optional[List[str]]:
+        rows = await self._query(f'{self._select()} WHERE "id" = ?', (record_id,))
+        return rows[0] if rows else None
+
+    async def get_all(self) -> List[List[str]]:
+        return await self._query(f'{self._select()} ORDER BY rowid')
+
+    async def find(self, **filters: Condition) -> List[List[str]]:
+        conditions, params = self._conditions(filters)
+        if not conditions:
+            return await self.get_all()
+        return await self._query(
+            f'{self._select()} WHERE {" AND ".join(conditions)} ORDER BY rowid',
+            params
+        )
+
+    async def page(self, limit: int, cursor: Optional[str] = None, **filters: Condition) -> Tuple[List[List[str]], Optional[str]]:
+        """Курсор - rowid последней возвращенной строки"""
+        conditions, params = self._conditions(filters)
+        rows = await self._query(
+            f'{self._select(with_rowid=True)} WHERE {" AND ".join(["rowid > ?"] + conditions)} ORDER BY rowid LIMIT ?',
+            (int(cursor or 0),) + params + (limit + 1,)
+        )
+        next_cursor = str(rows[limit - 1][0]) if len(rows) > limit else None
+        return [row[1:] for row in rows[:limit]], next_cursor
+
+    async def count(self, **filters: Condition) -> int:
+        conditions, params = self._conditions(filters)
+        where = f' WHERE {" AND ".join(conditions)}' if conditions else ""
+        return (await self._query(f'SELECT COUNT(*) FROM "{self.table.name}"{where}', params))[0][0]
+
+    async def latest(self, limit: int, **filters: Condition) -> List[List[str]]:
+        conditions, params = self._conditions(filters)
+        where = f' WHERE {" AND ".join(conditions)}' if conditions else ""
+        return await self._query(f'{self._select()}{where} ORDER BY rowid DESC LIMIT ?', params + (limit,))
+
+    async def update(self, record_id: str, row: List[str]) -> bool:
+        assignments = ", ".join(f'"{column}" = ?' for column in self.table.columns)
+        updated = await self._execute(
+            f'UPDATE "{self.table.name}" SET {assignments} WHERE "id" = ?',
+            tuple(self.table.normalize(row)) + (record_id,)
+        )
+        return updated > 0
+
+    async def update_field(self, record_id: str, column: str, value: str) -> bool:
+        self.table.columns.index(column)
+        updated = await self._execute(
+            f'UPDATE "{self.table.name}" SET "{column}" = ? WHERE "id" = ?',
+            (value, record_id)
+        )
+        return updated > 0
+
+    async def delete(self, record_id: str) -> bool:
+        deleted = await self._execute(f'DELETE FROM "{self.table.name}" WHERE "id" = ?', (record_id,))
+        return deleted > 0
+
+    async def compact(self) -> Dict:
+        # DELETE удаляет строки физически, очищенных строк не бывает
+        return {"table": self.table.name, "reclaimed_rows": 0}
+
+
+_repositories: Dict[str, BaseRepository] = {}
+_sqlite_connection: Optional[sqlite3.Connection] = None
+_sqlite_lock = threading.Lock()
+# Один поток на соединение: запросы SQLite не блокируют event loop и не мешают друг другу
+_sqlite_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+
+def _get_sqlite_connection() -> sqlite3.Connection:
+    global _sqlite_connection
+    if _sqlite_connection is None:
+        path = os.getenv("SQLITE_PATH", "ai_hr.db")
+        _sqlite_connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        _sqlite_connection.execute("PRAGMA journal_mode=WAL")
+    return _sqlite_connection
+
+def get_repository(table: TableSchema) -> BaseRepository:
+    """Возвращает общее для процесса хранилище листа согласно STORAGE_BACKEND"""
+    repository = _repositories.get(table.name)
+    if repository is not None:
+        return repository
+
+    backend = os.getenv("STORAGE_BACKEND", "sheets").lower()
+    if backend == "sqlite":
+        repository = SQLiteRepository(table, get_id_allocator(), _get_sqlite_connection(), _sqlite_lock, _sqlite_executor)
+    elif backend == "sheets":
+        repository = GoogleSheetsRepository(table, get_id_allocator(), get_sheets_service())
+    else:
+        raise ValueError(f"Unknown storage backend: {backend}")
+
+    _repositories[table.name] = repository
+    return repository
+
+def get_storage_metrics() -> Dict:
+    """Метрики хранилища для уже созданных бэкендов"""
+    metrics: Dict = {
+        "backend": os.getenv("STORAGE_BACKEND", "sheets").lower(),
+        "id_allocator": get_id_allocator().stats()
+    }
+    for repository in _repositories.values():
+        if isinstance(repository, GoogleSheetsRepository):
+            metrics["sheets_cache"] = repository.sheets_service.cache.stats()
+            metrics["sheets_executor"] = repository.sheets_service.executor.stats()
+            metrics["sheets_scheduler"] = repository.sheets_service.executor.scheduler.stats()
+            metrics["google_clients"] = get_client_stats()
+            metrics["sheets_changelog"] = repository.sheets_service.changelog.stats()
+            metrics["sheets_warmup"] = repository.sheets_service.warmup_stats
+            break
+    return metrics
\ No newline at end of file
@@ -0,0 +1,119 @@
+import heapq
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+
+class Range(NamedTuple):
+    """Условие «значение колонки в диапазоне»; границы включительно, None - без границы"""
+    start: Optional[str] = None
+    end: Optional[str] = None
+
+    def matches(self, value: str) -> bool:
+        if not value:
+            return False
+        # Даты формата версии 1 записаны через пробел, а не через "T"
+        value = value.replace(" ", "T", 1)
+        return (self.start is None or value >= self.start) and (self.end is None or value <= self.end)
+
+# Условие фильтра: точное значение или диапазон
+Condition = Union[str, Range]
+
+def matches(value: str, condition: Condition) -> bool:
+    if isinstance(condition, Range):
+        return condition.matches(value)
+    return value == condition
+
+
+class SecondaryIndex:
+    """Индекс «значение колонки -> номера строк листа» по нескольким колонкам.
+
+    Хранит для каждой строки ее индексируемые значения, чтобы при перезаписи
+    строки убрать ее из старых множеств без чтения листа. Составной индекс
+    отвечает на точный запрос по сочетанию колонок, а его размер - это
+    готовый счетчик: count() по нему не перебирает строки.
+    """
+
+    def __init__(self, columns: List[str], composites: Optional[List[Tuple[str, ...]]] = None):
+        self.columns = columns
+        self.composites = [tuple(composite) for composite in composites or []]
+        self._values: Dict[str, Dict[str, Set[int]]] = {column: {} for column in columns}
+        self._composite_values: Dict[Tuple[str, ...], Dict[Tuple[str, ...], Set[int]]] = {
+            composite: {} for composite in self.composites
+        }
+        self._composite_positions = {
+            composite: [columns.index(column) for column in composite] for composite in self.composites
+        }
+        self._rows: Dict[int, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, row_number: int, values: Sequence[str]) -> None:
+        """values - значения индексируемых колонок в порядке self.columns"""
+        self.remove(row_number)
+        values = list(values)
+        self._rows[row_number] = values
+        for column, value in zip(self.columns, values):
+            self._values[column].setdefault(value, set()).add(row_number)
+        for composite, positions in self._composite_positions.items():
+            key = tuple(values[i] for i in positions)
+            self._composite_values[composite].setdefault(key, set()).add(row_number)
+
+    def remove(self, row_number: int) -> None:
+        values = self._rows.pop(row_number, None)
+        if values is None:
+            return
+        for column, value in zip(self.columns, values):
+            self._discard(self._values[column], value, row_number)
+        for composite, positions in self._composite_positions.items():
+            self._discard(self._composite_values[composite], tuple(values[i] for i in positions), row_number)
+
+    @staticmethod
+    def _discard(index: Dict, key, row_number: int) -> None:
+        row_numbers = index.get(key)
+        if row_numbers is not None:
+            row_numbers.discard(row_number)
+            if not row_numbers:
+                del index[key]
+
+    def set_value(self, row_number: int, column: str, value: str) -> None:
+        values = self._rows.get(row_number)
+        if values is None:
+            return
+        values = list(values)
+        values[self.columns.index(column)] = value
+        self.add(row_number, values)
+
+    def _match(self, filters: Dict[str, Condition]) -> Set[int]:
+        """Множество номеров строк; может принадлежать индексу и не должно изменяться"""
+        if not filters:
+            return set(self._rows)
+        exact = tuple(sorted(column for column, condition in filters.items() if not isinstance(condition, Range)))
+        for composite in self.composites:
+            if tuple(sorted(composite)) == exact and len(exact) == len(filters):
+                return self._composite_values[composite].get(tuple(filters[column] for column in composite), set())
+
+        result: Optional[Set[int]] = None
+        for column, condition in filters.items():
+            index = self._values[column]
+            if isinstance(condition, Range):
+                row_numbers = set()
+                for value, rows in index.items():
+                    if condition.matches(value):
+                        row_numbers |= rows
+            else:
+                row_numbers = index.get(condition, set())
+            result = row_numbers if result is None else result & row_numbers
+            if not result:
+                return set()
+        return result
+
+    def lookup(self, filters: Dict[str, Condition]) -> List[int]:
+        """Номера строк, удовлетворяющих всем условиям, по возрастанию"""
+        return sorted(self._match(filters))
+
+    def count(self, filters: Dict[str, Condition]) -> int:
+        """Число строк; для одной колонки или составного индекса - O(1)"""
+        return len(self._match(filters))
+
+    def latest(self, filters: Dict[str, Condition], limit: int) -> List[int]:
+        """limit последних добавленных строк (наибольшие номера), от новых к старым"""
+        return heapq.nlargest(limit, self._match(filters))
\ No newline at end of file
@@ -4,6 +4,7 @@ from typing import Optional
 from fastapi import Response
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from services.token_cache import get_token_cache
 
 class SecurityService:
     def __init__(self):
@@ -11,6 +12,7 @@ class SecurityService:
         self.algorithm = os.getenv("JWT_ALGORITHM", "HS256")
         self.access_token_expire_minutes = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
         self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.token_cache = get_token_cache()
         
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         return self.pwd_context.verify(plain_password, hashed_password)
@@ -50,9 +52,13 @@ class SecurityService:
         )
         
     def verify_token(self, token: str) -> Optional[dict]:
-        """Проверяет токен и возвращает данные"""
+        """Проверяет токен и возвращает данные; подпись уже проверенного токена не пересчитывается"""
+        payload = self.token_cache.get(token, self.secret_key, self.algorithm)
+        if payload is not None:
+            return payload
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            return payload
         except JWTError:
-            return None 
\ No newline at end of file
+            return None
+        self.token_cache.put(token, self.secret_key, self.algorithm, payload)
+        return payload 
\ No newline at end of file
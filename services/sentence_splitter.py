@@ -0,0 +1,38 @@
+import re
+from typing import List, Optional
+
+# Конец предложения: знак препинания (и закрывающая кавычка/скобка) перед пробелом
+_SENTENCE_END = re.compile(r'[.!?…]+["»)]?\s+')
+
+class SentenceSplitter:
+    """Нарезка потока токенов на предложения для синтеза речи"""
+
+    def __init__(self, min_length: int = 12):
+        # Короткие куски («Т.е.», «1.») приклеиваются к следующему предложению
+        self.min_length = min_length
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        self._buffer += text
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            if match.end() - start >= self.min_length:
+                sentences.append(self._buffer[start:match.end()].strip())
+                start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        rest, self._buffer = self._buffer.strip(), ""
+        return rest or None
+
+
+def split_sentences(text: str) -> List[str]:
+    """Предложения готового текста в той же нарезке, что и при потоковой генерации целым куском"""
+    splitter = SentenceSplitter()
+    sentences = splitter.feed(text)
+    rest = splitter.flush()
+    if rest:
+        sentences.append(rest)
+    return sentences
\ No newline at end of file
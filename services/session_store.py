@@ -0,0 +1,213 @@
+import os
+import time
+import asyncio
+from typing import Awaitable, Callable, Coroutine, Dict, Optional, Set
+from models.base import Interview
+from services.codecs import INTERVIEW_CODEC
+from services.repository import BaseRepository, get_repository
+from services.sheets_scheduler import DEFAULT, sheets_lane
+from services.tables import INTERVIEWS
+
+class InterviewSession:
+    """Горячее состояние идущего интервью"""
+
+    def __init__(self, interview: Interview):
+        self.interview = interview
+        # Ходы интервью изменяют состояние по очереди
+        self.lock = asyncio.Lock()
+        self.turns = 0
+        self.persisted_turns = 0
+        self.dirty = False
+        self.last_activity = time.monotonic()
+        self.checkpoint_task: Optional[asyncio.Task] = None
+        # Сессию сбросили: ее состояние больше не записывается
+        self.discarded = False
+        # Фоновые задачи хода (например, анализ ответа), дописывающие состояние
+        self.tasks: Set[asyncio.Task] = set()
+
+
+class SessionStore:
+    """Общее для процесса хранилище состояния активных интервью.
+
+    Ход интервью меняет только память: интервью загружается из таблицы один
+    раз при первом обращении, а запись строки идет в фоне на контрольных
+    точках - каждые checkpoint_turns ходов, при завершении сессии и при
+    вытеснении простаивающей дольше idle_timeout секунд.
+
+    Запись контрольной точки, начатая до вытеснения или сброса сессии,
+    отслеживается по ID интервью: повторная загрузка и запись в обход
+    сессии дожидаются ее, чтобы не прочитать и не перезаписать строку раньше.
+    """
+
+    def __init__(self, repository: BaseRepository, checkpoint_turns: int, idle_timeout: float):
+        self.repository = repository
+        self.checkpoint_turns = max(checkpoint_turns, 1)
+        self.idle_timeout = idle_timeout
+        self._sessions: Dict[str, InterviewSession] = {}
+        self._loading: Dict[str, asyncio.Future] = {}
+        # ID интервью -> идущая запись контрольной точки
+        self._checkpoints: Dict[str, asyncio.Task] = {}
+        self.checkpoints = 0
+        self.checkpoint_errors = 0
+        self.evictions = 0
+
+    def peek(self, session_id: str) -> Optional[InterviewSession]:
+        return self._sessions.get(session_id)
+
+    def add(self, interview: Interview) -> InterviewSession:
+        """Регистрирует уже сохраненное интервью как активную сессию"""
+        self.evict_idle()
+        session = InterviewSession(interview)
+        self._sessions[interview.id] = session
+        return session
+
+    async def get(self, session_id: str, loader: Callable[[str], Awaitable[Optional[Interview]]]) -> Optional[InterviewSession]:
+        """Сессия из памяти; при промахе интервью читается через loader один раз на все ожидающие ходы"""
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.last_activity = time.monotonic()
+            return session
+
+        loading = self._loading.get(session_id)
+        if loading is None:
+            loading = self._loading[session_id] = asyncio.ensure_future(self._load(session_id, loader))
+            loading.add_done_callback(lambda _: self._loading.pop(session_id, None))
+        interview = await asyncio.shield(loading)
+        if interview is None:
+            return None
+        return self._sessions.get(session_id) or self.add(interview)
+
+    async def _load(self, session_id: str, loader: Callable[[str], Awaitable[Optional[Interview]]]) -> Optional[Interview]:
+        # Вытесненная сессия могла еще не дописать свое состояние в таблицу
+        await self.wait_checkpoint(session_id)
+        return await loader(session_id)
+
+    async def wait_checkpoint(self, session_id: str) -> None:
+        """Дожидается идущей записи контрольной точки интервью, если она есть"""
+        task = self._checkpoints.get(session_id)
+        if task is not None:
+            await asyncio.shield(task)
+
+    def record_turn(self, session: InterviewSession) -> None:
+        """Отмечает изменение состояния; на контрольной точке запускает фоновую запись"""
+        session.turns += 1
+        session.dirty = True
+        session.last_activity = time.monotonic()
+        if session.turns - session.persisted_turns >= self.checkpoint_turns:
+            self._schedule_checkpoint(session)
+
+    def run_in_background(self, session: InterviewSession, coroutine: Coroutine) -> None:
+        """Задача, результат которой должен попасть в сохраненное состояние сессии"""
+        task = asyncio.create_task(coroutine)
+        session.tasks.add(task)
+        task.add_done_callback(session.tasks.discard)
+
+    def _schedule_checkpoint(self, session: InterviewSession) -> None:
+        if session.discarded:
+            return
+        if session.checkpoint_task is None or session.checkpoint_task.done():
+            session_id = session.interview.id
+            task = session.checkpoint_task = asyncio.create_task(self._checkpoint(session))
+            self._checkpoints[session_id] = task
+            task.add_done_callback(lambda _: self._forget_checkpoint(session_id, task))
+
+    def _forget_checkpoint(self, session_id: str, task: asyncio.Task) -> None:
+        if self._checkpoints.get(session_id) is task:
+            del self._checkpoints[session_id]
+
+    async def _checkpoint(self, session: InterviewSession) -> None:
+        # Ходы, сделанные во время записи, попадут в следующий проход цикла
+        while session.dirty and not session.discarded:
+            session.dirty = False
+            turns = session.turns
+            row = INTERVIEW_CODEC.encode(session.interview.dict())
+            try:
+                # Запись в фоне не должна занимать полосу интерактивных запросов
+                with sheets_lane(DEFAULT):
+                    await self.repository.update(session.interview.id, row)
+            except Exception as e:
+                session.dirty = True
+                self.checkpoint_errors += 1
+                print(f"Error saving interview {session.interview.id}: {str(e)}")
+                return
+            session.persisted_turns = turns
+            self.checkpoints += 1
+
+    async def close(self, session_id: str) -> None:
+        """Завершение сессии: запись последнего состояния и удаление из памяти"""
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return
+        if session.tasks:
+            await asyncio.gather(*session.tasks, return_exceptions=True)
+        if session.checkpoint_task is not None:
+            await asyncio.shield(session.checkpoint_task)
+        self._schedule_checkpoint(session)
+        if session.checkpoint_task is not None:
+            await asyncio.shield(session.checkpoint_task)
+
+    async def discard(self, session_id: str) -> None:
+        """Сброс сессии без записи перед изменением или удалением строки интервью в обход сессии.
+
+        Отменить уже отправленный запрос нельзя, поэтому идущая запись
+        контрольной точки дожидается завершения: она не ляжет поверх
+        записи вызывающего.
+        """
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            session.discarded = True
+        await self.wait_checkpoint(session_id)
+
+    async def flush(self) -> None:
+        """Запись всех несохраненных сессий (при остановке приложения)"""
+        for session_id in list(self._sessions):
+            await self.close(session_id)
+
+    def evict_idle(self) -> int:
+        """Выгрузка сессий, простаивающих дольше idle_timeout; несохраненные записываются в фоне"""
+        deadline = time.monotonic() - self.idle_timeout
+        evicted = 0
+        for session_id, session in list(self._sessions.items()):
+            if session.last_activity < deadline and not session.lock.locked():
+                del self._sessions[session_id]
+                evicted += 1
+                if session.dirty:
+                    self._schedule_checkpoint(session)
+        self.evictions += evicted
+        return evicted
+
+    def stats(self) -> Dict:
+        return {
+            "active": len(self._sessions),
+            "unsaved": sum(1 for session in self._sessions.values() if session.dirty),
+            "checkpoints": self.checkpoints,
+            "checkpoint_errors": self.checkpoint_errors,
+            "evictions": self.evictions
+        }
+
+
+_session_store: Optional[SessionStore] = None
+
+def get_session_store() -> SessionStore:
+    """Общий для процесса экземпляр: сессию видят и websocket, и REST-роуты"""
+    global _session_store
+    if _session_store is None:
+        _session_store = SessionStore(
+            get_repository(INTERVIEWS),
+            checkpoint_turns=int(os.getenv("SESSION_CHECKPOINT_TURNS", "5")),
+            idle_timeout=float(os.getenv("SESSION_IDLE_TIMEOUT", "1800"))
+        )
+    return _session_store
+
+async def run_session_eviction_schedule(interval: float) -> None:
+    """Выгрузка простаивающих сессий раз в interval секунд, даже если новые интервью не начинаются"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            get_session_store().evict_idle()
+        except Exception as e:
+            print(f"Error evicting interview sessions: {str(e)}")
+
+async def flush_session_store() -> None:
+    if _session_store is not None:
+        await _session_store.flush()
\ No newline at end of file
@@ -0,0 +1,199 @@
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from services.sheets_changelog import APPEND, UPDATE, CLEAR, Change
+
+_CELL_RE = re.compile(r'^([A-Z]*)(\d*)$')
+
+def column_index(letters: str) -> int:
+    """'A' -> 0, 'K' -> 10, 'AA' -> 26"""
+    index = 0
+    for letter in letters:
+        index = index * 26 + ord(letter) - ord('A') + 1
+    return index - 1
+
+def parse_range(range_name: str) -> Tuple[str, Optional[int], Optional[int], Optional[int], Optional[int]]:
+    """Разбирает A1-нотацию: 'Лист!B2:D5' -> ('Лист', 1, 2, 3, 5).
+
+    Колонки возвращаются с нуля, строки - с единицы, отсутствующие части - None.
+    """
+    sheet, _, cells = range_name.rpartition('!')
+    sheet = sheet.strip("'")
+    start, _, end = cells.partition(':')
+    end = end or start
+
+    bounds = []
+    for cell in (start, end):
+        match = _CELL_RE.match(cell)
+        if not match:
+            raise ValueError(f"Invalid range: {range_name}")
+        letters, digits = match.groups()
+        bounds.append(column_index(letters) if letters else None)
+        bounds.append(int(digits) if digits else None)
+    return (sheet, *bounds)
+
+
+def _size(row: List[str]) -> int:
+    return sum(len(cell) for cell in row) + 8 * len(row)
+
+
+class TabCache:
+    """Кэш декодированного содержимого листов с TTL и ограничением по памяти.
+
+    Листы хранятся в порядке последнего обращения; при превышении max_bytes
+    вытесняются самые давние. Записи процесса применяются к кэшу из журнала
+    изменений GoogleSheetsService (apply_change).
+    """
+
+    def __init__(self, ttl: float, max_bytes: int):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._tabs: "OrderedDict[str, Dict]" = OrderedDict()
+        # Счетчик записей по листу: чтение, начатое до записи, не должно попасть в кэш
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_bytes > 0
+
+    def get(self, sheet: str, width: int) -> Optional[List[List[str]]]:
+        """Возвращает строки листа, если они закэшированы не уже width колонок"""
+        entry = self._tabs.get(sheet)
+        if entry is None or entry["width"] < width:
+            self.misses += 1
+            return None
+        if entry["expires"] < time.monotonic():
+            self._drop(sheet)
+            self.misses += 1
+            return None
+        self._tabs.move_to_end(sheet)
+        self.hits += 1
+        return entry["values"]
+
+    def generation(self, sheet: str) -> Tuple[int, int]:
+        return self._epoch, self._generations.get(sheet, 0)
+
+    def put(self, sheet: str, width: int, values: List[List[str]], generation: Optional[Tuple[int, int]] = None) -> None:
+        if not self.enabled:
+            return
+        if generation is not None and generation != self.generation(sheet):
+            return
+        self._drop(sheet)
+        size = sum(_size(row) for row in values)
+        if size > self.max_bytes:
+            return
+        self._tabs[sheet] = {
+            "values": values,
+            "width": width,
+            "size": size,
+            "expires": time.monotonic() + self.ttl
+        }
+        self._size += size
+        self._evict()
+
+    def invalidate(self, sheet: Optional[str] = None) -> None:
+        self._bump(sheet)
+        if sheet is None:
+            self.invalidations += len(self._tabs)
+            self._tabs.clear()
+            self._size = 0
+        elif sheet in self._tabs:
+            self.invalidations += 1
+            self._drop(sheet)
+
+    def apply_update(self, range_name: str, rows: List[List[str]]) -> None:
+        """Патчит закэшированный лист значениями, записанными в диапазон"""
+        sheet, start_col, start_row, _, _ = parse_range(range_name)
+        self._bump(sheet)
+        entry = self._tabs.get(sheet)
+        if entry is None:
+            return
+        start_col = start_col or 0
+        if start_row is None or start_col + max((len(row) for row in rows), default=0) > entry["width"]:
+            self.invalidate(sheet)
+            return
+
+        values = entry["values"]
+        for offset, new_cells in enumerate(rows):
+            index = start_row - 1 + offset
+            while len(values) <= index:
+                values.append([])
+            row = values[index]
+            entry["size"] -= _size(row)
+            self._size -= _size(row)
+            if len(row) < start_col + len(new_cells):
+                row.extend([""] * (start_col + len(new_cells) - len(row)))
+            row[start_col:start_col + len(new_cells)] = [str(cell) for cell in new_cells]
+            # API не возвращает пустые ячейки в конце строки
+            while row and row[-1] == "":
+                row.pop()
+            entry["size"] += _size(row)
+            self._size += _size(row)
+        while values and not values[-1]:
+            values.pop()
+        self._evict()
+
+    def apply_clear(self, range_name: str) -> None:
+        sheet, start_col, start_row, end_col, end_row = parse_range(range_name)
+        self._bump(sheet)
+        entry = self._tabs.get(sheet)
+        if entry is None:
+            return
+        if start_row is None or end_row is None:
+            self.invalidate(sheet)
+            return
+        start_col = start_col or 0
+        end_col = entry["width"] - 1 if end_col is None else end_col
+        blank = [""] * (end_col - start_col + 1)
+        self.apply_update(
+            f"{sheet}!{chr(ord('A') + start_col)}{start_row}",
+            [blank for _ in range(start_row, min(end_row, len(entry["values"])) + 1)]
+        )
+
+    def apply_change(self, change: Change) -> None:
+        """Применяет запись из журнала изменений; удаление строк сдвигает лист - он перечитывается"""
+        if change.kind in (APPEND, UPDATE):
+            # Добавление без фактического диапазона не знает номеров строк и сбрасывает лист
+            self.apply_update(change.range, change.rows)
+        elif change.kind == CLEAR:
+            self.apply_clear(change.range)
+        else:
+            self.invalidate(change.sheet)
+
+    def stats(self) -> Dict:
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / requests if requests else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "tabs": len(self._tabs),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl
+        }
+
+    def _bump(self, sheet: Optional[str]) -> None:
+        if sheet is None:
+            self._epoch += 1
+        else:
+            self._generations[sheet] = self._generations.get(sheet, 0) + 1
+
+    def _drop(self, sheet: str) -> None:
+        entry = self._tabs.pop(sheet, None)
+        if entry is not None:
+            self._size -= entry["size"]
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes and self._tabs:
+            sheet = next(iter(self._tabs))
+            self._drop(sheet)
+            self.evictions += 1
\ No newline at end of file
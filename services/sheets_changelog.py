@@ -0,0 +1,77 @@
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+
+APPEND = "append"
+UPDATE = "update"
+CLEAR = "clear"
+DELETE_ROWS = "delete_rows"
+
+class Change(NamedTuple):
+    """Одна запись, дошедшая до таблицы"""
+    version: int
+    sheet: str
+    kind: str
+    range: str
+    # Записанные значения; для CLEAR и DELETE_ROWS пусто
+    rows: List[List[str]]
+    # Для DELETE_ROWS - удаленные номера строк
+    row_numbers: List[int]
+
+
+class ChangesUnavailable(Exception):
+    """Запрошенная версия вытеснена из журнала или относится к прошлому запуску процесса"""
+
+
+class ChangeLog:
+    """Журнал записей процесса в таблицу с монотонными версиями.
+
+    Потребители (кэш листов, индексы хранилищ) запоминают версию и затем
+    забирают только изменения после нее вместо повторного чтения листа.
+    Журнал ограничен max_entries; если нужная версия уже вытеснена,
+    changes_since бросает ChangesUnavailable и потребитель перечитывает лист.
+
+    Журнал живет в памяти процесса и содержит только его собственные записи:
+    изменения, сделанные другими воркерами, в него не попадают и видны
+    только после перечитывания листа (по TTL кэша или при сбросе индексов).
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: Deque[Change] = deque(maxlen=max_entries)
+        self.version = 0
+
+    def record(
+        self,
+        sheet: str,
+        kind: str,
+        range_name: str,
+        rows: Optional[List[List[str]]] = None,
+        row_numbers: Optional[List[int]] = None
+    ) -> Change:
+        self.version += 1
+        change = Change(self.version, sheet, kind, range_name, rows or [], row_numbers or [])
+        self._entries.append(change)
+        return change
+
+    def changes_since(self, version: int, sheet: Optional[str] = None) -> Tuple[List[Change], int]:
+        """Изменения с версией больше version (по листу sheet или по всем) и текущая версия"""
+        if version > self.version:
+            raise ChangesUnavailable(f"Version {version} is ahead of the log ({self.version})")
+        oldest = self._entries[0].version if self._entries else self.version + 1
+        if version < self.version and version + 1 < oldest:
+            raise ChangesUnavailable(f"Version {version} is older than the log ({oldest})")
+        # Версии в журнале идут подряд, поэтому начало выборки известно без поиска
+        changes = [
+            change for change in islice(self._entries, max(version + 1 - oldest, 0), None)
+            if sheet is None or change.sheet == sheet
+        ]
+        return changes, self.version
+
+    def stats(self) -> Dict:
+        return {
+            "version": self.version,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "oldest_version": self._entries[0].version if self._entries else None
+        }
\ No newline at end of file
@@ -0,0 +1,263 @@
+import json
+import time
+import random
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+import httplib2
+from googleapiclient.errors import HttpError
+from services.sheets_cache import parse_range
+from services.tables import TABLES
+
+def _quote(title: str) -> str:
+    # API берет в кавычки названия листов, содержащие не только латиницу и цифры
+    return title if title.isascii() and title.isalnum() else f"'{title}'"
+
+def _column_letters(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+def _trim(rows: List[List[str]]) -> List[List[str]]:
+    """Как в API: без пустых ячеек в конце строк и пустых строк в конце диапазона"""
+    result = []
+    for row in rows:
+        row = list(row)
+        while row and row[-1] == "":
+            row.pop()
+        result.append(row)
+    while result and not result[-1]:
+        result.pop()
+    return result
+
+
+class _Request:
+    """Аналог HttpRequest из googleapiclient: выполняется вызовом execute()"""
+
+    def __init__(self, emulator: "SheetsEmulator", method: str, handler: Callable[[], Dict]):
+        self._emulator = emulator
+        self._method = method
+        self._handler = handler
+
+    def execute(self, http=None, num_retries: int = 0) -> Dict:
+        return self._emulator._execute(self._method, self._handler)
+
+
+class _Values:
+    def __init__(self, emulator: "SheetsEmulator"):
+        self._emulator = emulator
+
+    def get(self, spreadsheetId: str, range: str, majorDimension: str = 'ROWS', **kwargs) -> _Request:
+        return _Request(self._emulator, "values.get", lambda: self._emulator._get(range, majorDimension))
+
+    def batchGet(self, spreadsheetId: str, ranges: List[str], majorDimension: str = 'ROWS', **kwargs) -> _Request:
+        return _Request(self._emulator, "values.batchGet", lambda: {
+            "spreadsheetId": spreadsheetId,
+            "valueRanges": [self._emulator._get(range_name, majorDimension) for range_name in ranges]
+        })
+
+    def update(self, spreadsheetId: str, range: str, body: Dict, **kwargs) -> _Request:
+        return _Request(self._emulator, "values.update", lambda: self._emulator._update(range, body.get('values', [])))
+
+    def append(self, spreadsheetId: str, range: str, body: Dict, **kwargs) -> _Request:
+        return _Request(self._emulator, "values.append", lambda: self._emulator._append(range, body.get('values', [])))
+
+    def clear(self, spreadsheetId: str, range: str, **kwargs) -> _Request:
+        return _Request(self._emulator, "values.clear", lambda: self._emulator._clear(range))
+
+    def batchUpdate(self, spreadsheetId: str, body: Dict, **kwargs) -> _Request:
+        return _Request(self._emulator, "values.batchUpdate", lambda: {
+            "spreadsheetId": spreadsheetId,
+            "responses": [self._emulator._update(item['range'], item.get('values', [])) for item in body.get('data', [])]
+        })
+
+
+class _Spreadsheets:
+    def __init__(self, emulator: "SheetsEmulator"):
+        self._emulator = emulator
+
+    def values(self) -> _Values:
+        return _Values(self._emulator)
+
+    def get(self, spreadsheetId: str, **kwargs) -> _Request:
+        return _Request(self._emulator, "spreadsheets.get", self._emulator._properties)
+
+    def batchUpdate(self, spreadsheetId: str, body: Dict, **kwargs) -> _Request:
+        return _Request(self._emulator, "spreadsheets.batchUpdate", lambda: self._emulator._batch_update(body.get('requests', [])))
+
+
+class SheetsEmulator:
+    """Эмулятор Sheets API v4 в памяти процесса для офлайн-замеров.
+
+    Повторяет используемую часть клиента googleapiclient:
+    spreadsheets().values().get/batchGet/update/append/clear/batchUpdate,
+    spreadsheets().get и spreadsheets().batchUpdate (addSheet, deleteDimension).
+    Задержка каждого запроса - latency ± jitter секунд; сверх quota_per_minute
+    запросов за скользящую минуту и с вероятностью error_rate запрос
+    отклоняется с HttpError 429, как при исчерпании квоты.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        quota_per_minute: int = 0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.quota_per_minute = quota_per_minute
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tabs: Dict[str, List[List[str]]] = {}
+        self._sheet_ids: Dict[str, int] = {}
+        self._recent: Deque[float] = deque()
+        self.requests: Dict[str, int] = {}
+        self.rejected = 0
+        for table in TABLES:
+            self.add_sheet(table.sheet)
+
+    def spreadsheets(self) -> _Spreadsheets:
+        return _Spreadsheets(self)
+
+    def add_sheet(self, title: str) -> None:
+        with self._lock:
+            if title not in self._tabs:
+                self._tabs[title] = []
+                self._sheet_ids[title] = len(self._sheet_ids)
+
+    def load(self, tabs: Dict[str, List[List[str]]]) -> None:
+        """Заполнение листов готовыми данными (например, для замеров)"""
+        for title, rows in tabs.items():
+            self.add_sheet(title)
+            with self._lock:
+                self._tabs[title] = [[str(cell) for cell in row] for row in rows]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "requests": dict(self.requests),
+                "rejected": self.rejected,
+                "rows": {title: len(rows) for title, rows in self._tabs.items()}
+            }
+
+    def _execute(self, method: str, handler: Callable[[], Dict]) -> Dict:
+        delay = max(self.latency + self._random.uniform(-self.jitter, self.jitter), 0.0)
+        if delay:
+            time.sleep(delay)
+        with self._lock:
+            self.requests[method] = self.requests.get(method, 0) + 1
+            now = time.monotonic()
+            while self._recent and self._recent[0] < now - 60:
+                self._recent.popleft()
+            over_quota = self.quota_per_minute and len(self._recent) >= self.quota_per_minute
+            if over_quota or (self.error_rate and self._random.random() < self.error_rate):
+                self.rejected += 1
+                raise self._error(429, "RESOURCE_EXHAUSTED", "Quota exceeded for quota metric 'Requests per minute'")
+            self._recent.append(now)
+            return handler()
+
+    @staticmethod
+    def _error(status: int, reason: str, message: str) -> HttpError:
+        content = json.dumps({"error": {"code": status, "message": message, "status": reason}}).encode()
+        return HttpError(httplib2.Response({"status": status, "reason": reason}), content)
+
+    def _tab(self, range_name: str):
+        sheet, start_col, start_row, end_col, end_row = parse_range(range_name)
+        if sheet not in self._tabs:
+            raise self._error(400, "INVALID_ARGUMENT", f"Unable to parse range: {range_name}")
+        return sheet, self._tabs[sheet], start_col or 0, start_row or 1, end_col, end_row
+
+    def _get(self, range_name: str, major_dimension: str) -> Dict:
+        sheet, rows, start_col, start_row, end_col, end_row = self._tab(range_name)
+        end_row = len(rows) if end_row is None else min(end_row, len(rows))
+        stop = None if end_col is None else end_col + 1
+        values = _trim([row[start_col:stop] for row in rows[start_row - 1:end_row]])
+        if major_dimension == 'COLUMNS':
+            width = max((len(row) for row in values), default=0)
+            values = _trim([[row[i] if i < len(row) else "" for row in values] for i in range(width)])
+        result = {"range": range_name, "majorDimension": major_dimension}
+        if values:
+            result["values"] = values
+        return result
+
+    def _write(self, rows: List[List[str]], start_col: int, start_row: int, values: List[List[Any]]) -> None:
+        for offset, cells in enumerate(values):
+            index = start_row - 1 + offset
+            while len(rows) <= index:
+                rows.append([])
+            row = rows[index]
+            if len(row) < start_col + len(cells):
+                row.extend([""] * (start_col + len(cells) - len(row)))
+            row[start_col:start_col + len(cells)] = ["" if cell is None else str(cell) for cell in cells]
+
+    def _updated_range(self, sheet: str, start_col: int, start_row: int, values: List[List[Any]]) -> str:
+        width = max((len(row) for row in values), default=1)
+        return (
+            f"{_quote(sheet)}!{_column_letters(start_col)}{start_row}:"
+            f"{_column_letters(start_col + width - 1)}{start_row + len(values) - 1}"
+        )
+
+    def _update(self, range_name: str, values: List[List[Any]]) -> Dict:
+        sheet, rows, start_col, start_row, _, _ = self._tab(range_name)
+        self._write(rows, start_col, start_row, values)
+        return {
+            "updatedRange": self._updated_range(sheet, start_col, start_row, values),
+            "updatedRows": len(values),
+            "updatedCells": sum(len(row) for row in values)
+        }
+
+    def _append(self, range_name: str, values: List[List[Any]]) -> Dict:
+        sheet, rows, start_col, _, _, _ = self._tab(range_name)
+        # Новые строки - сразу после последней непустой строки листа
+        last = len(rows)
+        while last and not any(rows[last - 1]):
+            last -= 1
+        self._write(rows, start_col, last + 1, values)
+        return {
+            "tableRange": f"{_quote(sheet)}!A1:{_column_letters(start_col)}{last}" if last else None,
+            "updates": {
+                "updatedRange": self._updated_range(sheet, start_col, last + 1, values),
+                "updatedRows": len(values),
+                "updatedCells": sum(len(row) for row in values)
+            }
+        }
+
+    def _clear(self, range_name: str) -> Dict:
+        sheet, rows, start_col, start_row, end_col, end_row = self._tab(range_name)
+        end_row = len(rows) if end_row is None else min(end_row, len(rows))
+        for row in rows[start_row - 1:end_row]:
+            stop = len(row) if end_col is None else min(end_col + 1, len(row))
+            row[start_col:stop] = [""] * max(stop - start_col, 0)
+        return {"clearedRange": range_name}
+
+    def _properties(self) -> Dict:
+        return {
+            "sheets": [
+                {"properties": {"sheetId": sheet_id, "title": title}}
+                for title, sheet_id in self._sheet_ids.items()
+            ]
+        }
+
+    def _batch_update(self, requests: List[Dict]) -> Dict:
+        replies = []
+        for request in requests:
+            if 'addSheet' in request:
+                title = request['addSheet']['properties']['title']
+                if title not in self._tabs:
+                    self._tabs[title] = []
+                    self._sheet_ids[title] = len(self._sheet_ids)
+                replies.append({"addSheet": {"properties": {"sheetId": self._sheet_ids[title], "title": title}}})
+            elif 'deleteDimension' in request:
+                target = request['deleteDimension']['range']
+                title = next(title for title, sheet_id in self._sheet_ids.items() if sheet_id == target['sheetId'])
+                del self._tabs[title][target['startIndex']:target['endIndex']]
+                replies.append({})
+            else:
+                raise self._error(400, "INVALID_ARGUMENT", f"Unsupported request: {sorted(request)}")
+        return {"replies": replies}
\ No newline at end of file
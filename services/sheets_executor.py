@@ -0,0 +1,133 @@
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from googleapiclient.errors import HttpError
+from services.sheets_scheduler import TokenBucketScheduler, current_lane
+
+# Превышение квоты и временные ошибки сервера; остальные ошибки повторять бессмысленно
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+def _is_retryable(error: HttpError) -> bool:
+    try:
+        return int(error.resp.status) in RETRYABLE_STATUSES
+    except (AttributeError, TypeError, ValueError):
+        return False
+
+class SheetsExecutor:
+    """Выполнение блокирующих запросов googleapiclient в ограниченном пуле потоков.
+
+    Event loop не ждет сеть: запрос уходит в пул, корутина ожидает результат.
+    httplib2 не потокобезопасен, поэтому у каждого потока свое HTTP-соединение.
+    Если задан scheduler, запрос сначала получает у него допуск по квоте.
+    Ответы 429 и 5xx повторяются до max_retries раз с экспоненциальной
+    задержкой со случайным разбросом (full jitter): base * 2^n, не больше cap.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        http_factory: Optional[Callable[[], Any]] = None,
+        scheduler: Optional[TokenBucketScheduler] = None,
+        max_retries: int = 0,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 32.0
+    ):
+        self.max_workers = max_workers
+        self._http_factory = http_factory
+        self.scheduler = scheduler
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sheets")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_duration = 0.0
+
+    async def execute(self, request) -> Dict:
+        """Асинхронный аналог request.execute() с допуском по квоте и повторами"""
+        lane = current_lane()
+        attempt = 0
+        while True:
+            if self.scheduler is not None:
+                await self.scheduler.acquire(lane)
+            try:
+                return await self._submit(request)
+            except HttpError as e:
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    raise
+            finally:
+                if self.scheduler is not None:
+                    self.scheduler.release()
+            attempt += 1
+            with self._lock:
+                self.retries += 1
+            if self.scheduler is not None:
+                self.scheduler.record_retry(lane)
+            await asyncio.sleep(random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt)))
+
+    async def _submit(self, request) -> Dict:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self.queued += 1
+        return await loop.run_in_executor(self._executor, self._run, request, time.monotonic())
+
+    def _run(self, request, enqueued_at: float) -> Dict:
+        started = time.monotonic()
+        wait = started - enqueued_at
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.started += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+        try:
+            http = self._thread_http()
+            result = request.execute(http=http) if http is not None else request.execute()
+            with self._lock:
+                self.completed += 1
+            return result
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.total_duration += time.monotonic() - started
+
+    def _thread_http(self):
+        if self._http_factory is None:
+            return None
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = self._http_factory()
+        return http
+
+    def stats(self) -> Dict:
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "max_workers": self.max_workers,
+                "queue_depth": self.queued,
+                "in_flight": self.running,
+                "completed": self.completed,
+                "failed": self.failed,
+                "retries": self.retries,
+                "avg_wait_ms": 1000 * self.total_wait / self.started if self.started else 0.0,
+                "max_wait_ms": 1000 * self.max_wait,
+                "avg_duration_ms": 1000 * self.total_duration / finished if finished else 0.0
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
\ No newline at end of file
@@ -0,0 +1,162 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Полосы запросов к Sheets в порядке приоритета:
+#   interactive - ход живого интервью, кандидат ждет ответа
+#   default     - обычные запросы API и админки
+#   bulk        - выгрузки, потоковые списки, уплотнение листов
+INTERACTIVE = "interactive"
+DEFAULT = "default"
+BULK = "bulk"
+
+LANE_PRIORITY = {INTERACTIVE: 0, DEFAULT: 1, BULK: 2}
+
+_current_lane: ContextVar[str] = ContextVar("sheets_lane", default=DEFAULT)
+
+def current_lane() -> str:
+    return _current_lane.get()
+
+@contextmanager
+def sheets_lane(lane: str) -> Iterator[None]:
+    """Все запросы к Sheets внутри блока (и в запущенных из него задачах) идут по полосе lane"""
+    if lane not in LANE_PRIORITY:
+        raise ValueError(f"Unknown Sheets lane: {lane}")
+    token = _current_lane.set(lane)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+class _LaneStats:
+    def __init__(self):
+        self.acquired = 0
+        self.waiting = 0
+        self.retries = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def as_dict(self) -> Dict:
+        return {
+            "acquired": self.acquired,
+            "waiting": self.waiting,
+            "retries": self.retries,
+            "avg_wait_ms": 1000 * self.total_wait / self.acquired if self.acquired else 0.0,
+            "max_wait_ms": 1000 * self.max_wait
+        }
+
+
+class TokenBucketScheduler:
+    """Допуск запросов к Sheets по квоте: token bucket и очередь с приоритетами.
+
+    Корзина вмещает burst токенов и пополняется со скоростью rate_per_second;
+    каждый запрос забирает один токен. Одновременно выполняется не больше
+    max_in_flight запросов, чтобы приоритет соблюдался и в пуле потоков.
+    Когда токенов нет, запросы ждут в очереди: сначала interactive, затем
+    default и bulk, внутри полосы - в порядке поступления.
+    rate_per_second <= 0 отключает ограничение скорости.
+    """
+
+    def __init__(self, rate_per_second: float, burst: int, max_in_flight: int):
+        self.rate = rate_per_second
+        self.burst = max(burst, 1)
+        self.max_in_flight = max_in_flight
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._in_flight = 0
+        # (приоритет полосы, порядковый номер, future ожидающего)
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._lanes = {lane: _LaneStats() for lane in LANE_PRIORITY}
+
+    async def acquire(self, lane: str) -> None:
+        """Ждет токен и свободное место; после запроса нужно вызвать release()"""
+        stats = self._lanes[lane]
+        enqueued_at = time.monotonic()
+        if not self._waiters and self._try_take():
+            self._record(stats, 0.0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (LANE_PRIORITY[lane], next(self._sequence), future))
+        stats.waiting += 1
+        try:
+            self._dispatch()
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Место уже выдано, но ожидающий отменен: возвращаем его следующему
+                self.release()
+            raise
+        finally:
+            stats.waiting -= 1
+        self._record(stats, time.monotonic() - enqueued_at)
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._dispatch()
+
+    def record_retry(self, lane: str) -> None:
+        self._lanes[lane].retries += 1
+
+    @staticmethod
+    def _record(stats: _LaneStats, wait: float) -> None:
+        stats.acquired += 1
+        stats.total_wait += wait
+        stats.max_wait = max(stats.max_wait, wait)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _try_take(self) -> bool:
+        if self._in_flight >= self.max_in_flight:
+            return False
+        if self.rate > 0:
+            self._refill()
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+        self._in_flight += 1
+        return True
+
+    def _dispatch(self) -> None:
+        """Выдает места ожидающим по приоритету, пока хватает токенов"""
+        while self._waiters:
+            future = self._waiters[0][2]
+            if future.done():
+                # Ожидающий отменен
+                heapq.heappop(self._waiters)
+                continue
+            if not self._try_take():
+                break
+            heapq.heappop(self._waiters)
+            future.set_result(None)
+
+        if self._waiters and self._in_flight < self.max_in_flight and self._timer is None:
+            # Упираемся в скорость, а не в число запросов: ждем следующий токен
+            delay = max((1 - self._tokens) / self.rate, 0.0)
+            self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    def stats(self) -> Dict:
+        if self.rate > 0:
+            self._refill()
+        return {
+            "rate_per_minute": self.rate * 60,
+            "burst": self.burst,
+            "tokens": round(self._tokens, 2) if self.rate > 0 else None,
+            "in_flight": self._in_flight,
+            "queued": sum(1 for _, _, future in self._waiters if not future.done()),
+            "lanes": {lane: stats.as_dict() for lane, stats in self._lanes.items()}
+        }
\ No newline at end of file
@@ -1,20 +1,402 @@
 import os
-from typing import Dict, List
+import asyncio
+from collections import OrderedDict
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
-from google.oauth2 import service_account
 from datetime import datetime
+from services.sheets_cache import TabCache, column_index, parse_range
+from services.sheets_write_buffer import Target, WriteBuffer, retarget, stale_targets
+from services.compaction_lease import get_compaction_lease
+from services.sheets_executor import SheetsExecutor
+from services.sheets_scheduler import TokenBucketScheduler
+from services.sheets_changelog import APPEND, UPDATE, CLEAR, DELETE_ROWS, Change, ChangeLog
+from services.google_clients import SHEETS_SCOPES, create_http, get_credentials, get_sheets_client, sheets_emulator_enabled
+from services.tables import TableSchema, CANDIDATES, VACANCIES, INTERVIEWS, REPORTS
+from services.codecs import CANDIDATE_CODEC, VACANCY_CODEC, INTERVIEW_CODEC, REPORT_CODEC
+
+def _runs(row_numbers: List[int]) -> List[Tuple[int, int]]:
+    """Группирует номера строк в смежные диапазоны: [2, 3, 4, 7] -> [(2, 4), (7, 7)]"""
+    runs: List[Tuple[int, int]] = []
+    for n in sorted(set(row_numbers)):
+        if runs and n == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], n)
+        else:
+            runs.append((n, n))
+    return runs
 
 class GoogleSheetsService:
     def __init__(self):
-        credentials_path = os.getenv("GOOGLE_SHEETS_CREDENTIALS")
-        self.credentials = service_account.Credentials.from_service_account_file(
-            credentials_path,
-            scopes=['https://www.googleapis.com/auth/spreadsheets']
-        )
-        self.service = build('sheets', 'v4', credentials=self.credentials)
         self.spreadsheet_id = os.getenv("GOOGLE_SHEETS_ID")
+        # Запросы выполняются в отдельном пуле, не блокируя event loop
+        max_workers = int(os.getenv("SHEETS_MAX_CONCURRENCY", "8"))
+        self.executor = SheetsExecutor(
+            max_workers=max_workers,
+            # Эмулятору HTTP-соединение не нужно
+            http_factory=None if sheets_emulator_enabled() else lambda: create_http(get_credentials(SHEETS_SCOPES)),
+            # Квота Sheets API по умолчанию - 60 запросов в минуту на пользователя
+            scheduler=TokenBucketScheduler(
+                rate_per_second=float(os.getenv("SHEETS_RATE_PER_MINUTE", "60")) / 60,
+                burst=int(os.getenv("SHEETS_BURST", "10")),
+                max_in_flight=max_workers
+            ),
+            max_retries=int(os.getenv("SHEETS_MAX_RETRIES", "5")),
+            backoff_base=float(os.getenv("SHEETS_BACKOFF_BASE", "0.5")),
+            backoff_cap=float(os.getenv("SHEETS_BACKOFF_CAP", "32"))
+        )
+        self.cache = TabCache(
+            ttl=float(os.getenv("SHEETS_CACHE_TTL", "30")),
+            max_bytes=int(os.getenv("SHEETS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+        )
+        # Отложенная запись: изменения копятся и отправляются пачками
+        self.write_behind = os.getenv("SHEETS_WRITE_BEHIND", "False").lower() == "true"
+        self.write_batch_size = int(os.getenv("SHEETS_WRITE_BATCH_SIZE", "50"))
+        self.write_flush_interval = float(os.getenv("SHEETS_WRITE_FLUSH_INTERVAL", "2"))
+        self.write_buffer = WriteBuffer()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._sheet_ids: Dict[str, int] = {}
+        # Журнал записей процесса, дошедших до таблицы; из него обновляются кэш и индексы хранилищ
+        self.changelog = ChangeLog(int(os.getenv("SHEETS_CHANGELOG_SIZE", "10000")))
+        # Согласование записей по номерам строк с уплотнением листов в других процессах
+        self.compaction_lease = get_compaction_lease()
+        # Результаты прогрева кэша при старте (services/sheets_warmup.py)
+        self.warmup_stats: Dict = {}
+        
+    @property
+    def service(self):
+        """Клиент Sheets API создается один раз на процесс при первом обращении"""
+        return get_sheets_client()
+        
+    async def _execute(self, request) -> Dict:
+        return await self.executor.execute(request)
+        
+    async def get_values(self, range_name: str) -> List[List[str]]:
+        """Чтение диапазона напрямую из таблицы, минуя кэш"""
+        result = await self._execute(self.service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=range_name
+        ))
+        return result.get('values', [])
+        
+    async def batch_get_values(self, ranges: List[str], major_dimension: str = 'ROWS') -> List[List[List[str]]]:
+        """Чтение нескольких диапазонов одним запросом values.batchGet, минуя кэш"""
+        result = await self._execute(self.service.spreadsheets().values().batchGet(
+            spreadsheetId=self.spreadsheet_id,
+            ranges=ranges,
+            majorDimension=major_dimension
+        ))
+        return [value_range.get('values', []) for value_range in result.get('valueRanges', [])]
+        
+    async def refresh_tabs(self, tables: List[TableSchema]) -> Dict[str, List[List[str]]]:
+        """Чтение листов одним запросом values.batchGet с заменой их содержимого в кэше.
+
+        Возвращает прочитанные листы; лист, изменившийся за время запроса,
+        не возвращается и сбрасывается из кэша.
+        """
+        generations = {table.sheet: self.cache.generation(table.sheet) for table in tables}
+        chunks = await self.batch_get_values([table.full_range for table in tables])
+        tabs = {}
+        for table, values in zip(tables, chunks):
+            if self.cache.generation(table.sheet) != generations[table.sheet]:
+                self.cache.invalidate(table.sheet)
+                continue
+            self.cache.put(table.sheet, column_index(table.last_column) + 1, values, generations[table.sheet])
+            tabs[table.sheet] = values
+        return tabs
+        
+    async def read_tab(self, sheet: str, last_column: str) -> List[List[str]]:
+        """Чтение листа целиком (колонки A:last_column) через кэш.
+        
+        Отложенные записи накладываются поверх прочитанного. Возвращаемый
+        список может принадлежать кэшу и не должен изменяться.
+        """
+        width = column_index(last_column) + 1
+        values = self.cache.get(sheet, width)
+        if values is None:
+            generation = self.cache.generation(sheet)
+            values = await self.get_values(f"{sheet}!A:{last_column}")
+            self.cache.put(sheet, width, values, generation)
+        values = self.write_buffer.overlay(sheet, values)
+        pending_rows = self.write_buffer.pending_rows(sheet)
+        if pending_rows:
+            values = list(values) + [row[:width] for row in pending_rows]
+        return values
+        
+    async def read_row(self, sheet: str, row_number: int, last_column: str) -> List[str]:
+        """Чтение одной строки: из кэша, если лист закэширован, иначе диапазоном A{i}:{last}{i}"""
+        values = self.cache.get(sheet, column_index(last_column) + 1)
+        if values is None:
+            values = await self.get_values(f"{sheet}!A{row_number}:{last_column}{row_number}")
+            row = values[0] if values else []
+        else:
+            row = values[row_number - 1] if row_number <= len(values) else []
+        return self.write_buffer.overlay(sheet, [row], row_number, row_number)[0]
+        
+    async def read_rows(self, sheet: str, first_row: int, last_row: int, last_column: str) -> List[List[str]]:
+        """Чтение строк first_row..last_row: из кэша или ограниченным диапазоном A{first}:{last}{last_row}.
+
+        Пустые строки внутри диапазона возвращаются как [], строки после
+        последней заполненной не возвращаются.
+        """
+        values = self.cache.get(sheet, column_index(last_column) + 1)
+        if values is None:
+            values = await self.get_values(f"{sheet}!A{first_row}:{last_column}{last_row}")
+        else:
+            values = values[first_row - 1:last_row]
+        return self.write_buffer.overlay(sheet, values, first_row, last_row)
+        
+    async def read_rows_at(self, sheet: str, row_numbers: List[int], last_column: str) -> Dict[int, List[str]]:
+        """Чтение произвольного набора строк: из кэша или одним batchGet, смежные строки - одним диапазоном"""
+        if not row_numbers:
+            return {}
+        row_numbers = sorted(set(row_numbers))
+        values = self.cache.get(sheet, column_index(last_column) + 1)
+        if values is not None:
+            rows = {n: values[n - 1] if n <= len(values) else [] for n in row_numbers}
+        else:
+            runs = _runs(row_numbers)
+            chunks = await self.batch_get_values([f"{sheet}!A{first}:{last_column}{last}" for first, last in runs])
+            rows = {}
+            for (first, last), chunk in zip(runs, chunks):
+                for n in range(first, last + 1):
+                    rows[n] = chunk[n - first] if n - first < len(chunk) else []
+        return {
+            n: self.write_buffer.overlay(sheet, [row], n, n)[0]
+            for n, row in rows.items()
+        }
+        
+    async def read_columns(self, sheet: str, columns: List[int]) -> List[List[str]]:
+        """Чтение отдельных колонок листа (номера с нуля) одним batchGet.
+
+        Возвращает строки листа, включая заголовок, в которых оставлены
+        только запрошенные колонки в порядке columns.
+        """
+        width = max(columns) + 1
+        values = self.cache.get(sheet, width)
+        if values is None:
+            letters = [chr(ord('A') + column) for column in columns]
+            fetched = await self.batch_get_values([f"{sheet}!{letter}:{letter}" for letter in letters], 'COLUMNS')
+            cells = [chunk[0] if chunk else [] for chunk in fetched]
+            # Собираем строки полной ширины, чтобы наложить отложенные записи
+            values = [[""] * width for _ in range(max((len(column) for column in cells), default=0))]
+            for column, column_cells in zip(columns, cells):
+                for row, cell in zip(values, column_cells):
+                    row[column] = cell
+        values = self.write_buffer.overlay(sheet, values)
+        return [
+            [row[column] if column < len(row) else "" for column in columns]
+            for row in values
+        ]
+        
+    async def read_ids(self, sheet: str) -> List[str]:
+        """Чтение только колонки ID (A) листа, включая заголовок"""
+        values = self.cache.get(sheet, 1)
+        if values is None:
+            values = await self.get_values(f"{sheet}!A:A")
+        values = self.write_buffer.overlay(sheet, values)
+        return [row[0] if row else "" for row in values]
+        
+    async def read_id_at(self, sheet: str, row_number: int) -> str:
+        """ID в строке row_number напрямую из таблицы (одна ячейка A{i}), минуя кэш.
+        
+        Нужен перед записью по номеру строки: закэшированный лист мог не
+        увидеть сдвиг строк, сделанный другим процессом.
+        """
+        values = await self.get_values(f"{sheet}!A{row_number}")
+        row = self.write_buffer.overlay(sheet, [values[0] if values else []], row_number, row_number)[0]
+        return row[0] if row else ""
+        
+    async def append_values(self, range_name: str, rows: List[List[str]]) -> Dict:
+        """Добавление строк в конец листа"""
+        if self.write_behind:
+            self.write_buffer.add_append(range_name, rows)
+            await self._after_buffered_write()
+            return {}
+        return await self._append_now(range_name, rows)
+        
+    async def update_values(self, range_name: str, rows: List[List[str]], target: Optional[Target] = None) -> Dict:
+        """Перезапись значений диапазона.
+        
+        target - ID записи в строке и номер уплотнения из row_write: по ним
+        отложенная перезапись переносится на новую строку, если до сброса
+        буфера лист уплотнили.
+        """
+        if self.write_behind:
+            self.write_buffer.add_update(range_name, rows, target)
+            await self._after_buffered_write()
+            return {}
+            
+        result = await self._execute(self.service.spreadsheets().values().update(
+            spreadsheetId=self.spreadsheet_id,
+            range=range_name,
+            valueInputOption='RAW',
+            body={'values': rows}
+        ))
+        self._record(parse_range(range_name)[0], UPDATE, range_name, rows)
+        return result
+        
+    async def clear_values(self, range_name: str, target: Optional[Target] = None) -> Dict:
+        """Очистка диапазона"""
+        _, start_col, start_row, end_col, end_row = parse_range(range_name)
+        if self.write_behind and None not in (start_row, end_row, end_col):
+            # Очистка ограниченного диапазона - это запись пустых значений
+            blank = [""] * (end_col - (start_col or 0) + 1)
+            return await self.update_values(range_name, [list(blank) for _ in range(start_row, end_row + 1)], target)
+            
+        result = await self._execute(self.service.spreadsheets().values().clear(
+            spreadsheetId=self.spreadsheet_id,
+            range=range_name
+        ))
+        self._record(parse_range(range_name)[0], CLEAR, range_name)
+        return result
+        
+    def _record(self, sheet: str, kind: str, range_name: str, rows: Optional[List[List[str]]] = None,
+                row_numbers: Optional[List[int]] = None) -> None:
+        """Запись дошла до таблицы: изменение попадает в журнал, а из журнала - в кэш листа"""
+        self.cache.apply_change(self.changelog.record(sheet, kind, range_name, rows, row_numbers))
+        
+    def changes_since(self, version: int, sheet: Optional[str] = None) -> Tuple[List[Change], int]:
+        """Записи этого процесса в таблицу после версии version и текущая версия журнала.
+        
+        Для APPEND диапазон - фактический updatedRange (если API его вернул).
+        Если версия уже вытеснена из журнала, бросается ChangesUnavailable.
+        Записи других процессов в журнал не попадают.
+        """
+        return self.changelog.changes_since(version, sheet)
+        
+    async def _get_sheet_id(self, sheet: str) -> int:
+        if sheet not in self._sheet_ids:
+            result = await self._execute(self.service.spreadsheets().get(
+                spreadsheetId=self.spreadsheet_id,
+                fields='sheets.properties(sheetId,title)'
+            ))
+            self._sheet_ids = {
+                item['properties']['title']: item['properties']['sheetId']
+                for item in result.get('sheets', [])
+            }
+        return self._sheet_ids[sheet]
+        
+    async def delete_rows(self, sheet: str, row_numbers: List[int]) -> None:
+        """Физическое удаление строк листа одним batchUpdate с deleteDimension.
+        
+        Строки ниже удаленных сдвигаются вверх, поэтому отложенные записи
+        (адресованные номерами строк) сначала отправляются в таблицу, а
+        записи по номерам строк во всех процессах на время удаления
+        приостанавливаются. После удаления номер уплотнения листа растет.
+        """
+        if not row_numbers:
+            return
+        await self.flush()
+        async with self.compaction_lease.compacting(sheet):
+            await self._delete_rows(sheet, row_numbers)
+            await self.compaction_lease.mark_compacted(sheet)
+            
+    async def _delete_rows(self, sheet: str, row_numbers: List[int]) -> None:
+        sheet_id = await self._get_sheet_id(sheet)
+        # Снизу вверх: удаление не сдвигает еще не удаленные диапазоны
+        requests = [
+            {
+                'deleteDimension': {
+                    'range': {
+                        'sheetId': sheet_id,
+                        'dimension': 'ROWS',
+                        'startIndex': first - 1,
+                        'endIndex': last
+                    }
+                }
+            }
+            for first, last in reversed(_runs(row_numbers))
+        ]
+        try:
+            await self._execute(self.service.spreadsheets().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={'requests': requests}
+            ))
+        finally:
+            self.cache.invalidate(sheet)
+        self._record(sheet, DELETE_ROWS, f"{sheet}!A:A", row_numbers=sorted(set(row_numbers)))
+        
+    @asynccontextmanager
+    async def row_write(self, sheet: str) -> AsyncIterator[int]:
+        """Запись по номерам строк листа: пока блок выполняется, другие процессы лист не уплотняют.
+        
+        Возвращает номер уплотнения листа. Отложенные перезаписи, адресованные
+        до уплотнения, сразу переносятся на новые номера строк.
+        """
+        async with self.compaction_lease.row_write(sheet) as epoch:
+            if stale_targets(self.write_buffer.targets, sheet, epoch):
+                row_numbers = await self._current_row_numbers(sheet)
+                self.write_buffer.retarget(sheet, epoch, row_numbers)
+            yield epoch
+            
+    async def _current_row_numbers(self, sheet: str) -> Dict[str, int]:
+        """ID -> номер строки по колонке ID из таблицы, минуя кэш"""
+        values = await self.get_values(f"{sheet}!A:A")
+        return {row[0]: n for n, row in enumerate(values, start=1) if row and row[0]}
+        
+    async def flush(self) -> None:
+        """Отправка отложенных записей: перезаписи одним batchUpdate, добавления - одним append на лист"""
+        updates, appends, targets = self.write_buffer.drain()
+        try:
+            if updates:
+                # Перезаписи адресованы номерами строк: на время отправки листы не уплотняются,
+                # а перезаписи, номера строк которых устарели, переносятся
+                async with AsyncExitStack() as stack:
+                    for sheet in sorted({parse_range(range_name)[0] for range_name in updates}):
+                        epoch = await stack.enter_async_context(self.compaction_lease.row_write(sheet))
+                        if stale_targets(targets, sheet, epoch):
+                            updates = retarget(updates, targets, sheet, epoch, await self._current_row_numbers(sheet))
+                    if updates:
+                        await self._execute(self.service.spreadsheets().values().batchUpdate(
+                            spreadsheetId=self.spreadsheet_id,
+                            body={
+                                'valueInputOption': 'RAW',
+                                'data': [{'range': range_name, 'values': rows} for range_name, rows in updates.items()]
+                            }
+                        ))
+                        for range_name, rows in updates.items():
+                            self._record(parse_range(range_name)[0], UPDATE, range_name, rows)
+                updates, targets = OrderedDict(), {}
+                
+            for sheet in list(appends):
+                pending = appends[sheet]
+                if pending["rows"]:
+                    await self._append_now(pending["range"], pending["rows"])
+                del appends[sheet]
+        except Exception:
+            self.write_buffer.restore(updates, appends, targets)
+            raise
+            
+    async def _append_now(self, range_name: str, rows: List[List[str]]) -> Dict:
+        result = await self._execute(self.service.spreadsheets().values().append(
+            spreadsheetId=self.spreadsheet_id,
+            range=range_name,
+            valueInputOption='RAW',
+            insertDataOption='INSERT_ROWS',
+            body={'values': rows}
+        ))
+        
+        sheet = parse_range(range_name)[0]
+        updated_range = result.get('updates', {}).get('updatedRange')
+        self._record(sheet, APPEND, updated_range or range_name, rows)
+        return result
         
+    async def _after_buffered_write(self) -> None:
+        if len(self.write_buffer) >= self.write_batch_size:
+            await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+            
+    async def _flush_later(self) -> None:
+        while True:
+            await asyncio.sleep(self.write_flush_interval)
+            try:
+                await self.flush()
+                return
+            except Exception as e:
+                # Записи вернулись в буфер, повторим через интервал
+                print(f"Error flushing sheet writes: {str(e)}")
+            
     async def initialize_sheets(self):
         """Инициализация структуры таблицы"""
         sheets = [
@@ -49,10 +431,11 @@ class GoogleSheetsService:
             "requests": [{"addSheet": sheet} for sheet in sheets]
         }
         
-        self.service.spreadsheets().batchUpdate(
+        await self._execute(self.service.spreadsheets().batchUpdate(
             spreadsheetId=self.spreadsheet_id,
             body=body
-        ).execute()
+        ))
+        self.cache.invalidate()
         
         # Инициализация заголовков для каждого листа
         await self._initialize_headers()
@@ -79,152 +462,47 @@ class GoogleSheetsService:
         
         for sheet_name, header in headers.items():
             range_name = f"{sheet_name}!A1"
-            body = {
-                "values": header
-            }
-            self.service.spreadsheets().values().update(
-                spreadsheetId=self.spreadsheet_id,
-                range=range_name,
-                valueInputOption='RAW',
-                body=body
-            ).execute()
+            await self.update_values(range_name, header)
             
     async def add_vacancy(self, vacancy_data: Dict) -> str:
         """Добавление новой вакансии"""
-        values = [[
-            vacancy_data["id"],
-            vacancy_data["title"],
-            vacancy_data["level"],
-            ",".join(vacancy_data["hard_skills"]),
-            ",".join(vacancy_data["soft_skills"]),
-            ",".join(vacancy_data["tasks"]),
-            ",".join(vacancy_data["tools"]),
-            datetime.now().isoformat(),
-            datetime.now().isoformat()
-        ]]
-        
-        body = {
-            "values": values
-        }
-        
-        self.service.spreadsheets().values().append(
-            spreadsheetId=self.spreadsheet_id,
-            range='Вакансии!A:I',
-            valueInputOption='RAW',
-            insertDataOption='INSERT_ROWS',
-            body=body
-        ).execute()
-        
+        row = VACANCY_CODEC.encode({"created_at": datetime.now(), **vacancy_data})
+        await self.append_values(VACANCIES.full_range, [row])
         return vacancy_data["id"]
         
     async def add_candidate(self, candidate_data: Dict) -> str:
         """Добавление нового кандидата"""
-        values = [[
-            candidate_data["id"],
-            candidate_data["name"],
-            candidate_data["email"],
-            candidate_data["phone"],
-            candidate_data["gender"],
-            datetime.now().isoformat()
-        ]]
-        
-        body = {
-            "values": values
-        }
-        
-        self.service.spreadsheets().values().append(
-            spreadsheetId=self.spreadsheet_id,
-            range='Кандидаты!A:F',
-            valueInputOption='RAW',
-            insertDataOption='INSERT_ROWS',
-            body=body
-        ).execute()
-        
+        row = CANDIDATE_CODEC.encode({"created_at": datetime.now(), **candidate_data})
+        await self.append_values(CANDIDATES.full_range, [row])
         return candidate_data["id"]
         
     async def save_interview(self, interview_data: Dict) -> str:
         """Сохранение данных интервью"""
-        values = [[
-            interview_data["id"],
-            interview_data["candidate_id"],
-            interview_data["vacancy_id"],
-            interview_data["status"],
-            interview_data["start_time"],
-            interview_data["end_time"],
-            interview_data["recording_url"],
-            interview_data["transcript"],
-            ",".join(interview_data["questions"]),
-            ",".join(interview_data["answers"]),
-            ",".join(interview_data["emotions_analysis"])
-        ]]
-        
-        body = {
-            "values": values
-        }
-        
-        self.service.spreadsheets().values().append(
-            spreadsheetId=self.spreadsheet_id,
-            range='Интервью!A:K',
-            valueInputOption='RAW',
-            insertDataOption='INSERT_ROWS',
-            body=body
-        ).execute()
-        
+        await self.append_values(INTERVIEWS.full_range, [INTERVIEW_CODEC.encode(interview_data)])
         return interview_data["id"]
         
     async def save_report(self, report_data: Dict) -> str:
         """Сохранение отчета об интервью"""
-        values = [[
-            report_data["id"],
-            report_data["interview_id"],
-            str(report_data["hard_skills_assessment"]),
-            str(report_data["soft_skills_assessment"]),
-            str(report_data["emotions_analysis"]),
-            str(report_data["verdict"]),
-            report_data["feedback"],
-            datetime.now().isoformat()
-        ]]
-        
-        body = {
-            "values": values
-        }
-        
-        self.service.spreadsheets().values().append(
-            spreadsheetId=self.spreadsheet_id,
-            range='Отчеты!A:H',
-            valueInputOption='RAW',
-            insertDataOption='INSERT_ROWS',
-            body=body
-        ).execute()
-        
+        row = REPORT_CODEC.encode({"created_at": datetime.now(), **report_data})
+        await self.append_values(REPORTS.full_range, [row])
         return report_data["id"]
         
     async def get_vacancies(self) -> List[Dict]:
         """Получение списка вакансий"""
-        result = self.service.spreadsheets().values().get(
-            spreadsheetId=self.spreadsheet_id,
-            range='Вакансии!A:I'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values:
-            return []
-            
-        headers = values[0]
-        vacancies = []
-        
-        for row in values[1:]:
-            vacancy = {
-                "id": row[0],
-                "title": row[1],
-                "level": row[2],
-                "hard_skills": row[3].split(","),
-                "soft_skills": row[4].split(","),
-                "tasks": row[5].split(","),
-                "tools": row[6].split(","),
-                "created_at": row[7],
-                "updated_at": row[8]
-            }
-            vacancies.append(vacancy)
-            
-        return vacancies 
\ No newline at end of file
+        values = await self.read_tab(VACANCIES.sheet, VACANCIES.last_column)
+        return VACANCY_CODEC.decode_rows([row for row in values[1:] if row])
+
+
+_sheets_service: Optional[GoogleSheetsService] = None
+
+def get_sheets_service() -> GoogleSheetsService:
+    """Общий для процесса экземпляр сервиса (кэш листов должен быть единым)"""
+    global _sheets_service
+    if _sheets_service is None:
+        _sheets_service = GoogleSheetsService()
+    return _sheets_service
+
+async def flush_sheets_service() -> None:
+    """Сброс отложенных записей при остановке приложения"""
+    if _sheets_service is not None:
+        await _sheets_service.flush()
\ No newline at end of file
@@ -0,0 +1,121 @@
+import os
+import json
+import time
+import asyncio
+from typing import Dict, List, Optional
+from services.repository import get_repository
+from services.sheets_cache import column_index
+from services.sheets_service import GoogleSheetsService, get_sheets_service
+from services.sheets_scheduler import BULK, sheets_lane
+from services.tables import TABLES
+
+SNAPSHOT_VERSION = 1
+
+def load_snapshot(path: str, spreadsheet_id: Optional[str]) -> Optional[Dict]:
+    """Снимок листов с прошлого запуска; None, если файла нет или он от другой таблицы"""
+    try:
+        with open(path, encoding="utf-8") as snapshot_file:
+            snapshot = json.load(snapshot_file)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Error reading sheets snapshot {path}: {str(e)}")
+        return None
+    if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("spreadsheet_id") != spreadsheet_id:
+        return None
+    return snapshot
+
+def save_snapshot(path: str, spreadsheet_id: Optional[str], tabs: Dict[str, List[List[str]]]) -> None:
+    """Атомарная запись снимка: сначала во временный файл, затем замена"""
+    temporary = f"{path}.tmp"
+    # В снимке персональные данные и хэши паролей: файл доступен только владельцу
+    descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(descriptor, "w", encoding="utf-8") as snapshot_file:
+        json.dump({
+            "version": SNAPSHOT_VERSION,
+            "spreadsheet_id": spreadsheet_id,
+            "saved_at": time.time(),
+            "tabs": tabs
+        }, snapshot_file, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temporary, path)
+
+async def refresh_all(sheets_service: GoogleSheetsService, snapshot_path: str = "") -> Dict:
+    """Все листы одним batchGet в кэш, затем индексы хранилищ и снимок на диск"""
+    started = time.monotonic()
+    tabs = await sheets_service.refresh_tabs(TABLES)
+    batch_get_ms = 1000 * (time.monotonic() - started)
+    for table in TABLES:
+        if table.sheet in tabs:
+            await get_repository(table).warm_up()
+    if snapshot_path and len(tabs) == len(TABLES):
+        await asyncio.get_running_loop().run_in_executor(
+            None, save_snapshot, snapshot_path, sheets_service.spreadsheet_id, tabs
+        )
+    return {
+        "batch_get_ms": batch_get_ms,
+        "refresh_ms": 1000 * (time.monotonic() - started),
+        "rows": sum(len(values) for values in tabs.values())
+    }
+
+async def _refresh(sheets_service: GoogleSheetsService, snapshot_path: str) -> bool:
+    stats = sheets_service.warmup_stats
+    try:
+        stats.update(await refresh_all(sheets_service, snapshot_path))
+    except Exception as e:
+        stats["error"] = str(e)
+        print(f"Error refreshing sheets cache: {str(e)}")
+        return False
+    stats.pop("error", None)
+    stats["refreshes"] = stats.get("refreshes", 0) + 1
+    return True
+
+async def _refresh_after_snapshot(sheets_service: GoogleSheetsService, snapshot_path: str, started: float) -> None:
+    if await _refresh(sheets_service, snapshot_path):
+        sheets_service.warmup_stats["fresh_after_ms"] = 1000 * (time.monotonic() - started)
+
+async def warm_up(snapshot_path: str = "") -> Dict:
+    """Прогрев кэша листов при старте приложения.
+
+    Если есть снимок с прошлого запуска, листы загружаются из него и чтения
+    сразу обслуживаются из памяти, а свежие данные подтягиваются одним
+    batchGet в фоне. Без снимка старт дожидается batchGet. Время до
+    готовности кэша (ready_ms) и до свежих данных (fresh_after_ms)
+    попадает в метрики хранилища.
+    """
+    sheets_service = get_sheets_service()
+    stats = sheets_service.warmup_stats
+    started = time.monotonic()
+    if not sheets_service.cache.enabled:
+        stats["source"] = "disabled"
+        return stats
+
+    snapshot = await asyncio.get_running_loop().run_in_executor(
+        None, load_snapshot, snapshot_path, sheets_service.spreadsheet_id
+    ) if snapshot_path else None
+    if snapshot is not None:
+        tabs = snapshot["tabs"]
+        for table in TABLES:
+            if table.sheet in tabs:
+                sheets_service.cache.put(table.sheet, column_index(table.last_column) + 1, tabs[table.sheet])
+                await get_repository(table).warm_up()
+        stats.update({
+            "source": "snapshot",
+            "snapshot_age_s": time.time() - snapshot["saved_at"],
+            "snapshot_rows": sum(len(values) for values in tabs.values()),
+            "ready_ms": 1000 * (time.monotonic() - started)
+        })
+        asyncio.create_task(_refresh_after_snapshot(sheets_service, snapshot_path, started))
+        return stats
+
+    stats["source"] = "batch_get"
+    if await _refresh(sheets_service, snapshot_path):
+        stats["ready_ms"] = stats["fresh_after_ms"] = 1000 * (time.monotonic() - started)
+    return stats
+
+async def run_refresh_schedule(interval: float, snapshot_path: str = "") -> None:
+    """Фоновое обновление кэша всех листов раз в interval секунд"""
+    sheets_service = get_sheets_service()
+    while True:
+        await asyncio.sleep(interval)
+        with sheets_lane(BULK):
+            await _refresh(sheets_service, snapshot_path)
\ No newline at end of file
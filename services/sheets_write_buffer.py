@@ -0,0 +1,146 @@
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from services.sheets_cache import parse_range
+
+# Адресат перезаписи строки: ID записи и номер уплотнения листа, при котором найден номер строки
+Target = Tuple[str, int]
+
+def stale_targets(targets: Dict[str, Target], sheet: str, epoch: int) -> bool:
+    """Есть ли перезаписи листа, адресованные номерами строк до уплотнения epoch"""
+    return any(parse_range(range_name)[0] == sheet and target[1] != epoch for range_name, target in targets.items())
+
+def retarget(updates: "OrderedDict[str, List[List[str]]]", targets: Dict[str, Target], sheet: str, epoch: int,
+             row_numbers: Dict[str, int]) -> "OrderedDict[str, List[List[str]]]":
+    """Переносит перезаписи листа на текущие номера строк их записей (row_numbers: ID -> строка).
+
+    Перезаписи удаленных записей отбрасываются; targets обновляется на месте.
+    """
+    moved: "OrderedDict[str, List[List[str]]]" = OrderedDict()
+    for range_name, rows in updates.items():
+        target = targets.pop(range_name, None)
+        if target is not None and parse_range(range_name)[0] == sheet:
+            record_id = target[0]
+            if record_id not in row_numbers:
+                continue
+            target_sheet, _, cells = range_name.rpartition('!')
+            range_name = f"{target_sheet}!{re.sub(r'[0-9]+', str(row_numbers[record_id]), cells)}"
+            target = (record_id, epoch)
+        moved.pop(range_name, None)
+        moved[range_name] = rows
+        if target is not None:
+            targets[range_name] = target
+        else:
+            targets.pop(range_name, None)
+    return moved
+
+class WriteBuffer:
+    """Отложенные записи в таблицу (write-behind).
+
+    Добавления копятся по листам и уходят одним append на лист, перезаписи
+    диапазонов - одним values.batchUpdate. Повторная запись в тот же диапазон
+    заменяет предыдущую, а правка еще не записанной строки меняет ее в буфере.
+    """
+
+    def __init__(self):
+        # лист -> {"range": диапазон для append, "rows": строки}
+        self.appends: Dict[str, Dict] = {}
+        # диапазон -> значения; порядок соответствует порядку записей
+        self.updates: "OrderedDict[str, List[List[str]]]" = OrderedDict()
+        # диапазон -> адресат перезаписи строки хранилища: номер строки может устареть до сброса
+        self.targets: Dict[str, Target] = {}
+
+    def __len__(self) -> int:
+        return sum(len(pending["rows"]) for pending in self.appends.values()) + len(self.updates)
+
+    def add_append(self, range_name: str, rows: List[List[str]]) -> None:
+        sheet = parse_range(range_name)[0]
+        pending = self.appends.setdefault(sheet, {"range": range_name, "rows": []})
+        pending["rows"].extend(list(row) for row in rows)
+
+    def add_update(self, range_name: str, rows: List[List[str]], target: Optional[Target] = None) -> None:
+        self.updates.pop(range_name, None)
+        self.updates[range_name] = rows
+        if target is not None:
+            self.targets[range_name] = target
+        else:
+            self.targets.pop(range_name, None)
+
+    def retarget(self, sheet: str, epoch: int, row_numbers: Dict[str, int]) -> None:
+        self.updates = retarget(self.updates, self.targets, sheet, epoch, row_numbers)
+
+    def pending_rows(self, sheet: str) -> List[List[str]]:
+        return self.appends.get(sheet, {}).get("rows", [])
+
+    def find_pending_row(self, sheet: str, record_id: str) -> Optional[List[str]]:
+        for row in self.pending_rows(sheet):
+            if row and row[0] == record_id:
+                return row
+        return None
+
+    def patch_pending_row(self, sheet: str, record_id: str, cells: List[str], start_column: int = 0) -> bool:
+        row = self.find_pending_row(sheet, record_id)
+        if row is None:
+            return False
+        if len(row) < start_column + len(cells):
+            row.extend([""] * (start_column + len(cells) - len(row)))
+        row[start_column:start_column + len(cells)] = cells
+        return True
+
+    def discard_pending_row(self, sheet: str, record_id: str) -> bool:
+        rows = self.pending_rows(sheet)
+        for i, row in enumerate(rows):
+            if row and row[0] == record_id:
+                del rows[i]
+                return True
+        return False
+
+    def overlay(self, sheet: str, values: List[List[str]], first_row: int = 1, last_row: Optional[int] = None) -> List[List[str]]:
+        """Накладывает отложенные перезаписи на прочитанные строки first_row..last_row"""
+        pending = []
+        for range_name, rows in self.updates.items():
+            target, start_column, start_row, _, _ = parse_range(range_name)
+            if target == sheet and start_row is not None:
+                pending.append((start_column or 0, start_row, rows))
+        if not pending:
+            return values
+
+        values = list(values)
+        for start_column, start_row, rows in pending:
+            for offset, cells in enumerate(rows):
+                row_number = start_row + offset
+                if row_number < first_row or (last_row is not None and row_number > last_row):
+                    continue
+                index = row_number - first_row
+                while len(values) <= index:
+                    values.append([])
+                row = list(values[index])
+                if len(row) < start_column + len(cells):
+                    row.extend([""] * (start_column + len(cells) - len(row)))
+                row[start_column:start_column + len(cells)] = [str(cell) for cell in cells]
+                while row and row[-1] == "":
+                    row.pop()
+                values[index] = row
+        return values
+
+    def drain(self) -> Tuple["OrderedDict[str, List[List[str]]]", Dict[str, Dict], Dict[str, Target]]:
+        updates, appends, targets = self.updates, self.appends, self.targets
+        self.updates, self.appends, self.targets = OrderedDict(), {}, {}
+        return updates, appends, targets
+
+    def restore(self, updates: "OrderedDict[str, List[List[str]]]", appends: Dict[str, Dict],
+                targets: Dict[str, Target]) -> None:
+        """Возвращает в буфер записи, которые не удалось отправить"""
+        for range_name, rows in self.updates.items():
+            updates.pop(range_name, None)
+            updates[range_name] = rows
+            if range_name in self.targets:
+                targets[range_name] = self.targets[range_name]
+            else:
+                targets.pop(range_name, None)
+        for sheet, pending in self.appends.items():
+            if sheet in appends:
+                appends[sheet]["rows"].extend(pending["rows"])
+            else:
+                appends[sheet] = pending
+        self.updates, self.appends, self.targets = updates, appends, targets
\ No newline at end of file
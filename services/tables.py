@@ -0,0 +1,115 @@
+from typing import List, Optional, Tuple
+
+class TableSchema:
+    """Описание листа таблицы: название, колонки и индексируемые поля"""
+
+    def __init__(
+        self,
+        name: str,
+        sheet: str,
+        columns: List[str],
+        headers: List[str],
+        indexes: Optional[List[str]] = None,
+        composite_indexes: Optional[List[Tuple[str, ...]]] = None
+    ):
+        self.name = name
+        self.sheet = sheet
+        self.columns = columns
+        self.headers = headers
+        self.indexes = indexes or []
+        # Составные индексы по колонкам из indexes: поиск и подсчет по сочетанию значений
+        self.composite_indexes = composite_indexes or []
+
+    @property
+    def last_column(self) -> str:
+        return self.column_letter(self.columns[-1])
+
+    @property
+    def full_range(self) -> str:
+        return f"{self.sheet}!A:{self.last_column}"
+
+    @property
+    def id_range(self) -> str:
+        return f"{self.sheet}!A:A"
+
+    def column_letter(self, column: str) -> str:
+        return chr(ord('A') + self.columns.index(column))
+
+    def row_range(self, row_number: int) -> str:
+        return f"{self.sheet}!A{row_number}:{self.last_column}{row_number}"
+
+    def cell_range(self, column: str, row_number: int) -> str:
+        return f"{self.sheet}!{self.column_letter(column)}{row_number}"
+
+    def normalize(self, row: List[str]) -> List[str]:
+        """Дополняет строку пустыми ячейками до числа колонок листа"""
+        row = list(row[:len(self.columns)])
+        return row + [""] * (len(self.columns) - len(row))
+
+
+CANDIDATES = TableSchema(
+    name="candidates",
+    sheet="Кандидаты",
+    columns=["id", "name", "email", "phone", "gender", "created_at"],
+    headers=["ID", "Имя", "Email", "Телефон", "Пол", "Дата создания"],
+    indexes=["email", "created_at"]
+)
+
+VACANCIES = TableSchema(
+    name="vacancies",
+    sheet="Вакансии",
+    columns=["id", "title", "level", "hard_skills", "soft_skills", "tasks", "tools", "created_at"],
+    headers=["ID", "Название", "Уровень", "Hard Skills", "Soft Skills", "Задачи", "Инструменты", "Дата создания"],
+    indexes=["level", "created_at"]
+)
+
+INTERVIEWS = TableSchema(
+    name="interviews",
+    sheet="Интервью",
+    columns=[
+        "id", "candidate_id", "vacancy_id", "status",
+        "start_time", "end_time", "recording_url",
+        "transcript", "questions", "answers", "emotions_analysis"
+    ],
+    headers=[
+        "ID", "ID кандидата", "ID вакансии", "Статус",
+        "Время начала", "Время окончания", "URL записи",
+        "Транскрипт", "Вопросы", "Ответы", "Анализ эмоций"
+    ],
+    indexes=["candidate_id", "vacancy_id", "status", "start_time"]
+)
+
+REPORTS = TableSchema(
+    name="reports",
+    sheet="Отчеты",
+    columns=[
+        "id", "interview_id", "candidate_id", "vacancy_id",
+        "hard_skills_assessment", "soft_skills_assessment", "emotions_analysis",
+        "verdict", "created_at", "status"
+    ],
+    headers=[
+        "ID", "ID интервью", "ID кандидата", "ID вакансии",
+        "Оценка hard skills", "Оценка soft skills", "Анализ эмоций",
+        "Вердикт", "Дата создания", "Статус"
+    ],
+    indexes=["interview_id", "status"]
+)
+
+NOTIFICATIONS = TableSchema(
+    name="notifications",
+    sheet="Уведомления",
+    columns=["id", "hr_manager_id", "type", "text", "link", "created_at", "status"],
+    headers=["ID", "ID HR-менеджера", "Тип", "Текст", "Ссылка", "Дата создания", "Статус"],
+    indexes=["hr_manager_id", "status"],
+    composite_indexes=[("hr_manager_id", "status")]
+)
+
+HR_MANAGERS = TableSchema(
+    name="hr_managers",
+    sheet="HR-менеджеры",
+    columns=["id", "name", "email", "hashed_password", "created_at"],
+    headers=["ID", "Имя", "Email", "Пароль", "Дата создания"],
+    indexes=["email"]
+)
+
+TABLES = [CANDIDATES, VACANCIES, INTERVIEWS, REPORTS, NOTIFICATIONS, HR_MANAGERS]
\ No newline at end of file
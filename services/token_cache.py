@@ -0,0 +1,78 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+class TokenCache:
+    """LRU проверенных JWT: дайджест токена -> claims до истечения exp.
+
+    Повторный запрос с тем же токеном не проверяет подпись заново. Ключ -
+    SHA-256 токена вместе с секретом и алгоритмом проверки, сами токены в
+    памяти не хранятся: токен, проверенный одним сервисом, не принимается
+    сервисом с другими настройками подписи. Запись удаляется при истечении
+    exp, а при переполнении вытесняется самая давняя.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, Tuple[Dict, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(token: str, secret: Optional[str], algorithm: Optional[str]) -> bytes:
+        return hashlib.sha256("\0".join((secret or "", algorithm or "", token)).encode()).digest()
+
+    def get(self, token: str, secret: Optional[str], algorithm: Optional[str]) -> Optional[Dict]:
+        key = self._key(token, secret, algorithm)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            claims, expires = entry
+            if expires <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def put(self, token: str, secret: Optional[str], algorithm: Optional[str], claims: Dict) -> None:
+        if self.max_entries <= 0:
+            return
+        key = self._key(token, secret, algorithm)
+        expires = float(claims["exp"]) if "exp" in claims else float("inf")
+        with self._lock:
+            self._entries[key] = (claims, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / requests if requests else 0.0,
+                "evictions": self.evictions
+            }
+
+
+_token_cache: Optional[TokenCache] = None
+
+def get_token_cache() -> TokenCache:
+    """Общий для процесса кэш: SecurityService создается в нескольких модулях"""
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = TokenCache(int(os.getenv("TOKEN_CACHE_SIZE", "10000")))
+    return _token_cache
\ No newline at end of file
@@ -0,0 +1,239 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Подкаталог закрепленных фраз, не участвующих в вытеснении
+PINNED = "pinned"
+
+class TtsCache:
+    """Кэш синтезированной речи по содержимому: (текст, голос, модель, формат) -> аудио.
+
+    Два уровня: LRU в памяти на max_memory_bytes и каталог на диске на
+    max_disk_bytes, общий для перезапусков и воркеров. При переполнении
+    диска удаляются файлы, к которым дольше всего не обращались (по mtime).
+    Попадание в кэш не требует запроса к ElevenLabs. Закрепленные фразы
+    (заранее озвученные вопросы вакансий) лежат в подкаталоге pinned и не
+    вытесняются, пока их не открепят.
+
+    Каталог пишут все воркеры, поэтому индекс файлов процесса - только
+    оценка: перед вытеснением и не реже раза в rescan_interval секунд он
+    перестраивается обходом каталога.
+    """
+
+    def __init__(self, directory: str, max_memory_bytes: int, max_disk_bytes: int, rescan_interval: float = 30.0):
+        self.directory = directory
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes if directory else 0
+        self.rescan_interval = rescan_interval
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        # Дайджест -> размер файла, в порядке последнего обращения
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._scanned_at: Optional[float] = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.characters_saved = 0
+
+    @staticmethod
+    def key(text: str, voice_id: str, model: str, output_format: str) -> str:
+        return hashlib.sha256(
+            json.dumps([text.strip(), voice_id, model, output_format], ensure_ascii=False).encode()
+        ).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.audio")
+
+    def _pinned_path(self, key: str) -> str:
+        return os.path.join(self.directory, PINNED, f"{key}.audio")
+
+    async def get(self, key: str, text: str = "") -> Optional[bytes]:
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                self.characters_saved += len(text)
+                return audio
+        if self.directory:
+            audio = await asyncio.get_running_loop().run_in_executor(None, self._read, key)
+            if audio is not None:
+                self._remember(key, audio)
+                with self._lock:
+                    self.disk_hits += 1
+                    self.characters_saved += len(text)
+                return audio
+        with self._lock:
+            self.misses += 1
+        return None
+
+    async def put(self, key: str, audio: bytes) -> None:
+        if not audio:
+            return
+        self._remember(key, audio)
+        if self.max_disk_bytes > 0:
+            await asyncio.get_running_loop().run_in_executor(None, self._write, key, audio)
+
+    async def pin(self, key: str, audio: bytes) -> None:
+        """Фраза, которая должна оставаться в кэше независимо от обращений"""
+        self._remember(key, audio)
+        if self.directory:
+            await asyncio.get_running_loop().run_in_executor(None, self._write_file, self._pinned_path(key), audio)
+
+    async def read_pinned(self, key: str) -> Optional[bytes]:
+        """Закрепленная фраза с диска; не учитывается в попаданиях и промахах"""
+        if not self.directory:
+            return None
+        return await asyncio.get_running_loop().run_in_executor(None, self._read_file, self._pinned_path(key))
+
+    async def unpin(self, key: str) -> None:
+        if self.directory:
+            await asyncio.get_running_loop().run_in_executor(None, self._remove_file, self._pinned_path(key))
+
+    def _remember(self, key: str, audio: bytes) -> None:
+        if len(audio) > self.max_memory_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous)
+            self._memory[key] = audio
+            self._memory_bytes += len(audio)
+            while self._memory_bytes > self.max_memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+                self.evictions += 1
+
+    def _walk(self) -> "OrderedDict[str, int]":
+        """Файлы кэша на диске (без закрепленных): от давно не использованных к свежим"""
+        files = []
+        for root, directories, names in os.walk(self.directory):
+            if root == self.directory and PINNED in directories:
+                directories.remove(PINNED)
+            for name in names:
+                if name.endswith(".audio"):
+                    try:
+                        stat = os.stat(os.path.join(root, name))
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, name[:-len(".audio")], stat.st_size))
+        return OrderedDict((key, size) for _, key, size in sorted(files))
+
+    def _rescan(self) -> None:
+        disk = self._walk()
+        with self._lock:
+            self._disk = disk
+            self._disk_bytes = sum(disk.values())
+            self._scanned_at = time.monotonic()
+
+    def _read(self, key: str) -> Optional[bytes]:
+        if self._scanned_at is None:
+            self._rescan()
+        path = self._path(key)
+        try:
+            with open(path, "rb") as audio_file:
+                audio = audio_file.read()
+            # mtime - время последнего обращения, по нему вытесняют другие процессы
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._disk_bytes -= self._disk.pop(key, 0)
+            # Файла нет (или его вытеснил другой процесс), но фраза может быть закреплена
+            return self._read_file(self._pinned_path(key))
+        with self._lock:
+            # Файл мог записать другой процесс уже после обхода каталога
+            self._disk_bytes += len(audio) - self._disk.pop(key, 0)
+            self._disk[key] = len(audio)
+        return audio
+
+    @staticmethod
+    def _read_file(path: str) -> Optional[bytes]:
+        try:
+            with open(path, "rb") as audio_file:
+                return audio_file.read()
+        except OSError:
+            return None
+
+    @staticmethod
+    def _write_file(path: str, audio: bytes) -> bool:
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "wb") as audio_file:
+                audio_file.write(audio)
+            os.replace(temporary, path)
+        except OSError as e:
+            print(f"Error writing TTS cache {path}: {str(e)}")
+            return False
+        return True
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _write(self, key: str, audio: bytes) -> None:
+        if not self._write_file(self._path(key), audio):
+            return
+        if self._scanned_at is None:
+            self._rescan()
+        with self._lock:
+            self._disk_bytes += len(audio) - self._disk.pop(key, 0)
+            self._disk[key] = len(audio)
+            stale = time.monotonic() - self._scanned_at >= self.rescan_interval
+            over = self._disk_bytes > self.max_disk_bytes
+        if not (over or stale):
+            return
+        # Вытесняем по фактическому содержимому каталога, включая файлы других воркеров
+        self._rescan()
+        with self._lock:
+            evicted = []
+            while self._disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+                evicted_key, size = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+                self.evictions += 1
+                evicted.append(evicted_key)
+        for evicted_key in evicted:
+            self._remove_file(self._path(evicted_key))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            requests = hits + self.misses
+            return {
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": hits / requests if requests else 0.0,
+                "evictions": self.evictions,
+                # ElevenLabs тарифицирует синтез по символам
+                "characters_saved": self.characters_saved
+            }
+
+
+_tts_cache: Optional[TtsCache] = None
+
+def get_tts_cache() -> TtsCache:
+    global _tts_cache
+    if _tts_cache is None:
+        _tts_cache = TtsCache(
+            os.getenv("TTS_CACHE_DIR", "tts_cache"),
+            max_memory_bytes=int(os.getenv("TTS_CACHE_MEMORY_BYTES", "33554432")),
+            max_disk_bytes=int(os.getenv("TTS_CACHE_DISK_BYTES", "536870912")),
+            rescan_interval=float(os.getenv("TTS_CACHE_RESCAN_INTERVAL", "30"))
+        )
+    return _tts_cache
\ No newline at end of file
@@ -0,0 +1,113 @@
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+from services.interview_service import InterviewService, get_interview_service
+from services.voice_service import ElevenLabsService
+from services.sentence_splitter import SentenceSplitter
+
+class TurnPipeline:
+    """Ход интервью с перекрытием этапов: STT -> LLM -> TTS -> клиент.
+
+    Вопрос генерируется потоком токенов; каждое готовое предложение сразу
+    уходит в синтез речи, пока модель дописывает следующее, а части аудио
+    отправляются клиенту по мере синтеза. Анализ ответа выполняется в фоне.
+
+    Сообщения клиенту: {"type": "sentence", "index", "text"} перед аудио
+    предложения, аудио - бинарными кадрами, в конце {"type": "turn_end",
+    "question", "timings"}.
+    """
+
+    def __init__(self, interview_service: InterviewService, voice_service: ElevenLabsService):
+        self.interview_service = interview_service
+        self.voice_service = voice_service
+        self.turns = 0
+        self.total_first_audio = 0.0
+        self.max_first_audio = 0.0
+
+    async def run(
+        self,
+        session_id: str,
+        response: Union[str, bytes],
+        send_json: Callable[[Any], Awaitable[None]],
+        send_bytes: Callable[[bytes], Awaitable[None]]
+    ) -> str:
+        started = time.monotonic()
+        timings: Dict[str, float] = {}
+
+        def mark(name: str) -> None:
+            timings.setdefault(name, 1000 * (time.monotonic() - started))
+
+        session = await self.interview_service.get_session(session_id)
+        async with session.lock:
+            await self.interview_service.record_answer(session, response)
+            mark("answer_ms")
+
+            sentences: asyncio.Queue = asyncio.Queue()
+            speaker = asyncio.create_task(self._speak(sentences, send_json, send_bytes, mark))
+            splitter = SentenceSplitter()
+            parts = []
+            try:
+                async for token in self.interview_service.stream_next_question(session):
+                    if speaker.done():
+                        # Отправка клиенту оборвалась: дальше генерировать незачем
+                        break
+                    mark("first_token_ms")
+                    parts.append(token)
+                    for sentence in splitter.feed(token):
+                        sentences.put_nowait(sentence)
+                rest = splitter.flush()
+                if rest:
+                    sentences.put_nowait(rest)
+                sentences.put_nowait(None)
+                await speaker
+            finally:
+                if not speaker.done():
+                    speaker.cancel()
+
+        question = "".join(parts).strip()
+        mark("total_ms")
+        self._record(timings)
+        await send_json({"type": "turn_end", "question": question, "timings": timings})
+        return question
+
+    async def _speak(
+        self,
+        sentences: asyncio.Queue,
+        send_json: Callable[[Any], Awaitable[None]],
+        send_bytes: Callable[[bytes], Awaitable[None]],
+        mark: Callable[[str], None]
+    ) -> None:
+        index = 0
+        while True:
+            sentence = await sentences.get()
+            if sentence is None:
+                return
+            await send_json({"type": "sentence", "index": index, "text": sentence})
+            async for chunk in self.voice_service.stream_speech(sentence):
+                mark("first_audio_ms")
+                await send_bytes(chunk)
+            index += 1
+
+    def _record(self, timings: Dict[str, float]) -> None:
+        first_audio = timings.get("first_audio_ms")
+        if first_audio is None:
+            return
+        self.turns += 1
+        self.total_first_audio += first_audio
+        self.max_first_audio = max(self.max_first_audio, first_audio)
+
+    def stats(self) -> Dict:
+        return {
+            "turns": self.turns,
+            "avg_first_audio_ms": self.total_first_audio / self.turns if self.turns else 0.0,
+            "max_first_audio_ms": self.max_first_audio
+        }
+
+
+_turn_pipeline: Optional[TurnPipeline] = None
+
+def get_turn_pipeline() -> TurnPipeline:
+    global _turn_pipeline
+    if _turn_pipeline is None:
+        _turn_pipeline = TurnPipeline(get_interview_service(), ElevenLabsService())
+    return _turn_pipeline
\ No newline at end of file
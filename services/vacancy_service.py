@@ -1,34 +1,25 @@
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime
-from models.base import Vacancy, VacancyCreate
-from services.sheets_service import GoogleSheetsService
+from models.base import BulkCreateResult, BulkItemResult, Vacancy, VacancyCreate
+from services.repository import get_repository
+from services.tables import VACANCIES
+from services.codecs import VACANCY_CODEC
+from services.pagination import iter_records
+from services.secondary_index import Condition
+from services.sheets_scheduler import BULK, sheets_lane
+from services.bulk import validate_items
+from services.question_plan import get_question_planner
 
 class VacancyService:
     def __init__(self):
-        self.sheets_service = GoogleSheetsService()
-        
+        self.repository = get_repository(VACANCIES)
+        # Озвучка вопросов вакансии заранее, вне хода интервью
+        self.question_planner = get_question_planner()
+
     async def create_vacancy(self, vacancy: VacancyCreate) -> Vacancy:
-        # Получаем текущие вакансии
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Вакансии!A:H'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values:
-            # Создаем заголовки, если таблица пуста
-            headers = ["ID", "Название", "Уровень", "Hard Skills", "Soft Skills", "Задачи", "Инструменты", "Дата создания"]
-            self.sheets_service.service.spreadsheets().values().update(
-                spreadsheetId=self.sheets_service.spreadsheet_id,
-                range='Вакансии!A1:H1',
-                valueInputOption='RAW',
-                body={'values': [headers]}
-            ).execute()
-            values = [headers]
-        
         # Создаем новую вакансию
         new_vacancy = Vacancy(
-            id=str(len(values)),
+            id=await self.repository.next_id(),
             title=vacancy.title,
             level=vacancy.level,
             hard_skills=vacancy.hard_skills,
@@ -37,144 +28,76 @@ class VacancyService:
             tools=vacancy.tools,
             created_at=datetime.now()
         )
-        
-        # Подготавливаем данные для записи
-        row_data = [
-            new_vacancy.id,
-            new_vacancy.title,
-            new_vacancy.level,
-            ",".join(new_vacancy.hard_skills),
-            ",".join(new_vacancy.soft_skills),
-            ",".join(new_vacancy.tasks),
-            ",".join(new_vacancy.tools),
-            str(new_vacancy.created_at)
-        ]
-        
+
         # Добавляем вакансию в таблицу
-        self.sheets_service.service.spreadsheets().values().append(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Вакансии!A:H',
-            valueInputOption='RAW',
-            body={'values': [row_data]}
-        ).execute()
-        
+        await self.repository.insert(VACANCY_CODEC.encode(new_vacancy.dict()))
+        self.question_planner.schedule(new_vacancy)
+
         return new_vacancy
-        
+
+    async def create_vacancies(self, items: List[Dict[str, Any]]) -> BulkCreateResult:
+        """Массовое создание: проверка, выдача ID и запись одним запросом"""
+        valid, errors = validate_items(VacancyCreate, items)
+        created = []
+        if valid:
+            now = datetime.now()
+            with sheets_lane(BULK):
+                ids = await self.repository.next_ids(len(valid))
+                vacancies = [
+                    Vacancy(id=vacancy_id, created_at=now, **vacancy.dict())
+                    for vacancy_id, (_, vacancy) in zip(ids, valid)
+                ]
+                await self.repository.insert_many([VACANCY_CODEC.encode(vacancy.dict()) for vacancy in vacancies])
+            for vacancy in vacancies:
+                self.question_planner.schedule(vacancy)
+            created = [BulkItemResult(index=index, id=vacancy_id) for vacancy_id, (index, _) in zip(ids, valid)]
+        return BulkCreateResult(
+            created=len(created),
+            failed=len(errors),
+            items=sorted(created + errors, key=lambda item: item.index)
+        )
+
     async def get_vacancy(self, vacancy_id: str) -> Optional[Vacancy]:
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Вакансии!A:H'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values or len(values) < 2:  # Проверяем наличие заголовков и данных
+        row = await self.repository.get(vacancy_id)
+        if not row:
             return None
-            
-        for row in values[1:]:  # Пропускаем заголовки
-            if row[0] == vacancy_id:
-                return Vacancy(
-                    id=row[0],
-                    title=row[1],
-                    level=row[2],
-                    hard_skills=row[3].split(",") if row[3] else [],
-                    soft_skills=row[4].split(",") if row[4] else [],
-                    tasks=row[5].split(",") if row[5] else [],
-                    tools=row[6].split(",") if row[6] else [],
-                    created_at=datetime.fromisoformat(row[7])
-                )
-        return None
-        
-    async def get_vacancies(self) -> List[Vacancy]:
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Вакансии!A:H'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values or len(values) < 2:  # Проверяем наличие заголовков и данных
-            return []
-            
-        vacancies = []
-        for row in values[1:]:  # Пропускаем заголовки
-            vacancy = Vacancy(
-                id=row[0],
-                title=row[1],
-                level=row[2],
-                hard_skills=row[3].split(",") if row[3] else [],
-                soft_skills=row[4].split(",") if row[4] else [],
-                tasks=row[5].split(",") if row[5] else [],
-                tools=row[6].split(",") if row[6] else [],
-                created_at=datetime.fromisoformat(row[7])
-            )
-            vacancies.append(vacancy)
-        return vacancies
-        
+        return Vacancy(**VACANCY_CODEC.decode(row))
+
+    async def get_vacancies(self, **filters: Condition) -> List[Vacancy]:
+        return [Vacancy(**data) for data in VACANCY_CODEC.decode_rows(await self.repository.find(**filters))]
+
+    async def get_vacancies_page(self, limit: int, cursor: Optional[str] = None, **filters: Condition) -> Tuple[List[Vacancy], Optional[str]]:
+        rows, next_cursor = await self.repository.page(limit, cursor, **filters)
+        return [Vacancy(**data) for data in VACANCY_CODEC.decode_rows(rows)], next_cursor
+
+    def stream_vacancies(self, **filters: Condition) -> AsyncIterator[Dict]:
+        return iter_records(self.repository, VACANCY_CODEC, **filters)
+
     async def update_vacancy(self, vacancy_id: str, vacancy: VacancyCreate) -> Optional[Vacancy]:
-        # Получаем текущие вакансии
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Вакансии!A:H'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values or len(values) < 2:
+        current = await self.get_vacancy(vacancy_id)
+        if not current:
             return None
-            
-        # Ищем вакансию для обновления
-        for i, row in enumerate(values[1:], start=2):  # start=2 потому что первая строка - заголовки
-            if row[0] == vacancy_id:
-                updated_vacancy = Vacancy(
-                    id=vacancy_id,
-                    title=vacancy.title,
-                    level=vacancy.level,
-                    hard_skills=vacancy.hard_skills,
-                    soft_skills=vacancy.soft_skills,
-                    tasks=vacancy.tasks,
-                    tools=vacancy.tools,
-                    created_at=datetime.fromisoformat(row[7])
-                )
-                
-                # Подготавливаем данные для обновления
-                row_data = [
-                    updated_vacancy.id,
-                    updated_vacancy.title,
-                    updated_vacancy.level,
-                    ",".join(updated_vacancy.hard_skills),
-                    ",".join(updated_vacancy.soft_skills),
-                    ",".join(updated_vacancy.tasks),
-                    ",".join(updated_vacancy.tools),
-                    str(updated_vacancy.created_at)
-                ]
-                
-                # Обновляем вакансию в таблице
-                self.sheets_service.service.spreadsheets().values().update(
-                    spreadsheetId=self.sheets_service.spreadsheet_id,
-                    range=f'Вакансии!A{i}:H{i}',
-                    valueInputOption='RAW',
-                    body={'values': [row_data]}
-                ).execute()
-                
-                return updated_vacancy
-        return None
-        
+
+        updated_vacancy = Vacancy(
+            id=vacancy_id,
+            title=vacancy.title,
+            level=vacancy.level,
+            hard_skills=vacancy.hard_skills,
+            soft_skills=vacancy.soft_skills,
+            tasks=vacancy.tasks,
+            tools=vacancy.tools,
+            created_at=current.created_at
+        )
+
+        # Обновляем вакансию в таблице
+        if not await self.repository.update(vacancy_id, VACANCY_CODEC.encode(updated_vacancy.dict())):
+            return None
+        # План пересобирается, только если изменились навыки, задачи или инструменты
+        self.question_planner.schedule(updated_vacancy)
+        return updated_vacancy
+
     async def delete_vacancy(self, vacancy_id: str) -> bool:
-        # Получаем текущие вакансии
-        result = self.sheets_service.service.spreadsheets().values().get(
-            spreadsheetId=self.sheets_service.spreadsheet_id,
-            range='Вакансии!A:H'
-        ).execute()
-        
-        values = result.get('values', [])
-        if not values or len(values) < 2:
+        if not await self.repository.delete(vacancy_id):
             return False
-            
-        # Ищем вакансию для удаления
-        for i, row in enumerate(values[1:], start=2):
-            if row[0] == vacancy_id:
-                # Удаляем строку с вакансией
-                self.sheets_service.service.spreadsheets().values().clear(
-                    spreadsheetId=self.sheets_service.spreadsheet_id,
-                    range=f'Вакансии!A{i}:H{i}'
-                ).execute()
-                return True
-        return False 
\ No newline at end of file
+        await self.question_planner.discard(vacancy_id)
+        return True
\ No newline at end of file
@@ -1,21 +1,83 @@
 import os
+import asyncio
 from elevenlabs import generate, set_api_key
-from typing import Optional
+from typing import AsyncIterator, Optional
+from services.tts_cache import get_tts_cache
 
 class ElevenLabsService:
     def __init__(self):
         set_api_key(os.getenv("ELEVENLABS_API_KEY"))
         self.voice_id = "21m00Tcm4TlvDq8ikWAM"  # ID голоса Emily
+        self.model = "eleven_multilingual_v2"
+        # Формат, в котором API отдает аудио по умолчанию; входит в ключ кэша
+        self.output_format = "mp3_44100_128"
+        self.cache = get_tts_cache()
         
-    async def generate_speech(self, text: str) -> bytes:
-        """Генерирует речь из текста используя ElevenLabs"""
+    def cache_key(self, text: str) -> str:
+        return self.cache.key(text, self.voice_id, self.model, self.output_format)
+        
+    async def synthesize(self, text: str) -> Optional[bytes]:
+        """Синтез речи в ElevenLabs без обращения к кэшу; None при ошибке"""
         try:
-            audio = generate(
+            # Клиент ElevenLabs синхронный: вызов уходит в пул потоков
+            return await asyncio.get_running_loop().run_in_executor(None, lambda: generate(
                 text=text,
                 voice=self.voice_id,
-                model="eleven_multilingual_v2"
-            )
-            return audio
+                model=self.model
+            ))
         except Exception as e:
             print(f"Error generating speech: {str(e)}")
-            return None 
\ No newline at end of file
+            return None
+        
+    async def generate_speech(self, text: str) -> bytes:
+        """Генерирует речь из текста используя ElevenLabs"""
+        key = self.cache_key(text)
+        audio = await self.cache.get(key, text)
+        if audio is not None:
+            return audio
+        audio = await self.synthesize(text)
+        if audio is not None:
+            await self.cache.put(key, audio)
+        return audio
+            
+    async def stream_speech(self, text: str) -> AsyncIterator[bytes]:
+        """Синтез речи потоком: части аудио отдаются по мере готовности"""
+        key = self.cache_key(text)
+        audio = await self.cache.get(key, text)
+        if audio is not None:
+            yield audio
+            return
+            
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        failed = False
+        
+        def produce():
+            nonlocal failed
+            try:
+                for chunk in generate(
+                    text=text,
+                    voice=self.voice_id,
+                    model=self.model,
+                    stream=True
+                ):
+                    loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+            except Exception as e:
+                failed = True
+                print(f"Error streaming speech: {str(e)}")
+            finally:
+                loop.call_soon_threadsafe(chunks.put_nowait, None)
+                
+        producer = loop.run_in_executor(None, produce)
+        parts = []
+        while True:
+            chunk = await chunks.get()
+            if chunk is None:
+                break
+            if chunk:
+                parts.append(chunk)
+                yield chunk
+        await producer
+        # Оборванный синтез в кэш не попадает
+        if not failed:
+            await self.cache.put(key, b"".join(parts)) 
\ No newline at end of file
@@ -1,4 +1,6 @@
 import os
+import io
+import wave
 import openai
 from typing import Optional, Dict
 import json
@@ -7,12 +9,14 @@ class WhisperService:
     def __init__(self):
         self.openai = openai
         self.openai.api_key = os.getenv("OPENAI_API_KEY")
+        # Асинхронный клиент: запросы к OpenAI не блокируют event loop
+        self.client = openai.AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
         
-    async def transcribe_audio(self, audio_data: bytes) -> Optional[str]:
+    async def transcribe_audio(self, audio_data: bytes, filename: str = "audio.mp3") -> Optional[str]:
         """Транскрибация аудио в текст"""
         try:
-            response = await self.openai.audio.transcriptions.create(
-                file=("audio.mp3", audio_data),
+            response = await self.client.audio.transcriptions.create(
+                file=(filename, audio_data),
                 model="whisper-1",
                 language="ru"
             )
@@ -21,6 +25,16 @@ class WhisperService:
             print(f"Error transcribing audio: {str(e)}")
             return None
             
+    async def transcribe_pcm(self, pcm: bytes, sample_rate: int) -> Optional[str]:
+        """Транскрибация фрагмента PCM 16 бит моно: Whisper принимает его в контейнере WAV"""
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(pcm)
+        return await self.transcribe_audio(buffer.getvalue(), "segment.wav")
+            
     async def analyze_response(self, text: str, vacancy_data: Dict) -> Dict:
         """Анализ ответа кандидата"""
         try:
@@ -36,7 +50,7 @@ class WhisperService:
             }
             
             # Анализируем ответ с помощью GPT-4
-            response = await self.openai.chat.completions.create(
+            response = await self.client.chat.completions.create(
                 model="gpt-4",
                 messages=[
                     {"role": "system", "content": "Вы — HR-специалист, анализирующий ответ кандидата на собеседовании. Оцените технические знания и soft skills кандидата."},
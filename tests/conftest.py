@@ -0,0 +1,14 @@
+import os
+import sys
+import pytest
+
+# Тесты импортируют services.* из корня проекта независимо от каталога запуска
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(autouse=True)
+def compaction_lock_path(tmp_path, monkeypatch):
+    """Файл аренды уплотнения у каждого теста свой, а не в каталоге запуска"""
+    from services import compaction_lease
+    monkeypatch.setenv("SHEETS_COMPACTION_LOCK_PATH", str(tmp_path / "compaction.db"))
+    monkeypatch.setattr(compaction_lease, "_compaction_lease", None)
\ No newline at end of file
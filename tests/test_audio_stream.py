@@ -0,0 +1,83 @@
+from array import array
+import pytest
+
+pytest.importorskip("openai")
+
+from services.audio_stream import PcmRingBuffer, VoiceActivitySegmenter, frame_rms
+
+SAMPLE_RATE = 16000
+BYTES_PER_MS = SAMPLE_RATE // 1000 * 2
+
+
+def tone(ms, amplitude=3000):
+    """Меандр: громкость (RMS) равна amplitude"""
+    samples = array("h", [amplitude, -amplitude] * (SAMPLE_RATE * ms // 1000 // 2))
+    return samples.tobytes()
+
+
+def silence(ms):
+    return bytes(ms * BYTES_PER_MS)
+
+
+def segmenter(segment_silence_ms=100, max_segment_ms=5000):
+    return VoiceActivitySegmenter(SAMPLE_RATE, segment_silence_ms, max_segment_ms)
+
+
+def test_ring_buffer_wraps_around():
+    ring = PcmRingBuffer(8)
+    ring.write(b"abcdef")
+    ring.write(b"ghij")
+    assert (ring.oldest, ring.total) == (2, 10)
+    assert ring.slice(2, 10) == b"cdefghij"
+    assert ring.slice(5, 9) == b"fghi"
+    # Кусок больше буфера: остаются последние capacity байт
+    ring.write(b"0123456789")
+    assert ring.slice(ring.oldest, ring.total) == b"23456789"
+
+
+@pytest.mark.parametrize("start, end", [(1, 5), (4, 11), (6, 5)])
+def test_ring_buffer_rejects_ranges_outside(start, end):
+    ring = PcmRingBuffer(8)
+    ring.write(b"abcdefghij")
+    with pytest.raises(ValueError):
+        ring.slice(start, end)
+
+
+def test_frame_rms():
+    assert frame_rms(tone(20, 1000)) == pytest.approx(1000)
+    assert frame_rms(silence(20)) == 0
+
+
+def test_segment_closes_on_silence_with_preroll():
+    vad = segmenter()
+    assert vad.feed(silence(500) + tone(400)) == []
+    assert vad.heard_speech and vad.silence_ms == 0
+    segments = vad.feed(silence(200))
+    assert len(segments) == 1
+    # Предзапись PREROLL_MS, речь и пауза до закрытия фрагмента
+    assert segments[0] == silence(300) + tone(400) + silence(100)
+    assert vad.silence_ms == 200
+    assert vad.flush() is None
+
+
+def test_clicks_are_not_segments():
+    vad = segmenter()
+    assert vad.feed(silence(200) + tone(100) + silence(300)) == []
+    assert vad.flush() is None
+
+
+def test_long_speech_is_cut_at_max_segment():
+    vad = segmenter(max_segment_ms=1000)
+    speech = tone(2500)
+    segments = vad.feed(speech)
+    assert [len(segment) for segment in segments] == [1000 * BYTES_PER_MS] * 2
+    # Фрагменты идут встык: после разреза предзапись не повторяется
+    assert b"".join(segments) + vad.flush() == speech
+
+
+def test_frames_split_across_chunks():
+    audio = silence(300) + tone(300) + silence(200)
+    whole = segmenter().feed(audio)
+    vad = segmenter()
+    pieces = [vad.feed(audio[i:i + 333]) for i in range(0, len(audio), 333)]
+    assert [segment for piece in pieces for segment in piece] == whole
\ No newline at end of file
@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+
+pytest.importorskip("jose")
+pytest.importorskip("passlib")
+pytest.importorskip("googleapiclient")
+
+from services import auth_service as auth_module
+from services.token_cache import TokenCache
+
+
+class FakeRepository:
+    """Лист HR-менеджеров в памяти со счетчиком чтений"""
+
+    def __init__(self, emails):
+        self.emails = set(emails)
+        self.lookups = 0
+        self.error = None
+
+    async def find(self, email):
+        self.lookups += 1
+        if self.error is not None:
+            raise self.error
+        return [["1", "HR", email, "hash", ""]] if email in self.emails else []
+
+
+@pytest.fixture
+def service(monkeypatch):
+    repository = FakeRepository(["hr@example.com"])
+    monkeypatch.setattr(auth_module, "get_repository", lambda table: repository)
+    monkeypatch.setenv("USER_CACHE_TTL", "60")
+    monkeypatch.setenv("USER_MISS_CACHE_TTL", "60")
+    return auth_module.AuthService()
+
+
+def test_user_lookups_are_cached_both_ways(service):
+    async def scenario():
+        for _ in range(3):
+            assert await service.user_exists("hr@example.com")
+            assert not await service.user_exists("deleted@example.com")
+        assert service.repository.lookups == 2
+
+    asyncio.run(scenario())
+
+
+def test_lookup_errors_are_not_cached(service):
+    async def scenario():
+        service.repository.error = OSError("quota exceeded")
+        with pytest.raises(OSError):
+            await service.user_exists("hr@example.com")
+        service.repository.error = None
+        assert await service.user_exists("hr@example.com")
+
+    asyncio.run(scenario())
+
+
+def test_user_caches_are_bounded(service):
+    service.user_cache_size = 2
+
+    async def scenario():
+        for email in ["a@example.com", "b@example.com", "c@example.com"]:
+            assert not await service.user_exists(email)
+        assert list(service._unknown_users) == ["b@example.com", "c@example.com"]
+        # Вытесненный email снова читается из листа
+        assert not await service.user_exists("a@example.com")
+        assert service.repository.lookups == 4
+
+    asyncio.run(scenario())
+
+
+def test_tokens_verified_with_other_settings_are_not_reused(service):
+    service.secret_key, service.algorithm = "secret", "HS256"
+    service.token_cache = TokenCache(10)
+    token = asyncio.run(service.create_access_token({"sub": "hr@example.com"}))
+    assert asyncio.run(service.get_current_user(token)).email == "hr@example.com"
+
+    service.algorithm = "HS512"
+    with pytest.raises(ValueError):
+        asyncio.run(service.get_current_user(token))
\ No newline at end of file
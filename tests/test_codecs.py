@@ -0,0 +1,66 @@
+from datetime import datetime
+
+from services.codecs import HR_MANAGER_CODEC, INTERVIEW_CODEC, REPORT_CODEC, VACANCY_CODEC
+
+
+def vacancy_row(**fields):
+    data = {
+        "id": "1", "title": "Разработчик", "level": "middle",
+        "hard_skills": ["Python", "SQL"], "soft_skills": [], "tasks": ["Писать, тестировать"],
+        "tools": ["Git"], "created_at": datetime(2024, 5, 1, 12, 30)
+    }
+    data.update(fields)
+    return data
+
+
+def test_v2_round_trip():
+    data = vacancy_row()
+    row = VACANCY_CODEC.encode(data)
+    assert row[3] == '["Python","SQL"]'
+    # Запятая внутри элемента не разбивает его в версии 2
+    assert row[5] == '["Писать, тестировать"]'
+    assert row[7] == "2024-05-01T12:30:00"
+    assert VACANCY_CODEC.decode(row) == data
+    assert VACANCY_CODEC.decode_rows([row, row]) == [data, data]
+
+
+def test_optional_cells_round_trip_as_none():
+    data = {
+        "id": "1", "candidate_id": "c", "vacancy_id": "v", "status": "completed",
+        "start_time": datetime(2024, 5, 1, 12), "end_time": None, "recording_url": None,
+        "transcript": None, "questions": [], "answers": [], "emotions_analysis": [{"joy": 0.5}]
+    }
+    row = INTERVIEW_CODEC.encode(data)
+    assert row[5:8] == ["", "", ""]
+    assert INTERVIEW_CODEC.decode(row) == data
+    assert INTERVIEW_CODEC.decode_rows([row]) == [data]
+
+
+def test_legacy_v1_cells_are_decoded():
+    legacy = ["1", "Разработчик", "middle", "Python,SQL", "", "Писать", "Git", str(datetime(2024, 5, 1, 12, 30))]
+    expected = vacancy_row(soft_skills=[], tasks=["Писать"])
+    assert VACANCY_CODEC.decode(legacy) == expected
+    assert VACANCY_CODEC.decode_rows([legacy]) == [expected]
+
+    verdict = {"decision": "hire", "score": 0.8}
+    report = ["1", "i", "", "", str({"Python": 5}), "{}", str({"joy": 0.5}), str(verdict), "2024-05-01 12:30:00"]
+    decoded = REPORT_CODEC.decode(report)
+    assert decoded["hard_skills_assessment"] == {"Python": 5}
+    assert decoded["verdict"] == verdict
+    assert decoded["candidate_id"] is None
+
+
+def test_mixed_versions_in_one_column():
+    v2 = VACANCY_CODEC.encode(vacancy_row(id="2"))
+    legacy = ["1", "Разработчик", "middle", "Python,SQL", "", "", "Git", "2024-05-01 12:30:00"]
+    first, second = VACANCY_CODEC.decode_rows([legacy, v2])
+    assert first["hard_skills"] == second["hard_skills"] == ["Python", "SQL"]
+    assert second["tasks"] == ["Писать, тестировать"]
+
+
+def test_short_rows_are_padded():
+    # Sheets API не возвращает пустые ячейки в конце строки
+    assert HR_MANAGER_CODEC.decode(["1", "HR"]) == {
+        "id": "1", "name": "HR", "email": "", "hashed_password": "", "created_at": ""
+    }
+    assert HR_MANAGER_CODEC.decode_rows([["1", "HR"], ["2"]])[1]["name"] == ""
\ No newline at end of file
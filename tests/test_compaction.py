@@ -0,0 +1,92 @@
+import asyncio
+import pytest
+
+pytest.importorskip("googleapiclient")
+
+from services.compaction import CompactionLease
+
+
+def test_one_worker_holds_the_lease(tmp_path):
+    path = str(tmp_path / "compaction.db")
+    first, second = CompactionLease(path, ttl=60), CompactionLease(path, ttl=60)
+
+    async def scenario():
+        assert await first.acquire()
+        assert not await second.acquire()
+        # Повторное получение своей аренды продлевает ее
+        assert await first.acquire()
+        await first.release()
+        assert await second.acquire()
+        # Освободить чужую аренду нельзя
+        await first.release()
+        assert not await first.acquire()
+
+    asyncio.run(scenario())
+
+
+def test_expired_lease_is_taken_over(tmp_path):
+    path = str(tmp_path / "compaction.db")
+    crashed, alive = CompactionLease(path, ttl=-1), CompactionLease(path, ttl=60)
+
+    async def scenario():
+        assert await crashed.acquire()
+        assert await alive.acquire()
+
+    asyncio.run(scenario())
+
+
+def test_other_workers_see_compacted_sheets(tmp_path):
+    path = str(tmp_path / "compaction.db")
+    compacting, watching = CompactionLease(path, ttl=60), CompactionLease(path, ttl=60)
+
+    async def scenario():
+        await compacting.mark_compacted("Кандидаты")
+        # Первая проверка запоминает номера, сбрасывать еще нечего
+        assert await watching.shifted_sheets() == []
+        assert await compacting.shifted_sheets() == []
+
+        await compacting.mark_compacted("Кандидаты")
+        await compacting.mark_compacted("Вакансии")
+        assert sorted(await watching.shifted_sheets()) == ["Вакансии", "Кандидаты"]
+        assert await watching.shifted_sheets() == []
+        # Свое уплотнение процесс уже учел в индексах
+        assert await compacting.shifted_sheets() == []
+
+    asyncio.run(scenario())
+
+
+def test_row_writes_and_compaction_exclude_each_other(tmp_path):
+    path = str(tmp_path / "compaction.db")
+    compacting, writing = CompactionLease(path, ttl=60), CompactionLease(path, ttl=60)
+    events = []
+
+    async def write(name, delay):
+        async with writing.row_write("Кандидаты") as epoch:
+            events.append((name, "start", epoch))
+            await asyncio.sleep(delay)
+            events.append((name, "end", epoch))
+
+    async def compact():
+        async with compacting.compacting("Кандидаты"):
+            events.append(("compaction", "start", None))
+            await asyncio.sleep(0.05)
+            await compacting.mark_compacted("Кандидаты")
+            events.append(("compaction", "end", None))
+
+    async def scenario():
+        first = asyncio.create_task(write("first", 0.05))
+        await asyncio.sleep(0.02)
+        compaction = asyncio.create_task(compact())
+        await asyncio.sleep(0.01)
+        # Новая запись ждет конца уплотнения, начатая - его задерживает
+        await asyncio.gather(first, compaction, write("second", 0))
+        # Другой лист уплотнение не задерживает
+        async with writing.row_write("Вакансии") as epoch:
+            assert epoch == 0
+
+    asyncio.run(scenario())
+    assert events == [
+        ("first", "start", 0), ("first", "end", 0),
+        ("compaction", "start", None), ("compaction", "end", None),
+        ("second", "start", 1), ("second", "end", 1)
+    ]
\ No newline at end of file
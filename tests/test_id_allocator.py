@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import pytest
+from services.id_allocator import CounterBlockAllocator, IdAllocator, UlidAllocator, _CROCKFORD
+from services.tables import CANDIDATES, VACANCIES
+
+
+def test_id_allocator_is_abstract():
+    with pytest.raises(TypeError):
+        IdAllocator()
+
+
+def test_ulid_format_and_order():
+    allocator = UlidAllocator()
+    ids = asyncio.run(allocator.allocate(CANDIDATES, 1000))
+    assert len(set(ids)) == 1000
+    assert all(len(value) == 26 and set(value) <= set(_CROCKFORD) for value in ids)
+    # Внутри процесса ID монотонны даже в пределах одной миллисекунды
+    assert ids == sorted(ids)
+    assert allocator.stats() == {"allocator": "ulid", "allocated": 1000}
+
+
+def test_counter_blocks_are_shared_between_processes(tmp_path):
+    path = str(tmp_path / "ids.db")
+    first, second = CounterBlockAllocator(path, 10), CounterBlockAllocator(path, 10)
+
+    async def scenario():
+        a = await first.allocate(CANDIDATES, 3)
+        b = await second.allocate(CANDIDATES, 3)
+        c = await first.allocate(CANDIDATES, 12)
+        return a, b, c
+
+    a, b, c = asyncio.run(scenario())
+    assert a == ["1", "2", "3"]
+    # Второй процесс арендует следующий блок
+    assert b == ["11", "12", "13"]
+    # Остаток блока и новый блок не меньше запрошенного числа
+    assert c == [str(i) for i in range(4, 11)] + [str(i) for i in range(21, 26)]
+    assert first.stats()["leases"] == 2
+
+
+def test_counter_seeds_from_existing_rows_once(tmp_path):
+    path = str(tmp_path / "ids.db")
+    calls = []
+
+    async def seed():
+        calls.append(1)
+        return 41
+
+    async def scenario():
+        ids = await CounterBlockAllocator(path, 5).allocate(VACANCIES, 2, seed)
+        # Счетчик уже существует: после перезапуска seed не нужен
+        return ids + await CounterBlockAllocator(path, 5).allocate(VACANCIES, 1, seed)
+
+    assert asyncio.run(scenario()) == ["42", "43", "47"]
+    assert calls == [1]
+
+
+def test_counter_lease_runs_off_the_event_loop(tmp_path):
+    allocator = CounterBlockAllocator(str(tmp_path / "ids.db"), 5)
+    threads = []
+    original = allocator._lease
+
+    def spy(*args):
+        threads.append(threading.current_thread().name)
+        return original(*args)
+
+    allocator._lease = spy
+
+    async def scenario():
+        # Одновременные запросы не арендуют лишних блоков
+        return await asyncio.gather(*(allocator.allocate(CANDIDATES, 2) for _ in range(5)))
+
+    ids = [value for batch in asyncio.run(scenario()) for value in batch]
+    assert sorted(ids, key=int) == [str(i) for i in range(1, 11)]
+    assert len(threads) == 2 and all(name.startswith("id-counter") for name in threads)
\ No newline at end of file
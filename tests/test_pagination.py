@@ -0,0 +1,109 @@
+import asyncio
+import pytest
+
+pytest.importorskip("googleapiclient")
+
+from services import google_clients
+from services.codecs import CANDIDATE_CODEC
+from services.id_allocator import UlidAllocator
+from services.pagination import iter_records
+from services.repository import GoogleSheetsRepository
+from services.sheets_emulator import SheetsEmulator
+from services.sheets_service import GoogleSheetsService
+from services.tables import CANDIDATES
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setenv("SHEETS_API", "emulator")
+    monkeypatch.setenv("SHEETS_RATE_PER_MINUTE", "0")
+    monkeypatch.setitem(google_clients._clients, "sheets:emulator", SheetsEmulator())
+    service = GoogleSheetsService()
+    yield service
+    service.executor.shutdown()
+
+
+def candidate(record_id, email):
+    return [record_id, f"Кандидат {record_id}", email, "+7", "m", "2024-01-01T09:00:00"]
+
+
+async def collect(repository, limit, **filters):
+    """Обход всех страниц: ID строк и выданные курсоры"""
+    seen, cursors, cursor = [], [], None
+    while True:
+        rows, cursor = await repository.page(limit, cursor, **filters)
+        seen += [row[0] for row in rows]
+        if cursor is None:
+            return seen, cursors
+        cursors.append(cursor)
+
+
+def test_pages_skip_cleared_rows(service):
+    repository = GoogleSheetsRepository(CANDIDATES, UlidAllocator(), service)
+
+    async def scenario():
+        await repository.insert_many([candidate(str(i), f"{i % 2}@example.com") for i in range(1, 9)])
+        await repository.delete("2")
+        await repository.delete("3")
+        seen, cursors = await collect(repository, 3)
+        assert seen == ["1", "4", "5", "6", "7", "8"]
+        assert all(cursor.isdigit() for cursor in cursors)
+
+        # Курсор переиспользуется: та же страница при повторном запросе
+        rows, _ = await repository.page(3, cursors[0])
+        assert [row[0] for row in rows] == ["6", "7", "8"]
+
+        seen, _ = await collect(repository, 2, email="0@example.com")
+        assert seen == ["4", "6", "8"]
+
+    asyncio.run(scenario())
+
+
+def test_buffered_rows_end_the_last_page(service, monkeypatch):
+    monkeypatch.setenv("SHEETS_WRITE_BEHIND", "true")
+    monkeypatch.setenv("SHEETS_WRITE_FLUSH_INTERVAL", "3600")
+    buffered = GoogleSheetsService()
+    repository = GoogleSheetsRepository(CANDIDATES, UlidAllocator(), buffered)
+
+    async def scenario():
+        await repository.insert_many([candidate(str(i), f"{i}@example.com") for i in range(1, 4)])
+        await buffered.flush()
+        await repository.insert(candidate("4", "4@example.com"))
+        assert (await collect(repository, 2))[0] == ["1", "2", "3", "4"]
+        assert (await collect(repository, 2, email="4@example.com"))[0] == ["4"]
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        buffered.executor.shutdown()
+
+
+def test_iter_records_decodes_every_page(service):
+    repository = GoogleSheetsRepository(CANDIDATES, UlidAllocator(), service)
+
+    async def scenario():
+        await repository.insert_many([candidate(str(i), f"{i}@example.com") for i in range(1, 6)])
+        return [record async for record in iter_records(repository, CANDIDATE_CODEC, chunk_size=2)]
+
+    records = asyncio.run(scenario())
+    assert [record["id"] for record in records] == ["1", "2", "3", "4", "5"]
+    assert records[0]["created_at"].year == 2024
+
+
+@pytest.mark.parametrize("query", ["cursor=abc", "cursor=-1", "limit=0", "limit=100000"])
+def test_invalid_page_params_are_rejected(query):
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    from fastapi import Depends, FastAPI
+    from fastapi.testclient import TestClient
+    from dependencies.pagination import PageParams
+
+    app = FastAPI()
+
+    @app.get("/items")
+    def items(page: PageParams = Depends()):
+        return {"cursor": page.cursor, "limit": page.limit}
+
+    client = TestClient(app)
+    assert client.get(f"/items?{query}").status_code == 422
+    assert client.get("/items?cursor=12&limit=5").json() == {"cursor": "12", "limit": 5}
\ No newline at end of file
@@ -0,0 +1,85 @@
+import os
+import asyncio
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("elevenlabs")
+
+from models.base import Vacancy
+from services.question_plan import QuestionPlanner
+from services.tts_cache import TtsCache
+
+
+class FakeVoiceService:
+    """Синтез без сети: аудио фразы - ее текст"""
+
+    def __init__(self, cache: TtsCache):
+        self.voice_id = "voice"
+        self.model = "model"
+        self.output_format = "mp3"
+        self.cache = cache
+        self.synthesized = []
+
+    def cache_key(self, text: str) -> str:
+        return self.cache.key(text, self.voice_id, self.model, self.output_format)
+
+    async def synthesize(self, text: str) -> bytes:
+        self.synthesized.append(text)
+        return text.encode()
+
+
+def vacancy(vacancy_id="1", skills=("Python",)):
+    return Vacancy(
+        id=vacancy_id, title="Разработчик", level="middle", hard_skills=list(skills),
+        soft_skills=["Коммуникация"], tasks=["Писать сервисы"], tools=["Git"]
+    )
+
+
+@pytest.fixture
+def planner(tmp_path):
+    cache = TtsCache(str(tmp_path / "tts"), max_memory_bytes=1 << 20, max_disk_bytes=1 << 20)
+    return QuestionPlanner(FakeVoiceService(cache), str(tmp_path / "plans"), size=4, concurrency=2)
+
+
+def test_plan_is_pinned_without_touching_cache_stats(planner):
+    asyncio.run(planner._generate(vacancy()))
+    voice = planner.voice_service
+    assert voice.synthesized
+    stats = voice.cache.stats()
+    assert (stats["misses"], stats["memory_hits"], stats["disk_hits"]) == (0, 0, 0)
+    for sentence in voice.synthesized:
+        assert os.path.exists(voice.cache._pinned_path(voice.cache_key(sentence)))
+
+    # Тот же план для другой вакансии не синтезируется заново
+    voice.synthesized.clear()
+    planner._plans.clear()
+    asyncio.run(planner._generate(vacancy("2")))
+    assert voice.synthesized == []
+
+
+def test_plan_is_served_from_memory_for_the_current_fingerprint(planner, monkeypatch):
+    asyncio.run(planner._generate(vacancy()))
+    planner._plans.clear()
+    reads = []
+    original = planner._read_manifest
+    monkeypatch.setattr(planner, "_read_manifest", lambda vacancy_id: reads.append(vacancy_id) or original(vacancy_id))
+
+    async def scenario():
+        first = await planner.get_plan(vacancy())
+        second = await planner.get_plan(vacancy())
+        # План построен по прежним навыкам - для измененной вакансии его нет
+        changed = await planner.get_plan(vacancy(skills=("Go",)))
+        return first, second, changed
+
+    first, second, changed = asyncio.run(scenario())
+    assert first and first == second
+    assert changed is None
+    assert reads == ["1", "1"]
+
+
+@pytest.mark.parametrize("vacancy_id", ["../secret", "..", "a/b", "a\\b", ""])
+def test_vacancy_ids_cannot_escape_the_plan_directory(planner, vacancy_id):
+    assert not planner.valid_id(vacancy_id)
+    with pytest.raises(ValueError):
+        planner._path(vacancy_id)
+    assert asyncio.run(planner.get_plan(vacancy(vacancy_id))) is None
\ No newline at end of file
@@ -0,0 +1,33 @@
+import pytest
+
+from services.sentence_splitter import SentenceSplitter, split_sentences
+
+TEXT = "Добрый день! Расскажите кратко о себе. Почему вы ищете работу? Спасибо"
+
+
+def test_split_sentences():
+    assert split_sentences(TEXT) == [
+        "Добрый день!", "Расскажите кратко о себе.", "Почему вы ищете работу?", "Спасибо"
+    ]
+    assert split_sentences("") == []
+
+
+@pytest.mark.parametrize("size", [1, 3, 7])
+def test_streaming_matches_the_whole_text(size):
+    splitter = SentenceSplitter()
+    sentences = []
+    for i in range(0, len(TEXT), size):
+        sentences += splitter.feed(TEXT[i:i + size])
+    rest = splitter.flush()
+    assert sentences + [rest] == split_sentences(TEXT)
+    assert splitter.flush() is None
+
+
+def test_sentence_is_released_once_the_next_one_starts():
+    splitter = SentenceSplitter()
+    assert splitter.feed("Добрый день!") == []
+    assert splitter.feed(" Как") == ["Добрый день!"]
+
+
+def test_short_pieces_join_the_next_sentence():
+    assert split_sentences("1. Опыт работы с Python. Да.") == ["1. Опыт работы с Python.", "Да."]
\ No newline at end of file
@@ -0,0 +1,78 @@
+import asyncio
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("googleapiclient")
+
+from models.base import Interview
+from services.session_store import SessionStore
+
+
+class SlowRepository:
+    """Хранилище интервью, запись в которое занимает delay секунд"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.events = []
+
+    async def update(self, record_id, row):
+        self.events.append(("checkpoint started", record_id))
+        await asyncio.sleep(self.delay)
+        self.events.append(("checkpoint saved", record_id))
+        return True
+
+
+def interview(interview_id="1"):
+    return Interview(id=interview_id, candidate_id="c", vacancy_id="v", status="in_progress")
+
+
+def test_discard_waits_for_the_checkpoint_in_flight():
+    repository = SlowRepository(0.05)
+    store = SessionStore(repository, checkpoint_turns=1, idle_timeout=3600)
+
+    async def scenario():
+        session = store.add(interview())
+        store.record_turn(session)
+        await asyncio.sleep(0)
+        await store.discard("1")
+        repository.events.append(("rest write", "1"))
+        # Ход фоновой задачи после сброса ничего не записывает
+        store.record_turn(session)
+        await asyncio.sleep(0.1)
+
+    asyncio.run(scenario())
+    assert repository.events == [("checkpoint started", "1"), ("checkpoint saved", "1"), ("rest write", "1")]
+
+
+def test_get_waits_for_the_eviction_checkpoint():
+    repository = SlowRepository(0.05)
+    store = SessionStore(repository, checkpoint_turns=100, idle_timeout=0)
+
+    async def loader(session_id):
+        repository.events.append(("loaded", session_id))
+        return interview(session_id)
+
+    async def scenario():
+        store.record_turn(store.add(interview()))
+        await asyncio.sleep(0.01)
+        assert store.evict_idle() == 1
+        assert store.peek("1") is None
+        session = await store.get("1", loader)
+        assert session.interview.id == "1"
+
+    asyncio.run(scenario())
+    assert repository.events == [("checkpoint started", "1"), ("checkpoint saved", "1"), ("loaded", "1")]
+    assert store.stats()["evictions"] == 1
+
+
+def test_close_saves_the_last_state():
+    repository = SlowRepository(0)
+    store = SessionStore(repository, checkpoint_turns=100, idle_timeout=3600)
+
+    async def scenario():
+        store.record_turn(store.add(interview()))
+        await store.close("1")
+
+    asyncio.run(scenario())
+    assert repository.events == [("checkpoint started", "1"), ("checkpoint saved", "1")]
+    assert store.stats()["active"] == 0
\ No newline at end of file
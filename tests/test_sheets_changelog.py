@@ -0,0 +1,35 @@
+import pytest
+from services.sheets_changelog import APPEND, UPDATE, ChangeLog, ChangesUnavailable
+
+
+def test_changes_since_returns_later_changes_by_sheet():
+    log = ChangeLog(10)
+    log.record("Кандидаты", APPEND, "Кандидаты!A2:F2", [["1"]])
+    log.record("Вакансии", APPEND, "Вакансии!A2:M2", [["1"]])
+    change = log.record("Кандидаты", UPDATE, "Кандидаты!C2", [["a@example.com"]])
+    assert change.version == 3
+
+    changes, version = log.changes_since(1, "Кандидаты")
+    assert version == 3
+    assert [c.range for c in changes] == ["Кандидаты!C2"]
+    assert [c.version for c in log.changes_since(0)[0]] == [1, 2, 3]
+    # Потребитель, который уже видел все, получает пустой список
+    assert log.changes_since(3) == ([], 3)
+
+
+def test_evicted_versions_are_unavailable():
+    log = ChangeLog(2)
+    for i in range(5):
+        log.record("Кандидаты", APPEND, f"Кандидаты!A{i + 2}", [[str(i)]])
+    # В журнале версии 4 и 5: продолжить можно с версии 3, но не раньше
+    assert [c.version for c in log.changes_since(3)[0]] == [4, 5]
+    with pytest.raises(ChangesUnavailable):
+        log.changes_since(2)
+
+
+def test_versions_ahead_of_the_log_are_unavailable():
+    log = ChangeLog(2)
+    # Версия из прошлого запуска процесса
+    with pytest.raises(ChangesUnavailable):
+        log.changes_since(1)
+    assert log.changes_since(0) == ([], 0)
\ No newline at end of file
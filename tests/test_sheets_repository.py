@@ -0,0 +1,251 @@
+import asyncio
+import pytest
+
+pytest.importorskip("googleapiclient")
+
+from services import google_clients
+from services.compaction_lease import CompactionLease
+from services.id_allocator import UlidAllocator
+from services.repository import GoogleSheetsRepository
+from services.sheets_emulator import SheetsEmulator
+from services.sheets_service import GoogleSheetsService
+from services.tables import CANDIDATES, NOTIFICATIONS
+
+
+@pytest.fixture
+def emulator(monkeypatch):
+    monkeypatch.setenv("SHEETS_API", "emulator")
+    monkeypatch.setenv("SHEETS_RATE_PER_MINUTE", "0")
+    emulator = SheetsEmulator()
+    monkeypatch.setitem(google_clients._clients, "sheets:emulator", emulator)
+    return emulator
+
+
+@pytest.fixture
+def workers(emulator):
+    """Два процесса приложения над одной таблицей: у каждого свой кэш и свои индексы"""
+    services = [GoogleSheetsService(), GoogleSheetsService()]
+    yield [GoogleSheetsRepository(CANDIDATES, UlidAllocator(), service) for service in services]
+    for service in services:
+        service.executor.shutdown()
+
+
+def candidate(record_id, email):
+    return [record_id, f"Кандидат {record_id}", email, "+7", "m", "2024-01-01T09:00:00"]
+
+
+def test_crud(workers):
+    repository = workers[0]
+
+    async def scenario():
+        await repository.insert(candidate("1", "a@example.com"))
+        await repository.insert_many([candidate("2", "b@example.com"), candidate("3", "c@example.com")])
+        assert await repository.get("2") == candidate("2", "b@example.com")
+        assert [row[0] for row in await repository.get_all()] == ["1", "2", "3"]
+
+        assert await repository.update("2", candidate("2", "changed@example.com"))
+        assert (await repository.get("2"))[2] == "changed@example.com"
+        assert await repository.update_field("3", "phone", "+7 999")
+        assert (await repository.get("3"))[3] == "+7 999"
+
+        assert await repository.delete("1")
+        assert await repository.get("1") is None
+        assert not await repository.delete("1")
+        assert [row[0] for row in await repository.find(email="c@example.com")] == ["3"]
+
+    asyncio.run(scenario())
+
+
+def test_writes_find_rows_moved_by_compaction_in_another_worker(workers, emulator):
+    first, second = workers
+
+    async def scenario():
+        await first.insert_many([candidate(str(i), f"{i}@example.com") for i in range(1, 6)])
+        # Второй процесс строит индекс до уплотнения: "4" -> строка 5
+        assert (await second.get("4"))[2] == "4@example.com"
+        assert await first.delete("2")
+        assert (await first.compact())["reclaimed_rows"] == 1
+
+        # Индекс второго процесса устарел: запись по старым номерам испортила бы соседние строки
+        assert await second.update_field("4", "phone", "+7 444")
+        assert await second.update("5", candidate("5", "changed@example.com"))
+        assert await second.delete("3")
+
+        rows = {row[0]: CANDIDATES.normalize(row) for row in emulator._tabs[CANDIDATES.sheet][1:] if row and row[0]}
+        assert sorted(rows) == ["1", "4", "5"]
+        assert rows["4"][3] == "+7 444"
+        assert rows["5"][2] == "changed@example.com"
+        assert rows["1"] == candidate("1", "1@example.com")
+
+    asyncio.run(scenario())
+
+
+def table_rows(emulator, table=CANDIDATES):
+    return {row[0]: table.normalize(row) for row in emulator._tabs[table.sheet][1:] if row and row[0]}
+
+
+@pytest.fixture
+def other_workers(emulator, monkeypatch, tmp_path):
+    """Процессы рядом с уплотняющим: свои аренды в общем файле, один - с отложенной записью"""
+    direct = GoogleSheetsService()
+    monkeypatch.setenv("SHEETS_WRITE_BEHIND", "true")
+    monkeypatch.setenv("SHEETS_WRITE_FLUSH_INTERVAL", "3600")
+    buffered = GoogleSheetsService()
+    services = [direct, buffered]
+    for service in services:
+        service.compaction_lease = CompactionLease(str(tmp_path / "compaction.db"), ttl=60)
+    yield [GoogleSheetsRepository(CANDIDATES, UlidAllocator(), service) for service in services]
+    for service in services:
+        service.executor.shutdown()
+
+
+def test_buffered_updates_follow_rows_moved_by_compaction(workers, other_workers, emulator):
+    compacting = workers[0]
+    buffered = other_workers[1]
+
+    async def scenario():
+        await compacting.insert_many([candidate(str(i), f"{i}@example.com") for i in range(1, 7)])
+        # Номера строк найдены до уплотнения: "5" - строка 6, "3" - строка 4
+        assert await buffered.update_field("5", "phone", "+7 555")
+        assert await buffered.delete("3")
+        assert await compacting.delete("2")
+        assert (await compacting.compact())["reclaimed_rows"] == 1
+        await buffered.sheets_service.flush()
+
+    asyncio.run(scenario())
+    rows = table_rows(emulator)
+    assert sorted(rows) == ["1", "4", "5", "6"]
+    assert rows["5"][3] == "+7 555"
+    assert rows["6"] == candidate("6", "6@example.com")
+    assert rows["4"] == candidate("4", "4@example.com")
+
+
+def test_row_writes_wait_for_compaction_in_another_worker(workers, other_workers, emulator, monkeypatch):
+    compacting = workers[0]
+    direct, buffered = other_workers
+    read_id_at = direct.sheets_service.read_id_at
+
+    async def slow_read_id_at(sheet, row_number):
+        # Между проверкой ID в строке и записью проходит время: уплотнение успевает начаться
+        record_id = await read_id_at(sheet, row_number)
+        await asyncio.sleep(0.1)
+        return record_id
+
+    monkeypatch.setattr(direct.sheets_service, "read_id_at", slow_read_id_at)
+
+    async def scenario():
+        await compacting.insert_many([candidate(str(i), f"{i}@example.com") for i in range(1, 7)])
+        assert (await direct.get("6"))[0] == "6"
+        assert await buffered.update_field("5", "phone", "+7 555")
+        assert await compacting.delete("2")
+        emulator.latency = 0.02
+        report, _, updated = await asyncio.gather(
+            compacting.compact(),
+            buffered.sheets_service.flush(),
+            direct.update_field("6", "phone", "+7 666")
+        )
+        assert report["reclaimed_rows"] == 1
+        assert updated
+
+    asyncio.run(scenario())
+    rows = table_rows(emulator)
+    assert sorted(rows) == ["1", "3", "4", "5", "6"]
+    assert (rows["5"][3], rows["6"][3]) == ("+7 555", "+7 666")
+    assert rows["4"] == candidate("4", "4@example.com")
+
+
+def notification(record_id, manager_id, status="new"):
+    return [record_id, manager_id, "interview", "Текст", "", "2024-01-01T09:00:00", status]
+
+
+def test_notification_index_follows_write_behind_appends(emulator, monkeypatch):
+    monkeypatch.setenv("SHEETS_WRITE_BEHIND", "true")
+    monkeypatch.setenv("SHEETS_WRITE_FLUSH_INTERVAL", "3600")
+    service = GoogleSheetsService()
+    repository = GoogleSheetsRepository(NOTIFICATIONS, UlidAllocator(), service)
+
+    async def scenario():
+        await repository.insert_many([notification("1", "m1"), notification("2", "m1"), notification("3", "m2")])
+        # Индекс построен, пока строки еще в буфере: они учитываются отдельно
+        assert await repository.count(hr_manager_id="m1", status="new") == 2
+        await service.flush()
+        assert await repository.count(hr_manager_id="m1", status="new") == 2
+
+        assert await repository.update_field("1", "status", "read")
+        await repository.insert(notification("4", "m1"))
+        await service.flush()
+        assert await repository.count(hr_manager_id="m1", status="new") == 2
+        assert [row[0] for row in await repository.latest(5, hr_manager_id="m1")] == ["4", "2", "1"]
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        service.executor.shutdown()
+
+
+def test_notification_index_sees_other_workers_after_ttl(emulator, monkeypatch):
+    monkeypatch.setenv("SHEETS_CACHE_TTL", "0")
+    services = [GoogleSheetsService(), GoogleSheetsService()]
+    first, second = [GoogleSheetsRepository(NOTIFICATIONS, UlidAllocator(), service) for service in services]
+
+    async def scenario():
+        await first.insert(notification("1", "m1"))
+        assert await second.count(hr_manager_id="m1", status="new") == 1
+        await first.insert_many([notification("2", "m1"), notification("3", "m1")])
+        await first.update_field("1", "status", "read")
+        assert await second.count(hr_manager_id="m1", status="new") == 2
+        assert [row[0] for row in await second.latest(5, hr_manager_id="m1")] == ["3", "2", "1"]
+        assert [row[0] for row in await second.find(hr_manager_id="m1", status="read")] == ["1"]
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        for service in services:
+            service.executor.shutdown()
+
+
+def reads(emulator):
+    return emulator.requests.get("values.get", 0) + emulator.requests.get("values.batchGet", 0)
+
+
+def test_indexes_apply_changes_written_outside_the_repository(workers, emulator):
+    repository = workers[0]
+    service = repository.sheets_service
+
+    async def scenario():
+        await repository.insert_many([candidate(str(i), f"{i}@example.com") for i in range(1, 4)])
+        assert [row[0] for row in await repository.find(email="2@example.com")] == ["2"]
+        before = reads(emulator)
+
+        # Записи процесса мимо хранилища попадают в индексы и кэш из журнала изменений
+        await service.update_values(CANDIDATES.cell_range("email", 3), [["z@example.com"]])
+        await service.append_values(CANDIDATES.full_range, [candidate("4", "z@example.com")])
+        await service.clear_values(CANDIDATES.row_range(2))
+        assert await repository.count(email="z@example.com") == 2
+        assert await repository.count(email="1@example.com") == 0
+        assert reads(emulator) == before
+        assert [row[0] for row in await repository.find(email="z@example.com")] == ["2", "4"]
+
+    asyncio.run(scenario())
+
+
+def test_indexes_reload_when_the_change_log_is_exhausted(emulator, monkeypatch):
+    monkeypatch.setenv("SHEETS_CHANGELOG_SIZE", "1")
+    service = GoogleSheetsService()
+    repository = GoogleSheetsRepository(CANDIDATES, UlidAllocator(), service)
+
+    async def scenario():
+        await repository.insert_many([candidate(str(i), f"{i}@example.com") for i in range(1, 4)])
+        assert await repository.count(email="1@example.com") == 1
+        before = reads(emulator)
+        await service.update_values(CANDIDATES.cell_range("email", 2), [["z@example.com"]])
+        await service.update_values(CANDIDATES.cell_range("email", 3), [["z@example.com"]])
+        assert await repository.count(email="z@example.com") == 2
+        assert await repository.count(email="1@example.com") == 0
+        # Нужные записи вытеснены из журнала - индекс перестроен чтением листа
+        assert reads(emulator) > before
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        service.executor.shutdown()
\ No newline at end of file
@@ -0,0 +1,92 @@
+import asyncio
+import time
+import pytest
+
+from services.sheets_scheduler import BULK, DEFAULT, INTERACTIVE, TokenBucketScheduler, current_lane, sheets_lane
+
+
+def test_waiters_are_served_by_lane_priority():
+    scheduler = TokenBucketScheduler(rate_per_second=0, burst=1, max_in_flight=1)
+    order = []
+
+    async def request(lane, name):
+        await scheduler.acquire(lane)
+        order.append(name)
+        scheduler.release()
+
+    async def scenario():
+        await scheduler.acquire(DEFAULT)
+        tasks = [
+            asyncio.create_task(request(BULK, "bulk 1")),
+            asyncio.create_task(request(DEFAULT, "default")),
+            asyncio.create_task(request(BULK, "bulk 2")),
+            asyncio.create_task(request(INTERACTIVE, "interactive"))
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.stats()["queued"] == 4
+        scheduler.release()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+    # Внутри полосы - в порядке поступления
+    assert order == ["interactive", "default", "bulk 1", "bulk 2"]
+    assert scheduler.stats()["lanes"][BULK]["acquired"] == 2
+
+
+def test_burst_then_rate():
+    scheduler = TokenBucketScheduler(rate_per_second=20, burst=2, max_in_flight=10)
+
+    async def scenario():
+        started = time.monotonic()
+        for _ in range(2):
+            await scheduler.acquire(DEFAULT)
+        burst = time.monotonic() - started
+        await scheduler.acquire(DEFAULT)
+        return burst, time.monotonic() - started
+
+    burst, total = asyncio.run(scenario())
+    assert burst < 0.03
+    # Третий запрос ждет пополнения корзины: 1 / 20 секунды
+    assert total >= 0.04
+    assert scheduler.stats()["in_flight"] == 3
+
+
+def test_cancelled_waiter_does_not_hold_a_slot():
+    scheduler = TokenBucketScheduler(rate_per_second=0, burst=1, max_in_flight=1)
+
+    async def scenario():
+        await scheduler.acquire(DEFAULT)
+        cancelled = asyncio.create_task(scheduler.acquire(INTERACTIVE))
+        waiting = asyncio.create_task(scheduler.acquire(BULK))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        scheduler.release()
+        await asyncio.wait_for(waiting, 1)
+
+    asyncio.run(scenario())
+    stats = scheduler.stats()
+    assert (stats["in_flight"], stats["queued"]) == (1, 0)
+    assert stats["lanes"][INTERACTIVE]["acquired"] == 0
+
+
+def test_lane_follows_the_context():
+    async def lane_later():
+        await asyncio.sleep(0)
+        return current_lane()
+
+    async def scenario():
+        assert current_lane() == DEFAULT
+        with sheets_lane(BULK):
+            # Задачи, созданные внутри блока, наследуют полосу
+            task = asyncio.create_task(lane_later())
+            with sheets_lane(INTERACTIVE):
+                assert current_lane() == INTERACTIVE
+            assert current_lane() == BULK
+        assert current_lane() == DEFAULT
+        return await task
+
+    assert asyncio.run(scenario()) == BULK
+    with pytest.raises(ValueError):
+        with sheets_lane("urgent"):
+            pass
\ No newline at end of file
@@ -0,0 +1,97 @@
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+pytest.importorskip("googleapiclient")
+
+from services.id_allocator import UlidAllocator
+from services.repository import BaseRepository, SQLiteRepository
+from services.secondary_index import Range
+from services.tables import CANDIDATES
+
+
+@pytest.fixture
+def repository():
+    connection = sqlite3.connect(":memory:", check_same_thread=False, isolation_level=None)
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+    yield SQLiteRepository(CANDIDATES, UlidAllocator(), connection, threading.Lock(), executor)
+    executor.shutdown(wait=True)
+    connection.close()
+
+
+def candidate(record_id, email, created_at="2024-01-01T09:00:00"):
+    return [record_id, f"Кандидат {record_id}", email, "+7", "m", created_at]
+
+
+def test_base_repository_is_abstract():
+    with pytest.raises(TypeError):
+        BaseRepository(CANDIDATES, UlidAllocator())
+
+
+def test_crud(repository):
+    async def scenario():
+        await repository.insert(candidate("1", "a@example.com"))
+        await repository.insert_many([candidate("2", "b@example.com"), candidate("3", "c@example.com")])
+        assert await repository.get("2") == candidate("2", "b@example.com")
+        assert [row[0] for row in await repository.get_all()] == ["1", "2", "3"]
+
+        assert await repository.update("2", candidate("2", "changed@example.com"))
+        assert (await repository.get("2"))[2] == "changed@example.com"
+        assert await repository.update_field("3", "phone", "+7 999")
+        assert (await repository.get("3"))[3] == "+7 999"
+
+        assert await repository.delete("1")
+        assert await repository.get("1") is None
+        assert not await repository.delete("1")
+        assert not await repository.update("1", candidate("1", "a@example.com"))
+        assert await repository.max_numeric_id() == 3
+
+    asyncio.run(scenario())
+
+
+def test_insert_many_is_atomic(repository):
+    async def scenario():
+        await repository.insert(candidate("1", "a@example.com"))
+        with pytest.raises(sqlite3.IntegrityError):
+            # Повтор первичного ключа откатывает всю пачку
+            await repository.insert_many([candidate("2", "b@example.com"), candidate("1", "dup@example.com")])
+        assert [row[0] for row in await repository.get_all()] == ["1"]
+
+    asyncio.run(scenario())
+
+
+def test_filters_page_and_latest(repository):
+    async def scenario():
+        await repository.insert_many([
+            candidate(str(i), f"{i % 2}@example.com", f"2024-01-{i:02d}T09:00:00") for i in range(1, 8)
+        ])
+        assert [row[0] for row in await repository.find(email="1@example.com")] == ["1", "3", "5", "7"]
+        assert await repository.count(email="0@example.com") == 3
+        in_range = await repository.find(created_at=Range("2024-01-03", "2024-01-05T23:59:59"))
+        assert [row[0] for row in in_range] == ["3", "4", "5"]
+        assert [row[0] for row in await repository.latest(2, email="1@example.com")] == ["7", "5"]
+
+        seen, cursor = [], None
+        while True:
+            rows, cursor = await repository.page(3, cursor)
+            seen += [row[0] for row in rows]
+            if cursor is None:
+                break
+        assert seen == [str(i) for i in range(1, 8)]
+
+    asyncio.run(scenario())
+
+
+def test_queries_run_off_the_event_loop(repository):
+    threads = []
+    original = repository._query_sync
+
+    def spy(sql, params):
+        threads.append(threading.current_thread().name)
+        return original(sql, params)
+
+    repository._query_sync = spy
+    asyncio.run(repository.get_all())
+    assert threads and all(name.startswith("sqlite") for name in threads)
\ No newline at end of file
@@ -0,0 +1,22 @@
+import time
+
+from services.token_cache import TokenCache
+
+
+def test_entries_are_keyed_by_signing_settings():
+    cache = TokenCache(10)
+    cache.put("token", "secret", "HS256", {"sub": "hr@example.com", "exp": time.time() + 60})
+    assert cache.get("token", "secret", "HS256")["sub"] == "hr@example.com"
+    assert cache.get("token", "secret", "HS512") is None
+    assert cache.get("token", "other", "HS256") is None
+
+
+def test_expired_and_overflowing_entries_are_dropped():
+    cache = TokenCache(2)
+    cache.put("expired", "secret", "HS256", {"exp": time.time() - 1})
+    assert cache.get("expired", "secret", "HS256") is None
+    for token in ["a", "b", "c"]:
+        cache.put(token, "secret", "HS256", {"sub": token})
+    assert cache.get("a", "secret", "HS256") is None
+    assert cache.get("c", "secret", "HS256") == {"sub": "c"}
+    assert cache.stats()["evictions"] == 1
\ No newline at end of file
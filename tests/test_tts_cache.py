@@ -0,0 +1,81 @@
+import os
+import asyncio
+from services.tts_cache import TtsCache
+
+
+def key(n):
+    return TtsCache.key(f"Фраза {n}", "voice", "model", "mp3")
+
+
+def disk_files(directory):
+    return sorted(
+        name[:-len(".audio")] for root, _, names in os.walk(directory) if not root.endswith("pinned")
+        for name in names if name.endswith(".audio")
+    )
+
+
+def test_memory_lru_and_stats(tmp_path):
+    cache = TtsCache("", max_memory_bytes=250, max_disk_bytes=0)
+
+    async def scenario():
+        for n in range(3):
+            await cache.put(key(n), bytes(100))
+        # Самая давняя фраза вытеснена из памяти, каталога нет
+        assert await cache.get(key(0)) is None
+        assert await cache.get(key(2), "Фраза 2") == bytes(100)
+
+    asyncio.run(scenario())
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["misses"], stats["evictions"]) == (1, 1, 1)
+    assert stats["characters_saved"] == len("Фраза 2")
+
+
+def test_disk_eviction_counts_files_of_other_workers(tmp_path):
+    directory = str(tmp_path)
+    first = TtsCache(directory, max_memory_bytes=0, max_disk_bytes=250, rescan_interval=0)
+    second = TtsCache(directory, max_memory_bytes=0, max_disk_bytes=250, rescan_interval=0)
+
+    async def scenario():
+        # Второй воркер обошел каталог, пока он был пуст
+        assert await second.get(key(0)) is None
+        await first.put(key(0), bytes(100))
+        await first.put(key(1), bytes(100))
+        os.utime(first._path(key(0)), (1, 1))
+        await second.put(key(2), bytes(100))
+
+    asyncio.run(scenario())
+    assert disk_files(directory) == sorted([key(1), key(2)])
+    assert second.stats()["disk_bytes"] == 200
+
+
+def test_disk_hit_for_files_written_by_another_worker(tmp_path):
+    directory = str(tmp_path)
+    reader = TtsCache(directory, max_memory_bytes=0, max_disk_bytes=1000)
+    writer = TtsCache(directory, max_memory_bytes=0, max_disk_bytes=1000)
+
+    async def scenario():
+        assert await reader.get(key(0)) is None
+        await writer.put(key(0), b"audio")
+        return await reader.get(key(0))
+
+    assert asyncio.run(scenario()) == b"audio"
+    assert reader.stats()["disk_hits"] == 1
+
+
+def test_pinned_phrases_survive_eviction(tmp_path):
+    directory = str(tmp_path)
+    cache = TtsCache(directory, max_memory_bytes=0, max_disk_bytes=150, rescan_interval=0)
+
+    async def scenario():
+        await cache.pin(key(0), b"pinned")
+        await cache.put(key(0), bytes(100))
+        os.utime(cache._path(key(0)), (1, 1))
+        # Обычная копия вытеснена, но закрепленная отдается
+        await cache.put(key(1), bytes(100))
+        assert not os.path.exists(cache._path(key(0)))
+        assert await cache.get(key(0)) == b"pinned"
+
+        await cache.unpin(key(0))
+        assert await cache.get(key(0)) is None
+
+    asyncio.run(scenario())
\ No newline at end of file
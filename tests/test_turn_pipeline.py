@@ -0,0 +1,138 @@
+import asyncio
+import pytest
+
+pytest.importorskip("pydantic")
+pytest.importorskip("googleapiclient")
+pytest.importorskip("openai")
+pytest.importorskip("elevenlabs")
+pytest.importorskip("livekit")
+
+from models.base import Interview
+from services.interview_service import InterviewService
+from services.session_store import SessionStore
+from services.turn_pipeline import TurnPipeline
+
+
+class NullRepository:
+    async def update(self, record_id, row):
+        return True
+
+
+class FakeInterviewService:
+    """Вопрос приходит токенами с задержкой; события пишутся в общий журнал"""
+
+    def __init__(self, tokens, events, delay=0.01):
+        self.tokens = tokens
+        self.events = events
+        self.delay = delay
+        self.sessions = SessionStore(NullRepository(), checkpoint_turns=100, idle_timeout=3600)
+        self.answers = []
+
+    async def get_session(self, session_id):
+        return self.sessions.peek(session_id) or self.sessions.add(
+            Interview(id=session_id, candidate_id="c", vacancy_id="", status="in_progress")
+        )
+
+    async def record_answer(self, session, response):
+        self.answers.append(response)
+
+    async def stream_next_question(self, session):
+        for token in self.tokens:
+            await asyncio.sleep(self.delay)
+            self.events.append(("token", token))
+            yield token
+
+
+class FakeVoiceService:
+    def __init__(self, events):
+        self.events = events
+
+    async def stream_speech(self, sentence):
+        for part in range(2):
+            self.events.append(("audio", sentence))
+            yield f"{sentence}#{part}".encode()
+
+
+TOKENS = ["Расскажите о ", "последнем проекте. ", "Какие задачи ", "вы решали ", "сами?"]
+
+
+def run_turn(pipeline, response="ответ"):
+    messages, audio = [], []
+
+    async def send_json(message):
+        messages.append(message)
+
+    async def send_bytes(chunk):
+        audio.append(chunk)
+
+    question = asyncio.run(pipeline.run("1", response, send_json, send_bytes))
+    return question, messages, audio
+
+
+def test_sentences_are_spoken_while_the_question_is_generated():
+    events = []
+    pipeline = TurnPipeline(FakeInterviewService(TOKENS, events), FakeVoiceService(events))
+    question, messages, audio = run_turn(pipeline)
+
+    assert question == "Расскажите о последнем проекте. Какие задачи вы решали сами?"
+    # Аудио первого предложения уходит до последнего токена
+    first_audio = events.index(("audio", "Расскажите о последнем проекте."))
+    assert first_audio < events.index(("token", TOKENS[-1]))
+
+    assert messages[:-1] == [
+        {"type": "sentence", "index": 0, "text": "Расскажите о последнем проекте."},
+        {"type": "sentence", "index": 1, "text": "Какие задачи вы решали сами?"}
+    ]
+    assert audio == [
+        "Расскажите о последнем проекте.#0".encode(), "Расскажите о последнем проекте.#1".encode(),
+        "Какие задачи вы решали сами?#0".encode(), "Какие задачи вы решали сами?#1".encode()
+    ]
+    end = messages[-1]
+    assert (end["type"], end["question"]) == ("turn_end", question)
+    assert {"answer_ms", "first_token_ms", "first_audio_ms", "total_ms"} <= set(end["timings"])
+    assert pipeline.stats()["turns"] == 1
+
+
+def test_generation_stops_when_the_client_is_gone():
+    events = []
+    pipeline = TurnPipeline(FakeInterviewService(TOKENS, events), FakeVoiceService(events))
+
+    async def send_json(message):
+        pass
+
+    async def send_bytes(chunk):
+        raise ConnectionError("client disconnected")
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(pipeline.run("1", "ответ", send_json, send_bytes))
+    assert ("token", TOKENS[-1]) not in events
+    assert pipeline.stats()["turns"] == 0
+
+
+class FakeWhisperService:
+    """Анализ ответа: задержка и результат заданы по тексту ответа"""
+
+    def __init__(self, delays):
+        self.delays = delays
+
+    async def analyze_response(self, text, vacancy_data):
+        await asyncio.sleep(self.delays[text])
+        return None if text == "сбой" else {"answer": text}
+
+
+def test_answer_analyses_stay_aligned_with_answers():
+    service = InterviewService.__new__(InterviewService)
+    service.sessions = SessionStore(NullRepository(), checkpoint_turns=100, idle_timeout=3600)
+    service.whisper_service = FakeWhisperService({"первый": 0.05, "сбой": 0.0, "третий": 0.0})
+
+    async def scenario():
+        session = service.sessions.add(Interview(id="1", candidate_id="c", vacancy_id="", status="in_progress"))
+        for answer in ["первый", "сбой", "третий"]:
+            await service.record_answer(session, answer)
+        # Место под анализ занято до его завершения
+        assert len(session.interview.emotions_analysis) == 3
+        await asyncio.gather(*session.tasks)
+        return session.interview
+
+    interview = asyncio.run(scenario())
+    assert interview.emotions_analysis == [{"answer": "первый"}, {}, {"answer": "третий"}]
\ No newline at end of file